@@ -7,3 +7,14 @@ MAX_LOCATIONS_PER_REQUEST: Final[int] = 100
 MAX_SKILLS_PER_REQUEST: Final[int] = 100
 MAX_POSITIONS_PER_REQUEST: Final[int] = 100
 MAX_RESUMES_PER_REQUEST: Final[int] = 20
+
+DICTIONARY_SNAPSHOT_CACHE_KEY: Final[str] = (
+    'dictionary:{name}:snapshot:{version}')
+DICTIONARY_SNAPSHOT_CACHE_TIMEOUT: Final[int] = 60 * 60 * 24
+
+# Загрузка аватара потоком (PUT /users/{id}/avatar/):
+AVATAR_MAX_UPLOAD_SIZE: Final[int] = 10 * 1024 * 1024
+AVATAR_UPLOAD_CHUNK_SIZE: Final[int] = 64 * 1024
+# Заголовок изображения (с EXIF) должен уместиться в первые байты файла:
+AVATAR_HEADER_MAX_SIZE: Final[int] = 512 * 1024
+AVATAR_UPLOAD_FORMATS: Final[tuple[str, ...]] = ('JPEG', 'PNG', 'WEBP', 'GIF')
@@ -0,0 +1,85 @@
+from typing import Mapping
+
+from django.db.models import Model
+from rest_framework import serializers
+from user.dictionaries import REFERENCE_DICTIONARIES, get_reference_dictionary
+
+
+def is_pk(value: object) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+class CachedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField для справочников: id проверяются по копии
+    справочника в памяти процесса, без запроса к БД на каждый элемент.
+    Уже найденный объект (см. BatchedPrimaryKeyListSerializer) принимается
+    как есть.
+    """
+
+    def to_internal_value(
+        self: 'CachedPrimaryKeyRelatedField', data: object
+    ) -> Model:
+        if isinstance(data, self.queryset.model):
+            return data
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
+        obj = get_reference_dictionary(self.queryset.model).get(pk)
+        if obj is None:
+            self.fail('does_not_exist', pk_value=data)
+        return obj
+
+
+class BatchedPrimaryKeyListSerializer(serializers.ListSerializer):
+    """
+    Вложенный список, id связанных объектов которого разрешаются пачкой:
+    один запрос id__in (или копия справочника в памяти) на модель вместо
+    запроса на каждый элемент. Все несуществующие id перечисляются в одной
+    ошибке, а элементам передаются уже найденные объекты.
+    """
+
+    def to_internal_value(
+        self: 'BatchedPrimaryKeyListSerializer', data: object
+    ) -> list[dict]:
+        if isinstance(data, list) and all(
+            isinstance(item, Mapping) for item in data
+        ):
+            data = self.resolve_related(data)
+        return super().to_internal_value(data)
+
+    def resolve_related(
+        self: 'BatchedPrimaryKeyListSerializer', data: list[Mapping]
+    ) -> list[dict]:
+        data = [dict(item) for item in data]
+        errors = []
+        for name, field in self.child.fields.items():
+            if field.read_only or not isinstance(
+                field, CachedPrimaryKeyRelatedField
+            ):
+                continue
+            # Значения неверного типа проверит само поле элемента:
+            pks = {item[name] for item in data if is_pk(item.get(name))}
+            if not pks:
+                continue
+            model = field.queryset.model
+            if model in REFERENCE_DICTIONARIES:
+                objects = get_reference_dictionary(model).get_many(pks)
+            else:
+                objects = field.get_queryset().in_bulk(pks)
+            if missing := pks - objects.keys():
+                errors.append(
+                    f'{name}: объекты с id '
+                    f'{", ".join(map(str, sorted(missing)))} не существуют.'
+                )
+                continue
+            for item in data:
+                if is_pk(item.get(name)):
+                    item[name] = objects[item[name]]
+        if errors:
+            raise serializers.ValidationError(errors)
+        return data
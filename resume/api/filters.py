@@ -0,0 +1,24 @@
+from django.db.models import QuerySet
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.request import Request
+from rest_framework.views import View
+from search.backends import search_resumes
+
+
+class ResumeSearchFilter(BaseFilterBackend):
+    """
+    Полнотекстовый поиск по резюме (параметр `search`) с сортировкой по
+    релевантности. Использует тот же движок, что и HTML-список резюме.
+    """
+    search_param = 'search'
+
+    def filter_queryset(
+        self: 'ResumeSearchFilter',
+        request: Request,
+        queryset: QuerySet,
+        view: View,
+    ) -> QuerySet:
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return search_resumes(queryset, query)
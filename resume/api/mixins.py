@@ -1,3 +1,6 @@
+from copy import copy
+
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
 from services.models import PendingUser
 from user.models import User
@@ -55,7 +58,6 @@ class UserValidationMixin:
     def validate_education_data(
         self: 'UserValidationMixin', data: dict
     ) -> None:
-        print(data)
         if (
             not data.get('institution')
             or not data.get('degree')
@@ -79,3 +81,40 @@ class UserValidationMixin:
                 'Каждый опыт работы должен содержать company, position '
                 'и start_date.'
             )
+
+    def validate_educations(
+        self: 'UserValidationMixin', educations: list[dict]
+    ) -> list[dict]:
+        for data in educations:
+            self.validate_education_data(data)
+        return educations
+
+    def validate_experiences(
+        self: 'UserValidationMixin', experiences: list[dict]
+    ) -> list[dict]:
+        for data in experiences:
+            self.validate_experience_data(data)
+        return experiences
+
+
+class NormalizedKeyValidationMixin:
+    """
+    Справочники уникальны по normalized_key (без учёта регистра, пробелов и
+    ё/е): проверяем его через clean() модели, чтобы дубликат давал 400, а
+    не IntegrityError.
+    """
+    def validate(
+        self: 'NormalizedKeyValidationMixin', attrs: dict
+    ) -> dict:
+        attrs = super().validate(attrs)
+        candidate = (
+            copy(self.instance) if self.instance is not None
+            else self.Meta.model()
+        )
+        for field, value in attrs.items():
+            setattr(candidate, field, value)
+        try:
+            candidate.clean()
+        except DjangoValidationError as error:
+            raise serializers.ValidationError(error.message_dict)
+        return attrs
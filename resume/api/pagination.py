@@ -1,4 +1,11 @@
-from rest_framework.pagination import PageNumberPagination
+from core.pagination import InvalidCursor, paginate_keyset, supports_keyset
+from django.db.models import QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import View
 
 from .constants import (MAX_LOCATIONS_PER_REQUEST, MAX_POSITIONS_PER_REQUEST,
                         MAX_RESUMES_PER_REQUEST, MAX_SKILLS_PER_REQUEST)
@@ -16,5 +23,92 @@ class PositionPagination(PageNumberPagination):
     page_size = MAX_POSITIONS_PER_REQUEST
 
 
-class ResumePagination(PageNumberPagination):
+class ResumePageNumberPagination(PageNumberPagination):
     page_size = MAX_RESUMES_PER_REQUEST
+
+
+class ResumePagination(BasePagination):
+    """
+    Keyset-пагинация резюме по ключу (-created_at, pk) через параметр
+    `cursor`. Запросы с `page` (старые ссылки) и результаты поиска,
+    отсортированные по релевантности, обслуживаются постраничной
+    пагинацией.
+    """
+    page_size = MAX_RESUMES_PER_REQUEST
+    cursor_query_param = 'cursor'
+    page_query_param = 'page'
+    legacy_pagination_class = ResumePageNumberPagination
+
+    def paginate_queryset(
+        self: 'ResumePagination',
+        queryset: QuerySet,
+        request: Request,
+        view: View | None = None,
+    ) -> list:
+        self.request = request
+        self.legacy = None
+        if (
+            self.page_query_param in request.query_params
+            or not supports_keyset(queryset)
+        ):
+            self.legacy = self.legacy_pagination_class()
+            self.legacy.page_size = self.page_size
+            return self.legacy.paginate_queryset(queryset, request, view)
+
+        try:
+            self.page = paginate_keyset(
+                queryset,
+                request.query_params.get(self.cursor_query_param),
+                self.page_size,
+            )
+        except InvalidCursor:
+            raise NotFound('Неверный курсор пагинации.')
+        return self.page.object_list
+
+    def get_link(
+        self: 'ResumePagination', cursor: str | None
+    ) -> str | None:
+        if cursor is None:
+            return None
+        url = remove_query_param(
+            self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_page_state(self: 'ResumePagination') -> tuple:
+        """Ссылки и счётчики страницы (без данных) — для ETag списка."""
+        if self.legacy is not None:
+            return (
+                self.legacy.page.paginator.count,
+                self.legacy.get_next_link(),
+                self.legacy.get_previous_link(),
+            )
+        return (
+            None,
+            self.get_link(self.page.next_cursor),
+            self.get_link(self.page.previous_cursor),
+        )
+
+    def get_paginated_response(
+        self: 'ResumePagination', data: list
+    ) -> Response:
+        if self.legacy is not None:
+            return self.legacy.get_paginated_response(data)
+        return Response({
+            'next': self.get_link(self.page.next_cursor),
+            'previous': self.get_link(self.page.previous_cursor),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(
+        self: 'ResumePagination', schema: dict
+    ) -> dict:
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {
+                    'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -1,16 +1,36 @@
 import datetime as dt
+from contextlib import contextmanager
+from typing import Iterator
 
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from drf_extra_fields.fields import Base64ImageField
 from rest_framework import serializers
 from services.models import PendingUser
+from user.avatars import validate_avatar_dimensions
 from user.models import (Education, Experience, HardSkill, HardSkillName,
-                         Location, Position, Resume, SoftSkill, SoftSkillName,
-                         User)
+                         Location, Position, Resume, ResumeCard, SoftSkill,
+                         SoftSkillName, User)
+from user.reconcile import (USER_ITEM_SPECS, reconcile_resume_links,
+                            reconcile_resume_skills, reconcile_user_items)
+from user.signals import bulk_write, resumes_changed
+from user.skills import iter_layout_skills, refresh_skill_layouts
 
 from .constants import MAX_AGE, MIN_AGE
-from .mixins import UserValidationMixin
+from .fields import (BatchedPrimaryKeyListSerializer,
+                     CachedPrimaryKeyRelatedField)
+from .mixins import NormalizedKeyValidationMixin, UserValidationMixin
+
+
+@contextmanager
+def model_errors() -> Iterator[None]:
+    """Ошибки валидации моделей (например, квоты) — ответ 400, а не 500."""
+    try:
+        yield
+    except DjangoValidationError as error:
+        raise serializers.ValidationError(error.messages)
 
 
 class PendingUserSerializer(serializers.ModelSerializer, UserValidationMixin):
@@ -57,19 +77,25 @@ class PasswordChangeSerializer(serializers.Serializer):
         write_only=True, validators=[validate_password])
 
 
-class HardSkillNameSerializer(serializers.ModelSerializer):
+class HardSkillNameSerializer(
+    NormalizedKeyValidationMixin, serializers.ModelSerializer
+):
     class Meta:
         model = HardSkillName
         fields = ('id', 'name', 'description',)
 
 
-class SoftSkillNameSerializer(serializers.ModelSerializer):
+class SoftSkillNameSerializer(
+    NormalizedKeyValidationMixin, serializers.ModelSerializer
+):
     class Meta:
         model = SoftSkillName
         fields = ('id', 'name', 'description',)
 
 
-class LocationSerializer(serializers.ModelSerializer):
+class LocationSerializer(
+    NormalizedKeyValidationMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Location
         fields = ('id', 'country', 'city',)
@@ -81,7 +107,9 @@ class LocationSerializer(serializers.ModelSerializer):
         ]
 
 
-class PositionSerializer(serializers.ModelSerializer):
+class PositionSerializer(
+    NormalizedKeyValidationMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Position
         fields = ('id', 'category', 'position',)
@@ -156,14 +184,18 @@ class UserSerializer(serializers.ModelSerializer, UserValidationMixin):
     educations = EducationSerializer(many=True, required=False)
     experiences = ExperienceSerializer(many=True, required=False)
     location = LocationSerializer(read_only=True)
-    location_id = serializers.PrimaryKeyRelatedField(
+    location_id = CachedPrimaryKeyRelatedField(
         queryset=Location.objects.all(),
         required=False,
         allow_null=True,
         write_only=True,
     )
     age = serializers.SerializerMethodField(read_only=True)
-    avatar = Base64ImageField(required=False, allow_null=True)
+    avatar = Base64ImageField(
+        required=False,
+        allow_null=True,
+        validators=[validate_avatar_dimensions],
+    )
 
     class Meta:
         model = User
@@ -210,74 +242,26 @@ class UserSerializer(serializers.ModelSerializer, UserValidationMixin):
     def update(
         self: 'UserSerializer', instance: User, validated_data: dict
     ) -> User:
-
-        educations: list[dict] = validated_data.pop('educations', None)
-        experiences: list[dict] = validated_data.pop('experiences', None)
-
+        nested = {
+            field: validated_data.pop(field)
+            for field in USER_ITEM_SPECS
+            if field in validated_data
+        }
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
-
-        if educations is not None:
-            existing_educations = {
-                (e.institution, e.start_date): e
-                for e in Education.objects.filter(user=instance).all()
-            }
-            incoming_keys = set()
-
-            for data in educations:
-                self.validate_education_data(data)
-                key = (
-                    data.get('institution'),
-                    data.get('start_date'),
-                )
-                incoming_keys.add(key)
-
-                Education.objects.update_or_create(
-                    user=instance,
-                    institution=key[0],
-                    start_date=key[1],
-                    defaults={
-                        'degree': data.get('degree'),
-                        'field_of_study': data.get('field_of_study'),
-                        'end_date': data.get('end_date'),
-                    }
-                )
-
-            for key, obj in existing_educations.items():
-                if key not in incoming_keys:
-                    obj.delete()
-
-        if experiences is not None:
-            existing_experiences = {
-                (e.company, e.start_date): e
-                for e in Experience.objects.filter(user=instance).all()
-            }
-            incoming_keys = set()
-
-            for data in experiences:
-                self.validate_experience_data(data)
-                key = (
-                    data.get('company'),
-                    data.get('start_date')
-                )
-                incoming_keys.add(key)
-
-                Experience.objects.update_or_create(
-                    user=instance,
-                    company=key[0],
-                    start_date=key[1],
-                    defaults={
-                        'position': data.get('position'),
-                        'responsibilities': data.get('responsibilities'),
-                        'end_date': data.get('end_date'),
-                    }
-                )
-
-            for key, obj in existing_experiences.items():
-                if key not in incoming_keys:
-                    obj.delete()
 
+        with model_errors(), transaction.atomic():
+            instance.save()
+            # Записи, которых нет во входных данных, удаляются вместе со
+            # ссылками на них из резюме:
+            with bulk_write():
+                affected = set()
+                for field, items in nested.items():
+                    affected |= reconcile_user_items(
+                        USER_ITEM_SPECS[field], instance, items,
+                        delete_missing=True,
+                    ).affected_resume_ids
+                resumes_changed(affected, Education)
         return instance
 
 
@@ -301,31 +285,46 @@ class UserInResumeSerializer(serializers.ModelSerializer):
         )
 
 
+class SkillLayoutListSerializer(BatchedPrimaryKeyListSerializer):
+    """
+    Навыки резюме на чтение берутся из сохранённой сетки
+    (Resume.skill_layout), а не из таблиц навыков. На запись skill_id
+    всех навыков разрешаются одной пачкой.
+    """
+    def get_attribute(
+        self: 'SkillLayoutListSerializer', instance: Resume
+    ) -> list[dict]:
+        kind = self.field_name.removesuffix('_skills')
+        return list(iter_layout_skills(instance.skill_layout.get(kind, [])))
+
+
 class HardSkillSerializer(serializers.ModelSerializer):
     skill = HardSkillNameSerializer(read_only=True)
-    skill_id = serializers.PrimaryKeyRelatedField(
+    skill_id = CachedPrimaryKeyRelatedField(
         queryset=HardSkillName.objects.all(), write_only=True, source='skill'
     )
 
     class Meta:
         model = HardSkill
         fields = ('skill', 'skill_id', 'grid_column', 'grid_row',)
+        list_serializer_class = SkillLayoutListSerializer
 
 
 class SoftSkillSerializer(serializers.ModelSerializer):
     skill = SoftSkillNameSerializer(read_only=True)
-    skill_id = serializers.PrimaryKeyRelatedField(
+    skill_id = CachedPrimaryKeyRelatedField(
         queryset=SoftSkillName.objects.all(), write_only=True, source='skill'
     )
 
     class Meta:
         model = SoftSkill
         fields = ('skill', 'skill_id', 'grid_column', 'grid_row',)
+        list_serializer_class = SkillLayoutListSerializer
 
 
 class ResumeSerializer(serializers.ModelSerializer, UserValidationMixin):
     position = PositionSerializer(read_only=True)
-    position_id = serializers.PrimaryKeyRelatedField(
+    position_id = CachedPrimaryKeyRelatedField(
         queryset=Position.objects.all(),
         required=True,
         write_only=True,
@@ -336,6 +335,8 @@ class ResumeSerializer(serializers.ModelSerializer, UserValidationMixin):
     hard_skills = HardSkillSerializer(many=True, required=False)
     soft_skills = SoftSkillSerializer(many=True, required=False)
 
+    NESTED_FIELDS = ('educations', 'experiences', 'hard_skills', 'soft_skills')
+
     class Meta:
         model = Resume
         fields = (
@@ -387,145 +388,103 @@ class ResumeSerializer(serializers.ModelSerializer, UserValidationMixin):
 
         return super().validate(attrs)
 
-    def create(self: 'ResumeSerializer', validated_data: dict) -> Resume:
-        educations = validated_data.pop('educations', [])
-        experiences = validated_data.pop('experiences', [])
-        hard_skills = validated_data.pop('hard_skills', [])
-        soft_skills = validated_data.pop('soft_skills', [])
-
-        user = validated_data['user']
-        resume = Resume.objects.create(**validated_data)
-
-        created_educations = []
-        for data in educations:
-            self.validate_education_data(data)
-            education, _ = Education.objects.update_or_create(
-                user=user,
-                institution=data.get('institution'),
-                start_date=data.get('start_date'),
-                defaults={
-                    'degree': data.get('degree'),
-                    'field_of_study': data.get('field_of_study'),
-                    'end_date': data.get('end_date'),
-                }
-            )
-            created_educations.append(education)
-        resume.educations.add(*created_educations)
-
-        created_experiences = []
-        for data in experiences:
-            self.validate_experience_data(data)
-            experience, _ = Experience.objects.update_or_create(
-                user=user,
-                company=data.get('company'),
-                start_date=data.get('start_date'),
-                defaults={
-                    'position': data.get('position'),
-                    'responsibilities': data.get('responsibilities'),
-                    'end_date': data.get('end_date'),
-                }
-            )
-            created_experiences.append(experience)
-        resume.experiences.add(*created_experiences)
+    def validate_hard_skills(
+        self: 'ResumeSerializer', hard_skills: list[dict]
+    ) -> list[dict]:
+        return self.validate_unique_skills(hard_skills, 'hard_skill')
 
-        skills_seen = set()
-        for data in hard_skills:
-            skill = data.get('skill')
-            if skill in skills_seen:
-                raise serializers.ValidationError(
-                    'Дублирование hard_skill в одном резюме запрещено.')
-            skills_seen.add(skill)
-            HardSkill.objects.create(resume=resume, **data)
-
-        skills_seen = set()
-        for data in soft_skills:
-            skill = data.get('skill')
-            if skill in skills_seen:
-                raise serializers.ValidationError(
-                    'Дублирование soft_skill в одном резюме запрещено.')
-            skills_seen.add(skill)
-            SoftSkill.objects.create(resume=resume, **data)
+    def validate_soft_skills(
+        self: 'ResumeSerializer', soft_skills: list[dict]
+    ) -> list[dict]:
+        return self.validate_unique_skills(soft_skills, 'soft_skill')
+
+    @staticmethod
+    def validate_unique_skills(skills: list[dict], kind: str) -> list[dict]:
+        skill_ids = [data['skill'].pk for data in skills]
+        if len(skill_ids) != len(set(skill_ids)):
+            raise serializers.ValidationError(
+                f'Дублирование {kind} в одном резюме запрещено.')
+        return skills
 
+    def create(self: 'ResumeSerializer', validated_data: dict) -> Resume:
+        nested = {
+            field: validated_data.pop(field, [])
+            for field in self.NESTED_FIELDS
+        }
+        with model_errors(), transaction.atomic(), bulk_write():
+            resume = Resume.objects.create(**validated_data)
+            self.write_nested(resume, nested)
+        # Сетка навыков пересчитана в БД:
+        resume.refresh_from_db(fields=('skill_layout',))
         return resume
 
     def update(
         self: 'ResumeSerializer', instance: Resume, validated_data: dict
     ) -> Resume:
-        educations = validated_data.pop('educations', None)
-        experiences = validated_data.pop('experiences', None)
-        hard_skills = validated_data.pop('hard_skills', None)
-        soft_skills = validated_data.pop('soft_skills', None)
-
+        nested = {
+            field: validated_data.pop(field)
+            for field in self.NESTED_FIELDS
+            if field in validated_data
+        }
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
-
-        user = instance.user
-
-        if educations is not None:
-            resume_educations = []
-            for data in educations:
-                self.validate_education_data(data)
-                key = (data.get('institution'), data.get('start_date'))
-                education, _ = Education.objects.update_or_create(
-                    user=user,
-                    institution=key[0],
-                    start_date=key[1],
-                    defaults={
-                        'degree': data.get('degree'),
-                        'field_of_study': data.get('field_of_study'),
-                        'end_date': data.get('end_date'),
-                    }
-                )
-                resume_educations.append(education)
-            instance.educations.clear()
-            instance.educations.add(*resume_educations)
-
-        if experiences is not None:
-            resume_experiences = []
-            for data in experiences:
-                self.validate_experience_data(data)
-                key = (data.get('company'), data.get('start_date'))
-                experience, _ = Experience.objects.update_or_create(
-                    user=user,
-                    company=key[0],
-                    start_date=key[1],
-                    defaults={
-                        'position': data.get('position'),
-                        'responsibilities': data.get('responsibilities'),
-                        'end_date': data.get('end_date'),
-                    }
-                )
-                resume_experiences.append(experience)
-            instance.experiences.clear()
-            instance.experiences.add(*resume_experiences)
-
-        if hard_skills is not None:
-            skills_seen = set()
-            for data in hard_skills:
-                skill = data.get('skill')
-                if skill in skills_seen:
-                    raise serializers.ValidationError(
-                        'Дублирование hard_skill в одном резюме запрещено.')
-                skills_seen.add(skill)
-
-            instance.hard_skills.all().delete()
-            for data in hard_skills:
-                skill = data.get('skill')
-                HardSkill.objects.create(resume=instance, **data)
-
-        if soft_skills is not None:
-            skills_seen = set()
-            for data in soft_skills:
-                skill = data.get('skill')
-                if skill in skills_seen:
-                    raise serializers.ValidationError(
-                        'Дублирование soft_skill в одном резюме запрещено.')
-                skills_seen.add(skill)
-
-            instance.soft_skills.all().delete()
-            for data in soft_skills:
-                skill = data.get('skill')
-                SoftSkill.objects.create(resume=instance, **data)
-
+        with model_errors(), transaction.atomic(), bulk_write():
+            instance.save()
+            self.write_nested(instance, nested)
+        # Сетка навыков пересчитана в БД:
+        instance.refresh_from_db(fields=('skill_layout',))
         return instance
+
+    def write_nested(
+        self: 'ResumeSerializer', resume: Resume, nested: dict[str, list]
+    ) -> None:
+        """
+        Применяет к резюме только отличия вложенных данных от текущего
+        состояния (bulk-операции) и один раз обновляет производные данные
+        резюме — сигналы внутри bulk_write() отключены.
+        """
+        affected = {resume.pk}
+        for field, spec in USER_ITEM_SPECS.items():
+            if field in nested:
+                instances, affected_ids = reconcile_user_items(
+                    spec, resume.user, nested[field])
+                reconcile_resume_links(resume, field, instances)
+                affected |= affected_ids
+        skills_changed = False
+        for field, model in (
+            ('hard_skills', HardSkill),
+            ('soft_skills', SoftSkill),
+        ):
+            if field in nested:
+                skills_changed |= reconcile_resume_skills(
+                    model, resume, nested[field])
+        if skills_changed:
+            # Сохранение самого резюме сетку навыков не пересчитывает:
+            refresh_skill_layouts([resume.pk])
+        resumes_changed(affected, Resume)
+
+
+class ResumeCardSerializer(serializers.ModelSerializer):
+    avatar = serializers.SerializerMethodField(read_only=True)
+
+    class Meta:
+        model = ResumeCard
+        fields = (
+            'slug',
+            'full_name',
+            'username',
+            'avatar',
+            'country',
+            'city',
+            'category',
+            'position',
+            'created_at',
+        )
+        read_only_fields = fields
+
+    def get_avatar(
+        self: 'ResumeCardSerializer', obj: ResumeCard
+    ) -> str | None:
+        url = obj.avatar_url
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if url and request else url
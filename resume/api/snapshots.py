@@ -0,0 +1,87 @@
+import gzip
+import hashlib
+import re
+
+from core.conditional import not_modified, set_validators
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from rest_framework import permissions
+from rest_framework.decorators import action
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.serializers import Serializer
+from user.dictionaries import ReferenceDictionary, get_reference_dictionary
+
+from .constants import (DICTIONARY_SNAPSHOT_CACHE_KEY,
+                        DICTIONARY_SNAPSHOT_CACHE_TIMEOUT)
+
+ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+
+def build_snapshot(
+    dictionary: ReferenceDictionary, serializer_class: type[Serializer]
+) -> dict[str, bytes | str]:
+    objects = sorted(dictionary.all().values(), key=lambda obj: obj.pk)
+    body = JSONRenderer().render(serializer_class(objects, many=True).data)
+    return {
+        'etag': hashlib.sha256(body).hexdigest(),
+        'body': body,
+        'gzip': gzip.compress(body, mtime=0),
+    }
+
+
+def get_snapshot(
+    dictionary: ReferenceDictionary, serializer_class: type[Serializer]
+) -> dict[str, bytes | str]:
+    """
+    Весь справочник одним JSON-документом (и его gzip-версия). Документ
+    хранится в общем кэше под версией справочника и пересобирается только
+    после её смены.
+    """
+    key = DICTIONARY_SNAPSHOT_CACHE_KEY.format(
+        name=dictionary.model._meta.model_name,
+        version=dictionary.current_version(),
+    )
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = build_snapshot(dictionary, serializer_class)
+        cache.set(key, snapshot, DICTIONARY_SNAPSHOT_CACHE_TIMEOUT)
+    return snapshot
+
+
+class DictionarySnapshotMixin:
+    """
+    Добавляет справочнику действие GET <dictionary>/snapshot/ — весь
+    справочник без пагинации, с ETag по хэшу содержимого.
+    """
+
+    @action(
+        detail=False,
+        methods=['get'],
+        permission_classes=(permissions.AllowAny,),
+        pagination_class=None,
+        filter_backends=(),
+    )
+    def snapshot(
+        self: 'DictionarySnapshotMixin', request: Request
+    ) -> HttpResponse:
+        dictionary = get_reference_dictionary(self.queryset.model)
+        snapshot = get_snapshot(dictionary, self.serializer_class)
+
+        use_gzip = bool(
+            ACCEPTS_GZIP.search(request.META.get('HTTP_ACCEPT_ENCODING', '')))
+        # Сжатое и несжатое представления различаются побайтно, поэтому
+        # у них разные строгие ETag:
+        etag = f'"{snapshot["etag"]}{"-gzip" if use_gzip else ""}"'
+
+        response = not_modified(request, etag)
+        if response is None:
+            response = HttpResponse(
+                snapshot['gzip'] if use_gzip else snapshot['body'],
+                content_type='application/json',
+            )
+            if use_gzip:
+                response.headers['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return set_validators(response, etag)
@@ -0,0 +1,114 @@
+import pytest
+from django.test import Client
+from django.urls import reverse
+from user import autocomplete as autocomplete_module
+from user.constants import MAX_AUTOCOMPLETE_LIMIT
+from user.models import HardSkillName, Location, Position
+
+
+def autocomplete(client: Client, kind: str, query: str) -> list[str]:
+    url = reverse('api:autocomplete-detail', kwargs={'kind': kind})
+    response = client.get(url, {'q': query})
+    return [item['text'] for item in response.json()['results']]
+
+
+@pytest.mark.django_db
+def test_prefix_match_ignores_case_spaces_and_transliteration(
+    client: Client
+) -> None:
+    Location.objects.create(country='Россия', city='Москва')
+    Location.objects.create(country='Россия', city='Нижний Новгород')
+
+    assert autocomplete(client, 'locations', '  МОС') == ['Россия: Москва']
+    assert autocomplete(client, 'locations', 'moskv') == ['Россия: Москва']
+    assert autocomplete(client, 'locations', 'новг') == [
+        'Россия: Нижний Новгород']
+
+
+@pytest.mark.django_db
+def test_index_follows_dictionary_changes(client: Client) -> None:
+    skill = HardSkillName.objects.create(name='Ёлочные игрушки')
+    HardSkillName.objects.create(name='C++')
+    assert autocomplete(client, 'hard-skills', 'елоч') == ['Ёлочные игрушки']
+    assert autocomplete(client, 'hard-skills', 'c+') == ['C++']
+
+    skill.name = 'Python'
+    skill.save()
+    assert autocomplete(client, 'hard-skills', 'елоч') == []
+    assert autocomplete(client, 'hard-skills', 'py') == ['Python']
+
+
+@pytest.mark.django_db
+def test_unknown_dictionary(client: Client) -> None:
+    url = reverse('api:autocomplete-detail', kwargs={'kind': 'unknown'})
+    assert client.get(url, {'q': 'a'}).status_code == 404
+
+
+@pytest.mark.django_db
+def test_version_bump_rekeys_only_changed_rows(
+    client: Client, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    skills = [
+        HardSkillName.objects.create(name=f'Skill {i}') for i in range(5)]
+    assert len(autocomplete(client, 'hard-skills', 'skill')) == 5
+
+    keyed = []
+    original = autocomplete_module.autocomplete_keys
+    monkeypatch.setattr(
+        autocomplete_module,
+        'autocomplete_keys',
+        lambda values: keyed.append(values) or original(values),
+    )
+    skills[0].name = 'Django'
+    skills[0].save()
+    assert autocomplete(client, 'hard-skills', 'djan') == ['Django']
+    assert keyed == [('Django',)]
+
+
+class CountingList(list):
+    """Список, считающий прочитанные по индексу элементы."""
+    reads = 0
+
+    def __getitem__(self: 'CountingList', index: int) -> object:
+        self.reads += 1
+        return super().__getitem__(index)
+
+
+@pytest.mark.django_db
+def test_short_prefix_scan_stops_at_limit() -> None:
+    for i in range(50):
+        HardSkillName.objects.create(name=f'Skill {i:02}')
+    index = autocomplete_module.get_autocomplete_index('hard-skills')
+    expected = index.search('s', limit=None)[:3]
+
+    index._entries = entries = CountingList(index._entries)
+    assert index.search('s', limit=3) == expected
+    # Двоичный поиск начала префикса и три совпадения вместо всех 50:
+    assert entries.reads <= len(entries).bit_length() + 3
+
+
+@pytest.mark.django_db
+def test_admin_autocomplete_keeps_other_search_fields(
+    admin_client: Client,
+) -> None:
+    Position.objects.create(category='Дизайн', position='Иллюстратор')
+    for i in range(MAX_AUTOCOMPLETE_LIMIT + 1):
+        Position.objects.create(category='IT', position=f'Разработчик {i}')
+    url = reverse('admin:autocomplete')
+    params = {
+        'app_label': 'user',
+        'model_name': 'resume',
+        'field_name': 'position',
+    }
+
+    # Категория не входит в индекс и ищется через search_fields:
+    response = admin_client.get(url, {**params, 'term': 'Дизайн'})
+    assert [item['text'] for item in response.json()['results']] == [
+        'Дизайн: Иллюстратор']
+
+    # Результаты не обрезаются лимитом API: последняя страница виджета
+    # содержит запись сверх MAX_AUTOCOMPLETE_LIMIT.
+    page = MAX_AUTOCOMPLETE_LIMIT // 20 + 1
+    response = admin_client.get(
+        url, {**params, 'term': 'разраб', 'page': page})
+    assert response.json()['results']
@@ -0,0 +1,130 @@
+from io import BytesIO
+
+import pytest
+from django.core.files.storage import default_storage
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+from user.models import User
+
+from . import uploads
+
+pytestmark = pytest.mark.usefixtures('media')
+
+
+def image_bytes(size: tuple[int, int], image_format: str = 'PNG') -> bytes:
+    buffer = BytesIO()
+    Image.new('RGB', size, 'blue').save(buffer, image_format)
+    return buffer.getvalue()
+
+
+def avatar_url(user: User) -> str:
+    return reverse('api:users-avatar', kwargs={'pk': user.pk})
+
+
+@pytest.mark.django_db
+def test_raw_body_upload(api_client: APIClient, author: User) -> None:
+    response = api_client.put(
+        avatar_url(author),
+        image_bytes((200, 100), 'JPEG'),
+        content_type='image/jpeg',
+    )
+    assert response.status_code == 200, response.json()
+    author.refresh_from_db()
+    assert author.avatar.name.endswith('.jpeg')
+    assert author.avatar_status == User.AVATAR_PENDING
+    with default_storage.open(author.avatar.name) as file:
+        assert Image.open(file).size == (200, 100)
+
+
+@pytest.mark.django_db
+def test_multipart_upload_replaces_old_avatar(
+    api_client: APIClient, author: User
+) -> None:
+    url = avatar_url(author)
+    api_client.put(url, image_bytes((100, 100)), content_type='image/png')
+    author.refresh_from_db()
+    old_name = author.avatar.name
+
+    upload = BytesIO(image_bytes((120, 120)))
+    upload.name = 'photo.png'
+    response = api_client.put(url, {'avatar': upload}, format='multipart')
+    assert response.status_code == 200, response.json()
+    author.refresh_from_db()
+    assert author.avatar.name != old_name
+    assert not default_storage.exists(old_name)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'body, message',
+    (
+        (image_bytes((32, 32)), 'не меньше'),
+        (b'not an image', 'корректное изображение'),
+        (image_bytes((100, 100), 'TIFF'), 'Допустимые форматы'),
+    ),
+)
+def test_invalid_images_are_rejected(
+    api_client: APIClient, author: User, body: bytes, message: str
+) -> None:
+    response = api_client.put(
+        avatar_url(author), body, content_type='application/octet-stream')
+    assert response.status_code == 400
+    assert message in response.json()['avatar'][0]
+    author.refresh_from_db()
+    assert not author.avatar
+
+
+def test_size_cap_is_enforced_while_streaming(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    body = image_bytes((100, 100))
+    monkeypatch.setattr(uploads, 'AVATAR_MAX_UPLOAD_SIZE', len(body) - 1)
+    stream = uploads.AvatarStream('image/png')
+    with pytest.raises(uploads.AvatarTooLarge):
+        for start in range(0, len(body), 64):
+            stream.write(body[start:start + 64])
+
+
+def test_header_is_not_reparsed_for_every_chunk(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    body = image_bytes((100, 100), 'JPEG')
+    calls = []
+    image_open = uploads.Image.open
+    monkeypatch.setattr(
+        uploads.Image, 'open',
+        lambda fp: calls.append(fp) or image_open(fp),
+    )
+    stream = uploads.AvatarStream('image/jpeg')
+    for start in range(0, len(body), 8):
+        stream.write(body[start:start + 8])
+    upload = stream.finish()
+
+    assert upload.name == 'avatar.jpeg'
+    assert upload.read() == body
+    upload.close()
+    assert len(calls) < len(body).bit_length() + 1
+
+
+@pytest.mark.django_db
+def test_content_length_over_cap_is_rejected(
+    api_client: APIClient, author: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    body = image_bytes((100, 100))
+    url = avatar_url(author)
+    monkeypatch.setattr(uploads, 'AVATAR_MAX_UPLOAD_SIZE', len(body) - 1)
+    assert api_client.put(
+        url, body, content_type='image/png').status_code == 413
+
+    monkeypatch.setattr(uploads, 'AVATAR_MAX_UPLOAD_SIZE', len(body))
+    assert api_client.put(
+        url, body, content_type='image/png').status_code == 200
+
+
+@pytest.mark.django_db
+def test_other_users_avatar_is_not_accessible(api_client: APIClient) -> None:
+    other = User.objects.create(username='other', email='o@mail.com')
+    response = api_client.put(
+        avatar_url(other), image_bytes((100, 100)), content_type='image/png')
+    assert response.status_code == 404
@@ -0,0 +1,36 @@
+import pytest
+from django.urls import reverse
+from rest_framework.test import APIClient
+from user.models import HardSkillName, Location, Position, SoftSkillName
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    'url_name, model, existing, duplicate',
+    (
+        ('api:hardskill-list', HardSkillName,
+         {'name': 'Python'}, {'name': ' python '}),
+        ('api:softskill-list', SoftSkillName,
+         {'name': 'Общение'}, {'name': 'ОБЩЕНИЕ'}),
+        ('api:location-list', Location,
+         {'country': 'Россия', 'city': 'Орёл'},
+         {'country': 'россия', 'city': 'Орел'}),
+        ('api:position-list', Position,
+         {'category': 'IT', 'position': 'Тестировщик'},
+         {'category': 'it', 'position': 'тестировщик'}),
+    ),
+)
+def test_normalized_duplicate_is_rejected(
+    staff_client: APIClient,
+    url_name: str,
+    model: type,
+    existing: dict,
+    duplicate: dict,
+) -> None:
+    url = reverse(url_name)
+    assert staff_client.post(url, existing, format='json').status_code == 201
+
+    response = staff_client.post(url, duplicate, format='json')
+    assert response.status_code == 400
+    assert 'уже существует' in str(response.json())
+    assert model.objects.count() == 1
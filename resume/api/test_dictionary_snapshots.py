@@ -0,0 +1,45 @@
+import gzip
+import json
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from user.models import HardSkillName
+
+from .constants import MAX_SKILLS_PER_REQUEST
+
+
+@pytest.mark.django_db
+def test_snapshot_returns_whole_dictionary_compressed(client: Client) -> None:
+    HardSkillName.objects.bulk_create(
+        HardSkillName(
+            name=f'Hard {i}',
+            normalized_key=HardSkillName.build_normalized_key(f'Hard {i}'),
+        )
+        for i in range(MAX_SKILLS_PER_REQUEST + 1)
+    )
+    # bulk_create обходит сигналы, поэтому сбрасываем версию явно:
+    HardSkillName.objects.first().save()
+
+    response = client.get(
+        reverse('api:hardskill-snapshot'), HTTP_ACCEPT_ENCODING='gzip')
+    assert response.headers['Content-Encoding'] == 'gzip'
+    skills = json.loads(gzip.decompress(response.content))
+    assert len(skills) == MAX_SKILLS_PER_REQUEST + 1
+
+
+@pytest.mark.django_db
+def test_snapshot_etag_follows_dictionary_changes(client: Client) -> None:
+    skill = HardSkillName.objects.create(name='Python')
+    url = reverse('api:hardskill-snapshot')
+    response = client.get(url)
+    etag = response.headers['ETag']
+    assert response.json() == [
+        {'id': skill.pk, 'name': 'Python', 'description': None}]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    skill.name = 'Python 3'
+    skill.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.json()[0]['name'] == 'Python 3'
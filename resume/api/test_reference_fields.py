@@ -0,0 +1,73 @@
+import pytest
+from user.models import HardSkillName
+
+from .serializers import HardSkillSerializer
+
+
+@pytest.mark.django_db
+def test_skill_ids_resolved_from_memory(
+    django_assert_num_queries: callable, hard_skill_names: callable
+) -> None:
+    skills = hard_skill_names(5)
+    payload = [
+        {'skill_id': skill.pk, 'grid_row': 1, 'grid_column': 1}
+        for skill in skills
+    ]
+    # Первое обращение загружает справочник в память процесса:
+    assert HardSkillSerializer(data=payload[0]).is_valid()
+
+    with django_assert_num_queries(0):
+        serializer = HardSkillSerializer(data=payload, many=True)
+        assert serializer.is_valid(), serializer.errors
+    assert [item['skill'] for item in serializer.validated_data] == skills
+
+
+@pytest.mark.django_db
+def test_dictionary_write_invalidates_memory_copy() -> None:
+    HardSkillName.objects.create(name='Python')
+    assert HardSkillSerializer(
+        data={'skill_id': 0, 'grid_row': 1, 'grid_column': 1}
+    ).is_valid() is False
+
+    skill = HardSkillName.objects.create(name='SQL')
+    serializer = HardSkillSerializer(
+        data={'skill_id': skill.pk, 'grid_row': 1, 'grid_column': 1})
+    assert serializer.is_valid(), serializer.errors
+
+    skill.delete()
+    assert HardSkillSerializer(
+        data={'skill_id': skill.pk, 'grid_row': 1, 'grid_column': 1}
+    ).is_valid() is False
+
+
+@pytest.mark.django_db
+def test_nested_skill_ids_resolved_with_one_query(
+    django_assert_num_queries: callable, hard_skill_names: callable
+) -> None:
+    skills = hard_skill_names(5)
+    payload = [
+        {'skill_id': skill.pk, 'grid_row': 1, 'grid_column': 1}
+        for skill in skills
+    ]
+    # Справочник не загружен в память: один запрос id__in на всю пачку.
+    with django_assert_num_queries(1):
+        serializer = HardSkillSerializer(data=payload, many=True)
+        assert serializer.is_valid(), serializer.errors
+    assert [item['skill'] for item in serializer.validated_data] == skills
+
+
+@pytest.mark.django_db
+def test_all_missing_skill_ids_reported_in_one_error() -> None:
+    skill = HardSkillName.objects.create(name='Python')
+    serializer = HardSkillSerializer(
+        data=[
+            {'skill_id': pk, 'grid_row': 1, 'grid_column': 1}
+            for pk in (skill.pk, skill.pk + 2, skill.pk + 1)
+        ],
+        many=True,
+    )
+    assert serializer.is_valid() is False
+    assert serializer.errors == [
+        f'skill_id: объекты с id {skill.pk + 1}, {skill.pk + 2} '
+        'не существуют.'
+    ]
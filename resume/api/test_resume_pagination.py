@@ -0,0 +1,55 @@
+import pytest
+from django.test import Client
+from django.urls import reverse
+from user.models import Position, Resume, User
+
+from .pagination import ResumePagination
+
+
+@pytest.fixture
+def resumes(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    monkeypatch.setattr(ResumePagination, 'page_size', 2)
+    position = Position.objects.create(category='IT', position='Тестировщик')
+    for i in range(5):
+        user = User.objects.create(username=f'user_{i}', email=f'{i}@mail.ru')
+        Resume.objects.create(user=user, position=position, about_me='-')
+    return list(Resume.objects.values_list('slug', flat=True))
+
+
+def collect(client: Client, url: str, direction: str) -> list[list[str]]:
+    pages = []
+    while url:
+        data = client.get(url).json()
+        pages.append([resume['slug'] for resume in data['results']])
+        url = data[direction]
+    return pages
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_walks_forward_and_back(
+    client: Client, resumes: list[str]
+) -> None:
+    forward = collect(client, reverse('api:resume-list'), 'next')
+    assert forward == [resumes[0:2], resumes[2:4], resumes[4:]]
+
+    last_page = client.get(reverse('api:resume-list')).json()['next']
+    last_page = client.get(last_page).json()['next']
+    backward = collect(client, last_page, 'previous')
+    assert backward == [resumes[4:], resumes[2:4], resumes[0:2]]
+
+
+@pytest.mark.django_db
+def test_page_number_links_keep_working(
+    client: Client, resumes: list[str]
+) -> None:
+    data = client.get(reverse('api:resume-list'), {'page': 2}).json()
+    assert data['count'] == len(resumes)
+    assert [resume['slug'] for resume in data['results']] == resumes[2:4]
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_returns_not_found(
+    client: Client, resumes: list[str]
+) -> None:
+    response = client.get(reverse('api:resume-list'), {'cursor': 'broken'})
+    assert response.status_code == 404
@@ -0,0 +1,118 @@
+import datetime as dt
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+from user.models import (Education, Experience, HardSkill, HardSkillName,
+                         Location, Position, Resume, SoftSkill, SoftSkillName,
+                         User)
+
+# Keyset-пагинация без COUNT: резюме с user/location/position и
+# prefetch образования и опыта (навыки — из сохранённой сетки):
+LIST_QUERIES_BUDGET = 3
+# Резюме с user/location/position + 2 prefetch:
+RETRIEVE_QUERIES_BUDGET = 3
+
+
+def create_resumes(count: int) -> list[Resume]:
+    location = Location.objects.create(country='Россия', city='Москва')
+    position = Position.objects.create(category='IT', position='Тестировщик')
+    hard_skills = [
+        HardSkillName.objects.create(name=f'Hard {i}') for i in range(3)
+    ]
+    soft_skills = [
+        SoftSkillName.objects.create(name=f'Soft {i}') for i in range(3)
+    ]
+
+    resumes = []
+    for i in range(count):
+        user = User.objects.create(
+            username=f'user_{i}',
+            email=f'user_{i}@mail.com',
+            location=location,
+        )
+        resume = Resume.objects.create(
+            user=user, position=position, about_me='Обо мне')
+        resume.educations.add(
+            Education.objects.create(
+                user=user,
+                institution='МГУ',
+                degree='Бакалавр',
+                field_of_study='Физика',
+                start_date=dt.date(2015, 9, 1),
+            )
+        )
+        resume.experiences.add(
+            Experience.objects.create(
+                user=user,
+                company='Компания',
+                position='Инженер',
+                start_date=dt.date(2020, 1, 1),
+            )
+        )
+        for column, skill in enumerate(hard_skills, start=1):
+            HardSkill.objects.create(
+                resume=resume, skill=skill, grid_column=column)
+        for column, skill in enumerate(soft_skills, start=1):
+            SoftSkill.objects.create(
+                resume=resume, skill=skill, grid_column=column)
+        resumes.append(resume)
+    return resumes
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('resumes_count', (1, 10))
+def test_resume_list_queries_do_not_depend_on_page_size(
+    client: Client,
+    django_assert_num_queries: callable,
+    resumes_count: int,
+) -> None:
+    create_resumes(resumes_count)
+    url = reverse('api:resume-list')
+    with django_assert_num_queries(LIST_QUERIES_BUDGET):
+        response = client.get(url)
+    assert len(response.json()['results']) == resumes_count
+
+
+@pytest.mark.django_db
+def test_resume_retrieve_queries_budget(
+    client: Client, django_assert_num_queries: callable
+) -> None:
+    resume, *_ = create_resumes(1)
+    url = reverse('api:resume-detail', kwargs={'slug': resume.slug})
+    with django_assert_num_queries(RETRIEVE_QUERIES_BUDGET):
+        response = client.get(url)
+    assert len(response.json()['hard_skills']) == 3
+
+
+@pytest.mark.django_db
+def test_conditional_retrieve_skips_database_and_serializer(
+    client: Client, django_assert_num_queries: callable
+) -> None:
+    resume, *_ = create_resumes(1)
+    url = reverse('api:resume-detail', kwargs={'slug': resume.slug})
+    etag = client.get(url).headers['ETag']
+    # Первый условный запрос кэширует штамп резюме:
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    with django_assert_num_queries(0):
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    resume.about_me = 'Новый текст'
+    resume.save()
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+@pytest.mark.django_db
+def test_resume_list_weak_etag_follows_page_content(client: Client) -> None:
+    resume, *_ = create_resumes(2)
+    url = reverse('api:resume-list')
+    etag = client.get(url).headers['ETag']
+    assert etag.startswith('W/')
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    resume.educations.first().delete()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
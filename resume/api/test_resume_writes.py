@@ -0,0 +1,115 @@
+import datetime as dt
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from user.models import Education, HardSkill, HardSkillName, Resume, User
+
+
+def education(institution: str, degree: str = 'Бакалавр') -> dict:
+    return {
+        'institution': institution,
+        'degree': degree,
+        'field_of_study': 'Физика',
+        'start_date': '2015-09-01',
+    }
+
+
+def patch_resume(
+    api_client: APIClient, resume: Resume, payload: dict
+) -> int:
+    url = reverse('api:resume-detail', kwargs={'slug': resume.slug})
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.patch(url, payload, format='json')
+    assert response.status_code == 200, response.json()
+    return len(queries)
+
+
+@pytest.mark.django_db
+def test_nested_write_statements_do_not_depend_on_payload_size(
+    api_client: APIClient, resume: Resume, hard_skill_names: callable
+) -> None:
+    skills = hard_skill_names(30)
+
+    def payload(count: int) -> dict:
+        return {
+            'educations': [education(f'ВУЗ {i}') for i in range(count)],
+            'hard_skills': [
+                {'skill_id': skill.pk, 'grid_row': i // 5 + 1,
+                 'grid_column': i % 5 + 1}
+                for i, skill in enumerate(skills[:count])
+            ],
+        }
+
+    # Прогрев справочников и кэшей, затем запись в пустое резюме:
+    patch_resume(api_client, resume, payload(1))
+    patch_resume(api_client, resume, payload(0))
+    small = patch_resume(api_client, resume, payload(3))
+    patch_resume(api_client, resume, payload(0))
+    large = patch_resume(api_client, resume, payload(30))
+    assert large == small
+
+
+@pytest.mark.django_db
+def test_nested_write_applies_only_the_diff(
+    api_client: APIClient, author: User, resume: Resume
+) -> None:
+    python, sql, git = (
+        HardSkillName.objects.create(name=name)
+        for name in ('Python', 'SQL', 'Git')
+    )
+    patch_resume(api_client, resume, {
+        'educations': [education('МГУ'), education('МФТИ')],
+        'hard_skills': [
+            {'skill_id': python.pk, 'grid_row': 1, 'grid_column': 1},
+            {'skill_id': sql.pk, 'grid_row': 1, 'grid_column': 2},
+        ],
+    })
+    kept_skill = HardSkill.objects.get(resume=resume, skill=sql)
+    version = resume.content_version.version
+
+    patch_resume(api_client, resume, {
+        'educations': [education('МФТИ', 'Магистр'), education('СПбГУ')],
+        'hard_skills': [
+            {'skill_id': sql.pk, 'grid_row': 2, 'grid_column': 1},
+            {'skill_id': git.pk, 'grid_row': 1, 'grid_column': 1},
+        ],
+    })
+
+    resume.refresh_from_db()
+    assert set(resume.educations.values_list('institution', 'degree')) == {
+        ('МФТИ', 'Магистр'), ('СПбГУ', 'Бакалавр')}
+    # Образование принадлежит пользователю и из резюме только отвязано:
+    assert Education.objects.filter(
+        user=author, institution='МГУ', start_date=dt.date(2015, 9, 1)
+    ).exists()
+    kept_skill.refresh_from_db()
+    assert (kept_skill.grid_row, kept_skill.grid_column) == (2, 1)
+    assert set(resume.hard_skills.values_list('skill__name', flat=True)) == {
+        'SQL', 'Git'}
+    assert [
+        [[cell['name'] for cell in cells] for cells in row]
+        for row in resume.skill_layout['hard']
+    ] == [[['Git']], [['SQL']]]
+    resume.content_version.refresh_from_db()
+    assert resume.content_version.version > version
+
+
+@pytest.mark.django_db
+def test_duplicate_skills_rejected_before_any_write(
+    api_client: APIClient, resume: Resume
+) -> None:
+    skill = HardSkillName.objects.create(name='Python')
+    url = reverse('api:resume-detail', kwargs={'slug': resume.slug})
+    response = api_client.patch(url, {
+        'about_me': 'Новый текст',
+        'hard_skills': [
+            {'skill_id': skill.pk, 'grid_row': 1, 'grid_column': 1},
+            {'skill_id': skill.pk, 'grid_row': 1, 'grid_column': 2},
+        ],
+    }, format='json')
+    assert response.status_code == 400
+    resume.refresh_from_db()
+    assert resume.about_me == 'Обо мне'
@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from user.models import Education, Experience, Position, Resume, User
+
+
+def experience(company: str, position: str = 'Инженер') -> dict:
+    return {
+        'company': company,
+        'position': position,
+        'start_date': '2020-01-01',
+    }
+
+
+def patch_user(api_client: APIClient, user: User, payload: dict) -> int:
+    url = reverse('api:users-detail', kwargs={'pk': user.pk})
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.patch(url, payload, format='json')
+    assert response.status_code == 200, response.json()
+    return len(queries)
+
+
+@pytest.mark.django_db
+def test_removed_items_are_unlinked_from_resumes(
+    api_client: APIClient, author: User
+) -> None:
+    patch_user(api_client, author, {
+        'experiences': [experience('Яндекс'), experience('Сбер')]})
+    resume = Resume.objects.create(
+        user=author,
+        position=Position.objects.create(category='IT', position='Аналитик'),
+        about_me='Обо мне',
+    )
+    resume.experiences.set(Experience.objects.filter(user=author))
+    version = resume.content_version.version
+
+    patch_user(api_client, author, {
+        'experiences': [experience('Сбер', 'Тимлид'), experience('Ozon')]})
+
+    assert set(
+        Experience.objects.filter(user=author)
+        .values_list('company', 'position')
+    ) == {('Сбер', 'Тимлид'), ('Ozon', 'Инженер')}
+    assert list(resume.experiences.values_list('company', flat=True)) == [
+        'Сбер']
+    resume.content_version.refresh_from_db()
+    assert resume.content_version.version > version
+
+
+@pytest.mark.django_db
+def test_sync_statements_do_not_depend_on_payload_size(
+    api_client: APIClient, author: User
+) -> None:
+    def payload(count: int) -> dict:
+        return {
+            'educations': [
+                {
+                    'institution': f'ВУЗ {i}',
+                    'degree': 'Бакалавр',
+                    'field_of_study': 'Физика',
+                    'start_date': '2015-09-01',
+                }
+                for i in range(count)
+            ],
+            'experiences': [experience(f'Компания {i}') for i in range(count)],
+        }
+
+    patch_user(api_client, author, payload(2))
+    small = patch_user(api_client, author, payload(3))
+    patch_user(api_client, author, payload(2))
+    large = patch_user(api_client, author, payload(30))
+    assert large == small
+    assert Education.objects.filter(user=author).count() == 30
+    # Удаление лишних записей — тоже фиксированное число запросов:
+    assert patch_user(api_client, author, payload(2)) == patch_user(
+        api_client, author, payload(1))
@@ -0,0 +1,186 @@
+from io import SEEK_END, BytesIO
+from typing import IO, Optional
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+from django.http.multipartparser import \
+    MultiPartParser as DjangoMultiPartParser
+from django.http.multipartparser import MultiPartParserError
+from PIL import Image
+from rest_framework import status
+from rest_framework.exceptions import APIException, ParseError, ValidationError
+from rest_framework.parsers import BaseParser, DataAndFiles, MultiPartParser
+from user.avatars import IMAGE_ERRORS, check_avatar_dimensions
+
+from .constants import (AVATAR_HEADER_MAX_SIZE, AVATAR_MAX_UPLOAD_SIZE,
+                        AVATAR_UPLOAD_CHUNK_SIZE, AVATAR_UPLOAD_FORMATS)
+
+AVATAR_FIELD = 'avatar'
+
+
+class AvatarTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = (
+        f'Размер аватара не должен превышать '
+        f'{AVATAR_MAX_UPLOAD_SIZE // (1024 * 1024)} МБ.'
+    )
+    default_code = 'avatar_too_large'
+
+
+def invalid_avatar(message: str) -> ValidationError:
+    return ValidationError({AVATAR_FIELD: [message]})
+
+
+class AvatarStream:
+    """
+    Принимает аватар частями: пишет их во временный файл на диске,
+    ограничивает размер и проверяет заголовок изображения (формат и
+    размеры), как только он получен, — без base64 и копий в памяти.
+    """
+
+    def __init__(self: 'AvatarStream', content_type: str) -> None:
+        self.file = TemporaryUploadedFile(
+            AVATAR_FIELD, content_type, 0, None)
+        self.size = 0
+        # Начало файла, пока заголовок изображения не разобран:
+        self.header: Optional[BytesIO] = BytesIO()
+        # Размер буфера, при котором заголовок разбирается снова:
+        self.next_header_check = 0
+        self.image_format: Optional[str] = None
+
+    def write(self: 'AvatarStream', chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > AVATAR_MAX_UPLOAD_SIZE:
+            self.file.close()
+            raise AvatarTooLarge()
+        if self.header is not None:
+            self._check_header(chunk)
+        self.file.write(chunk)
+
+    def finish(self: 'AvatarStream') -> TemporaryUploadedFile:
+        if self.header is not None:
+            self._parse_header(complete=True)
+        self.file.seek(0)
+        self.file.size = self.size
+        # Имя по фактическому формату, а не по присланному:
+        self.file.name = f'{AVATAR_FIELD}.{self.image_format.lower()}'
+        return self.file
+
+    def _check_header(self: 'AvatarStream', chunk: bytes) -> None:
+        """
+        Копит начало файла и разбирает его, только когда буфер вырос
+        вдвое: для мелких частей заголовок не разбирается заново на
+        каждой из них.
+        """
+        self.header.seek(0, SEEK_END)
+        self.header.write(chunk)
+        buffered = self.header.tell()
+        if (
+            buffered >= self.next_header_check
+            or buffered > AVATAR_HEADER_MAX_SIZE
+        ):
+            self.next_header_check = 2 * buffered
+            self._parse_header(complete=False)
+
+    def _parse_header(self: 'AvatarStream', complete: bool) -> None:
+        self.header.seek(0)
+        try:
+            with Image.open(self.header) as image:
+                image_format, size = image.format, image.size
+        except IMAGE_ERRORS:
+            # Заголовок ещё не получен целиком (или это не изображение):
+            buffered = self.header.seek(0, SEEK_END)
+            if complete or buffered > AVATAR_HEADER_MAX_SIZE:
+                self.file.close()
+                raise invalid_avatar('Загрузите корректное изображение.')
+            return
+
+        self.header = None
+        try:
+            if image_format not in AVATAR_UPLOAD_FORMATS:
+                raise DjangoValidationError(
+                    'Допустимые форматы аватара: '
+                    f'{", ".join(AVATAR_UPLOAD_FORMATS)}.'
+                )
+            check_avatar_dimensions(*size)
+        except DjangoValidationError as e:
+            self.file.close()
+            raise invalid_avatar(e.messages[0])
+        self.image_format = image_format
+
+
+class AvatarUploadHandler(FileUploadHandler):
+    """Обработчик multipart: принимает только поле avatar (AvatarStream)."""
+    chunk_size = AVATAR_UPLOAD_CHUNK_SIZE
+
+    def new_file(
+        self: 'AvatarUploadHandler', *args: tuple, **kwargs: dict
+    ) -> None:
+        super().new_file(*args, **kwargs)
+        if self.field_name != AVATAR_FIELD:
+            raise SkipFile()
+        self.stream = AvatarStream(self.content_type)
+
+    def receive_data_chunk(
+        self: 'AvatarUploadHandler', raw_data: bytes, start: int
+    ) -> None:
+        self.stream.write(raw_data)
+
+    def file_complete(
+        self: 'AvatarUploadHandler', file_size: int
+    ) -> TemporaryUploadedFile:
+        return self.stream.finish()
+
+
+def check_content_length(request: object) -> None:
+    """Заведомо слишком большое тело отклоняется до чтения."""
+    try:
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        length = 0
+    if length > AVATAR_MAX_UPLOAD_SIZE:
+        raise AvatarTooLarge()
+
+
+class AvatarMultiPartParser(MultiPartParser):
+    """multipart/form-data с файлом в поле avatar."""
+
+    def parse(
+        self: 'AvatarMultiPartParser',
+        stream: IO,
+        media_type: Optional[str] = None,
+        parser_context: Optional[dict] = None,
+    ) -> DataAndFiles:
+        request = parser_context['request']
+        check_content_length(request)
+        meta = request.META.copy()
+        meta['CONTENT_TYPE'] = media_type
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            data, files = DjangoMultiPartParser(
+                meta, stream, [AvatarUploadHandler(request)], encoding
+            ).parse()
+        except MultiPartParserError as e:
+            raise ParseError(f'Ошибка разбора multipart: {e}')
+        return DataAndFiles(data, files)
+
+
+class AvatarRawParser(BaseParser):
+    """Изображение целиком в теле запроса (image/*, octet-stream)."""
+    media_type = '*/*'
+
+    def parse(
+        self: 'AvatarRawParser',
+        stream: Optional[IO],
+        media_type: Optional[str] = None,
+        parser_context: Optional[dict] = None,
+    ) -> DataAndFiles:
+        check_content_length(parser_context['request'])
+        avatar = AvatarStream(media_type or 'application/octet-stream')
+        while stream is not None and (
+            chunk := stream.read(AVATAR_UPLOAD_CHUNK_SIZE)
+        ):
+            avatar.write(chunk)
+        return DataAndFiles({}, {AVATAR_FIELD: avatar.finish()})
@@ -16,6 +16,9 @@ router.register(
 )
 router.register(r'locations', views.LocationViewSet, basename='location')
 router.register(r'positions', views.PositionViewSet, basename='position')
+router.register(
+    r'autocomplete', views.AutocompleteViewSet, basename='autocomplete'
+)
 router.register(r'users', views.UserViewSet, basename='users')
 router.register(r'resumes', views.ResumeViewSet, basename='resume')
 
@@ -1,5 +1,7 @@
 from urllib.parse import urljoin
 
+from core.conditional import (is_conditional, not_modified, page_etag,
+                              set_validators)
 from core.config import web_config
 from django.conf import settings
 from django.contrib.auth.hashers import make_password
@@ -12,20 +14,28 @@ from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, mixins, permissions, status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.request import Request
 from rest_framework.response import Response
 from services.models import PendingUser
-from user.models import (HardSkillName, Location, Position, Resume,
+from user.autocomplete import get_autocomplete_index
+from user.constants import AUTOCOMPLETE_LIMIT, MAX_AUTOCOMPLETE_LIMIT
+from user.facets import get_facets
+from user.models import (HardSkillName, Location, Position, Resume, ResumeCard,
                          SoftSkillName, User)
+from user.versions import ResumeStamp, get_resume_stamp
 
+from .filters import ResumeSearchFilter
 from .pagination import (LocationPagination, PositionPagination,
                          ResumePagination, SkillPagination)
 from .permissions import IsOwner, IsOwnerOrReadOnly, StaffOrReadOnly
 from .serializers import (HardSkillNameSerializer, LocationSerializer,
                           PasswordChangeSerializer, PendingUserSerializer,
-                          PositionSerializer, ResumeSerializer,
-                          SoftSkillNameSerializer, UserMeSerializer,
-                          UserSerializer)
+                          PositionSerializer, ResumeCardSerializer,
+                          ResumeSerializer, SoftSkillNameSerializer,
+                          UserMeSerializer, UserSerializer)
+from .snapshots import DictionarySnapshotMixin
+from .uploads import AVATAR_FIELD, AvatarMultiPartParser, AvatarRawParser
 
 
 class UserAuthViewSet(viewsets.ViewSet):
@@ -245,7 +255,7 @@ class PasswordViewSet(viewsets.ViewSet):
         return Response({'detail': 'Пароль успешно изменён'})
 
 
-class HardSkillNameViewSet(viewsets.ModelViewSet):
+class HardSkillNameViewSet(DictionarySnapshotMixin, viewsets.ModelViewSet):
     """
     Управление хард скиллами.
     - Только для staff-пользователей доступно создание, редактирование и
@@ -253,6 +263,7 @@ class HardSkillNameViewSet(viewsets.ModelViewSet):
     - Все пользователи могут просматривать.
     - Поиск по названию.
     - Поддержка пагинации.
+    - GET /snapshot/ — весь справочник одним сжатым документом с ETag.
     """
     queryset = HardSkillName.objects.all()
     serializer_class = HardSkillNameSerializer
@@ -262,7 +273,7 @@ class HardSkillNameViewSet(viewsets.ModelViewSet):
     pagination_class = SkillPagination
 
 
-class SoftSkillNameViewSet(viewsets.ModelViewSet):
+class SoftSkillNameViewSet(DictionarySnapshotMixin, viewsets.ModelViewSet):
     """
     Управление софт скиллами.
     - Только для staff-пользователей доступно создание, редактирование и
@@ -270,6 +281,7 @@ class SoftSkillNameViewSet(viewsets.ModelViewSet):
     - Все пользователи могут просматривать.
     - Поиск по названию.
     - Поддержка пагинации.
+    - GET /snapshot/ — весь справочник одним сжатым документом с ETag.
     """
     queryset = SoftSkillName.objects.all()
     serializer_class = SoftSkillNameSerializer
@@ -279,7 +291,7 @@ class SoftSkillNameViewSet(viewsets.ModelViewSet):
     pagination_class = SkillPagination
 
 
-class LocationViewSet(viewsets.ModelViewSet):
+class LocationViewSet(DictionarySnapshotMixin, viewsets.ModelViewSet):
     """
     Управление геолокациями.
     - Только для staff-пользователей доступно создание, редактирование и
@@ -287,6 +299,7 @@ class LocationViewSet(viewsets.ModelViewSet):
     - Поиск и фильтрация по стране и городу.
     - Сортировка по стране и городу.
     - Поддержка пагинации.
+    - GET /snapshot/ — весь справочник одним сжатым документом с ETag.
     """
     queryset = Location.objects.all()
     serializer_class = LocationSerializer
@@ -300,7 +313,7 @@ class LocationViewSet(viewsets.ModelViewSet):
     pagination_class = LocationPagination
 
 
-class PositionViewSet(viewsets.ModelViewSet):
+class PositionViewSet(DictionarySnapshotMixin, viewsets.ModelViewSet):
     """
     Управление должностями.
     - Только для staff-пользователей доступно создание, редактирование
@@ -308,6 +321,7 @@ class PositionViewSet(viewsets.ModelViewSet):
     - Поиск и фильтрация по категории и названию должности.
     - Сортировка по категории и должности.
     - Поддержка пагинации.
+    - GET /snapshot/ — весь справочник одним сжатым документом с ETag.
     """
     queryset = Position.objects.all()
     serializer_class = PositionSerializer
@@ -321,6 +335,39 @@ class PositionViewSet(viewsets.ModelViewSet):
     pagination_class = PositionPagination
 
 
+class AutocompleteViewSet(viewsets.ViewSet):
+    """
+    Автодополнение по справочникам из префиксного индекса в памяти.
+    - GET /autocomplete/<kind>/?q= — записи, у которых какое-либо слово
+    начинается с `q` (без учёта регистра, пробелов и раскладки/транслита).
+    `kind`: hard-skills, soft-skills, positions, locations.
+    """
+    permission_classes = (permissions.AllowAny,)
+    lookup_field = 'kind'
+    lookup_value_regex = '[a-z-]+'
+
+    def retrieve(
+        self: 'AutocompleteViewSet', request: Request, kind: str
+    ) -> Response:
+        index = get_autocomplete_index(kind)
+        if index is None:
+            raise NotFound('Неизвестный справочник.')
+        try:
+            limit = min(
+                int(request.query_params.get('limit', AUTOCOMPLETE_LIMIT)),
+                MAX_AUTOCOMPLETE_LIMIT,
+            )
+        except ValueError:
+            raise ValidationError({'limit': 'Ожидается целое число.'})
+
+        objects = index.search(request.query_params.get('q', ''), limit)
+        return Response({
+            'results': [
+                {'id': obj.pk, 'text': index.label(obj)} for obj in objects
+            ]
+        })
+
+
 class UserViewSet(
     mixins.RetrieveModelMixin, mixins.UpdateModelMixin, viewsets.GenericViewSet
 ):
@@ -336,6 +383,31 @@ class UserViewSet(
     def get_queryset(self: 'UserViewSet') -> QuerySet[User]:
         return User.objects.filter(pk=self.request.user.pk)
 
+    @action(
+        detail=True,
+        methods=('put',),
+        parser_classes=(AvatarMultiPartParser, AvatarRawParser),
+    )
+    def avatar(self: 'UserViewSet', request: Request, pk: str) -> Response:
+        """
+        PUT /users/{id}/avatar/ — загрузка аватара телом запроса (image/*)
+        или полем avatar в multipart/form-data. Файл пишется на диск по
+        частям и проверяется по мере поступления; base64-поле avatar в
+        PUT/PATCH /users/{id}/ остаётся для совместимости.
+        """
+        user = self.get_object()
+        avatar = request.FILES.get(AVATAR_FIELD)
+        if avatar is None:
+            raise ValidationError({AVATAR_FIELD: ['Файл не передан.']})
+        try:
+            user.avatar = avatar
+            user.save(update_fields=('avatar',))
+        finally:
+            # Хранилище переносит временный файл; закрываем его явно, так
+            # как DRF не регистрирует файл для закрытия в конце запроса.
+            avatar.close()
+        return Response(self.get_serializer(user).data)
+
 
 class ResumeViewSet(viewsets.ModelViewSet):
     """
@@ -346,37 +418,137 @@ class ResumeViewSet(viewsets.ModelViewSet):
     - Только владелец может редактировать или удалять своё резюме.
 
     Возможности:
-    - Поиск по имени пользователя, фамилии, отчеству и названию должности.
+    - Полнотекстовый поиск (`search`) по ФИО, должности, категории, навыкам,
+    компаниям и тексту резюме с сортировкой по релевантности.
     - Фильтрация по категории позиции, стране и городу пользователя.
     - Поддержка пагинации.
     - Доступ по `slug` вместо `id`.
+    - GET /resumes/facets/ — доступные страны и категории с количеством
+    опубликованных резюме.
+    - GET /resumes/cards/ — облегчённый список опубликованных резюме из
+    витрины карточек с фильтрацией по `country`, `category` и поиском
+    `search`.
     """
     lookup_field = 'slug'
     queryset = Resume.objects.all()
     serializer_class = ResumeSerializer
     permission_classes = (IsOwnerOrReadOnly,)
-    filter_backends = (DjangoFilterBackend, filters.SearchFilter)
+    filter_backends = (DjangoFilterBackend, ResumeSearchFilter)
     filterset_fields = (
         'position__category',
         'user__location__country',
         'user__location__city',
     )
     pagination_class = ResumePagination
-    search_fields = (
-        '=user__username',
-        '=user__last_name',
-        '=user__first_name',
-        '=user__patronymic',
-        'position__position',
-    )
+
+    # Для чтения вложенного ResumeSerializer подгружаем все связи заранее,
+    # чтобы число запросов не зависело от размера страницы. Навыки читаются
+    # из сохранённой сетки резюме (skill_layout):
+    queryset_builders = {
+        'list': 'build_read_queryset',
+        'retrieve': 'build_read_queryset',
+    }
 
     def get_queryset(self: 'ResumeViewSet') -> QuerySet[Resume]:
         user = self.request.user
         if user.is_authenticated:
-            return Resume.objects.filter(
+            queryset = Resume.objects.filter(
                 Q(is_published=True) | Q(user=user)
             )
         else:
-            return Resume.objects.filter(
+            queryset = Resume.objects.filter(
                 Q(user__is_active=True) & Q(is_published=True)
             )
+
+        builder = self.queryset_builders.get(self.action)
+        return getattr(self, builder)(queryset) if builder else queryset
+
+    @staticmethod
+    def build_read_queryset(queryset: QuerySet[Resume]) -> QuerySet[Resume]:
+        return (
+            queryset
+            .select_related(
+                'user', 'user__location', 'position', 'content_version')
+            .prefetch_related(
+                'educations',
+                'experiences',
+            )
+        )
+
+    def list(
+        self: 'ResumeViewSet', request: Request, *args: tuple, **kwargs: dict
+    ) -> Response:
+        page = self.paginate_queryset(
+            self.filter_queryset(self.get_queryset()))
+        etag = page_etag(
+            (
+                (resume.pk, ResumeStamp.from_resume(resume).updated_at)
+                for resume in page
+            ),
+            self.paginator.get_page_state(),
+        )
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        serializer = self.get_serializer(page, many=True)
+        return set_validators(
+            self.get_paginated_response(serializer.data), etag)
+
+    def retrieve(
+        self: 'ResumeViewSet', request: Request, *args: tuple, **kwargs: dict
+    ) -> Response:
+        # Условный запрос проверяем по закэшированному штампу, не трогая БД
+        # и сериализатор:
+        stamp = (
+            get_resume_stamp(kwargs[self.lookup_field])
+            if is_conditional(request) else None
+        )
+        if stamp is not None and stamp.is_visible_to(request.user):
+            response = not_modified(
+                request, stamp.etag(), stamp.last_modified())
+            if response is not None:
+                return response
+
+        instance = self.get_object()
+        stamp = ResumeStamp.from_resume(instance)
+        response = Response(self.get_serializer(instance).data)
+        return set_validators(response, stamp.etag(), stamp.last_modified())
+
+    @action(
+        detail=False,
+        methods=['get'],
+        serializer_class=ResumeCardSerializer,
+        permission_classes=(permissions.AllowAny,),
+    )
+    def cards(self: 'ResumeViewSet', request: Request) -> Response:
+        queryset = ResumeCard.objects.order_by('-created_at', 'resume')
+
+        country = request.query_params.get('country')
+        category = request.query_params.get('category')
+        if country:
+            queryset = queryset.filter(country=country)
+        if category:
+            queryset = queryset.filter(category=category)
+        queryset = ResumeSearchFilter().filter_queryset(
+            request, queryset, self)
+
+        page = self.paginate_queryset(queryset)
+        etag = page_etag(
+            ((card.pk, card.updated_at) for card in page),
+            self.paginator.get_page_state(),
+        )
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        serializer = self.get_serializer(page, many=True)
+        return set_validators(
+            self.get_paginated_response(serializer.data), etag)
+
+    @action(
+        detail=False,
+        methods=['get'],
+        permission_classes=(permissions.AllowAny,),
+        pagination_class=None,
+    )
+    def facets(self: 'ResumeViewSet', request: Request) -> Response:
+        return Response(get_facets())
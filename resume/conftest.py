@@ -0,0 +1,61 @@
+from pathlib import Path
+from typing import Callable
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APIClient
+from user.models import HardSkillName, Position, Resume, User
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> None:
+    """Общий кэш переживает тестовую БД, поэтому чистим его перед тестом."""
+    cache.clear()
+
+
+@pytest.fixture
+def media(tmp_path: Path) -> Path:
+    with override_settings(MEDIA_ROOT=tmp_path):
+        yield tmp_path
+
+
+@pytest.fixture
+def author() -> User:
+    return User.objects.create(username='author', email='a@mail.com')
+
+
+@pytest.fixture
+def api_client(author: User) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(author)
+    return client
+
+
+@pytest.fixture
+def staff_client() -> APIClient:
+    client = APIClient()
+    client.force_authenticate(User.objects.create(
+        username='staff', email='staff@mail.com', is_staff=True))
+    return client
+
+
+@pytest.fixture
+def resume(author: User) -> Resume:
+    return Resume.objects.create(
+        user=author,
+        position=Position.objects.create(category='IT', position='Аналитик'),
+        about_me='Обо мне',
+    )
+
+
+@pytest.fixture
+def hard_skill_names() -> Callable[[int], list[HardSkillName]]:
+    """Создаёт навыки справочника «Hard 0», «Hard 1», …"""
+    def create(count: int) -> list[HardSkillName]:
+        return [
+            HardSkillName.objects.create(name=f'Hard {i}')
+            for i in range(count)
+        ]
+
+    return create
@@ -0,0 +1,61 @@
+import hashlib
+from datetime import datetime
+from typing import Iterable, Optional
+
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def strong_etag(*parts: object) -> str:
+    return quote_etag('-'.join(str(part) for part in parts))
+
+
+def weak_etag(*parts: object) -> str:
+    digest = hashlib.md5(
+        repr(parts).encode(), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+
+def page_etag(items: Iterable[tuple[int, datetime]], *extra: object) -> str:
+    """
+    Слабый ETag страницы списка: состав страницы и время последнего
+    изменения её элементов (любое изменение элемента увеличивает максимум).
+    """
+    items = list(items)
+    last_modified = max(
+        (updated_at for _, updated_at in items), default=None)
+    return weak_etag([pk for pk, _ in items], last_modified, *extra)
+
+
+def is_conditional(request: HttpRequest) -> bool:
+    return (
+        'HTTP_IF_NONE_MATCH' in request.META
+        or 'HTTP_IF_MODIFIED_SINCE' in request.META
+    )
+
+
+def not_modified(
+    request: HttpRequest,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> Optional[HttpResponse]:
+    """Ответ 304, если копия клиента актуальна, иначе None."""
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=(
+            int(last_modified.timestamp()) if last_modified else None),
+    )
+
+
+def set_validators(
+    response: HttpResponse,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> HttpResponse:
+    response.headers['ETag'] = etag
+    if last_modified is not None:
+        response.headers['Last-Modified'] = http_date(
+            last_modified.timestamp())
+    return response
@@ -39,6 +39,7 @@ class Config:
 class WebConfig(Config):
     MAX_EMAIL_AGE = timedelta(days=1)
     MIN_WAIT_EMAIL = timedelta(seconds=30)
+    MIN_WAIT_AVATAR = timedelta(seconds=5)
     ACCESS_TOKEN_LIFETIME = timedelta(seconds=86400)
 
     EMAIL_PORT: int = 587
@@ -54,6 +55,7 @@ class WebConfig(Config):
     DATA_2_DB_PATH: str = os.path.join(DATA_DIR, 'data_2_db.xlsx')
     EMAIL_DIR: str = os.path.join(DATA_DIR, 'email_outbox')
     LOG_DIR = os.path.join(ROOT_DIR, 'log')
+    CACHE_DIR: str = os.path.join(ROOT_DIR, 'cache')
 
     def __init__(self: 'WebConfig') -> None:
         super().__init__()
@@ -78,5 +80,12 @@ class WebConfig(Config):
         self.DB_PASSWORD: str = os.getenv('POSTGRES_PASSWORD', 'django_pswd')
         self.DB_HOST: str = os.getenv('DB_HOST', '127.0.0.1')
 
+        # Кэш общий для всех воркеров gunicorn (по умолчанию файловый):
+        self.CACHE_BACKEND: str = os.getenv(
+            'CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache'
+        )
+        self.CACHE_LOCATION: str = os.getenv('CACHE_LOCATION', self.CACHE_DIR)
+
 
 web_config = WebConfig()
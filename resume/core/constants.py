@@ -6,3 +6,6 @@ MAX_SKILL_NAME_LENGTH: Final[int] = 150
 MAX_SKILL_DESCRIPTION_LENGTH: Final[int] = 255
 DEFAULT_GRID_ROW_AND_COLUMN: Final[int] = 1
 MAX_EDUCATION_AND_EXPERIENCE: Final[int] = 50
+MAX_NORMALIZED_KEY_LENGTH: Final[int] = 1024
+NORMALIZED_KEY_SEPARATOR: Final[str] = '\n'
+PROGRESS_BAR_REFRESH_INTERVAL: Final[float] = 0.1
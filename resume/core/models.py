@@ -1,14 +1,114 @@
+from typing import Iterable, Optional
+
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models.fields.files import FieldFile
+
+from .constants import (DEFAULT_GRID_ROW_AND_COLUMN, MAX_GRID_SIZE_X,
+                        MAX_GRID_SIZE_Y, MAX_NORMALIZED_KEY_LENGTH,
+                        MAX_SKILL_DESCRIPTION_LENGTH, MAX_SKILL_NAME_LENGTH,
+                        NORMALIZED_KEY_SEPARATOR)
+from .quotas import QuotaModelMixin
+from .utils import normalize_name
+
+
+class TrackedFieldsMixin:
+    """
+    Модель помнит значения полей tracked_fields на момент загрузки из БД
+    (from_db, refresh_from_db) и последнего сохранения, поэтому изменения
+    видны без повторного запроса. Незагруженные (отложенные) поля
+    изменёнными не считаются.
+    """
+    tracked_fields: tuple[str, ...] = ()
+
+    @classmethod
+    def from_db(
+        cls: type['TrackedFieldsMixin'],
+        db: str,
+        field_names: list[str],
+        values: list[object],
+    ) -> 'TrackedFieldsMixin':
+        instance = super().from_db(db, field_names, values)
+        instance._remember_values(cls.tracked_fields)
+        return instance
+
+    def refresh_from_db(
+        self: 'TrackedFieldsMixin',
+        using: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> None:
+        super().refresh_from_db(using, fields)
+        self._remember_values(self._saved_tracked_fields(fields))
+
+    def save(self: 'TrackedFieldsMixin', *args: tuple, **kwargs: dict) -> None:
+        super().save(*args, **kwargs)
+        self._remember_values(
+            self._saved_tracked_fields(kwargs.get('update_fields')))
+
+    def loaded_value(self: 'TrackedFieldsMixin', field: str) -> object:
+        """Значение поля из БД (для файлов — имя файла) или None."""
+        return getattr(self, '_loaded_values', {}).get(field)
 
-from .constants import (DEFAULT_GRID_ROW_AND_COLUMN,
-                        MAX_EDUCATION_AND_EXPERIENCE, MAX_GRID_SIZE_X,
-                        MAX_GRID_SIZE_Y, MAX_SKILL_DESCRIPTION_LENGTH,
-                        MAX_SKILL_NAME_LENGTH)
+    def has_changed(self: 'TrackedFieldsMixin', field: str) -> bool:
+        if self._state.adding:
+            return True
+        loaded = getattr(self, '_loaded_values', {})
+        return field in loaded and loaded[field] != self._tracked_value(field)
 
+    def changed_fields(
+        self: 'TrackedFieldsMixin',
+        update_fields: Optional[Iterable[str]] = None,
+    ) -> set[str]:
+        """Изменённые отслеживаемые поля, которые попадут в UPDATE."""
+        return {
+            field for field in self._saved_tracked_fields(update_fields)
+            if self.has_changed(field)
+        }
+
+    def exclude_from_full_save(
+        self: 'TrackedFieldsMixin', kwargs: dict, fields: Iterable[str]
+    ) -> None:
+        """
+        Полное сохранение существующей строки не перезаписывает поля
+        fields (их обновляют в обход экземпляра). Новые экземпляры, в том
+        числе с заданным pk, и принудительная вставка сохраняют все поля.
+        """
+        if (
+            self._state.adding
+            or self.pk is None
+            or kwargs.get('force_insert')
+            or kwargs.get('update_fields') is not None
+        ):
+            return
+        kwargs['update_fields'] = [
+            field.name for field in self._meta.concrete_fields
+            if not field.primary_key and field.name not in fields
+        ]
+
+    def _saved_tracked_fields(
+        self: 'TrackedFieldsMixin', fields: Optional[Iterable[str]]
+    ) -> tuple[str, ...]:
+        if fields is None:
+            return self.tracked_fields
+        # update_fields и fields допускают и имя поля, и attname:
+        names = {self._meta.get_field(field).name for field in fields}
+        return tuple(f for f in self.tracked_fields if f in names)
 
-class Grid(models.Model):
+    def _tracked_value(self: 'TrackedFieldsMixin', field: str) -> object:
+        value = getattr(self, self._meta.get_field(field).attname)
+        return value.name if isinstance(value, FieldFile) else value
+
+    def _remember_values(
+        self: 'TrackedFieldsMixin', fields: Iterable[str]
+    ) -> None:
+        loaded = self.__dict__.setdefault('_loaded_values', {})
+        for field in fields:
+            if self._meta.get_field(field).attname in self.__dict__:
+                loaded[field] = self._tracked_value(field)
+
+
+class Grid(QuotaModelMixin, models.Model):
     grid_row = models.PositiveIntegerField(
         'Строка',
         default=DEFAULT_GRID_ROW_AND_COLUMN,
@@ -31,19 +131,7 @@ class Grid(models.Model):
 
     def clean(self: 'Grid') -> None:
         super().clean()
-        resume = getattr(self, 'resume', None)
-        if resume is not None:
-            model_class = self.__class__
-            qs = model_class.objects.filter(resume=resume)
-            if self.pk:
-                qs = qs.exclude(pk=self.pk)
-            count = qs.count()
-            max_allowed = MAX_GRID_SIZE_Y * MAX_GRID_SIZE_X
-            if count >= max_allowed:
-                raise ValidationError(
-                    f'У одного резюме может быть максимум {max_allowed} '
-                    f'элементов в {model_class.__name__}.'
-                )
+        self.check_quota()
 
 
 class Skill(models.Model):
@@ -57,6 +145,13 @@ class Skill(models.Model):
         blank=True,
         null=True,
     )
+    normalized_key = models.CharField(
+        'Ключ названия',
+        max_length=MAX_NORMALIZED_KEY_LENGTH,
+        unique=True,
+        editable=False,
+        help_text='Название без учёта регистра, пробелов и ё/е.',
+    )
 
     class Meta:
         abstract = True
@@ -67,10 +162,10 @@ class Skill(models.Model):
     def clean(self: 'Skill') -> None:
         super().clean()
         cls = self.__class__
-        # Для SQLite лучше использовать __iregex для работы с кирилецей:
+        self.normalized_key = cls.build_normalized_key(self.name)
         if (
             cls.objects
-            .filter(name__iregex=rf'^\s*{self.name}\s*$')
+            .filter(normalized_key=self.normalized_key)
             .exclude(pk=self.pk).exists()
         ):
             raise ValidationError({
@@ -80,13 +175,23 @@ class Skill(models.Model):
                 )
             })
 
+    def save(self: 'Skill', *args: tuple, **kwargs: dict) -> None:
+        self.normalized_key = self.build_normalized_key(self.name)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'name' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'normalized_key'}
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def build_normalized_key(name: str) -> str:
+        return normalize_name(name)
+
     @classmethod
     def update_or_create_normalized(
         cls: 'Skill', name: str, description: str = None
     ) -> tuple['Skill', bool]:
-        existing_skill = (
-            cls.objects.filter(name__iregex=rf'^\s*{name}\s*$').first()
-        )
+        existing_skill = cls.objects.filter(
+            normalized_key=cls.build_normalized_key(name)).first()
 
         if existing_skill:
             existing_skill.name = name
@@ -101,7 +206,7 @@ class Skill(models.Model):
             return skill, True
 
 
-class Timestamp(models.Model):
+class Timestamp(QuotaModelMixin, models.Model):
     start_date = models.DateField('Дата начала')
     end_date = models.DateField('Дата окончания', null=True, blank=True)
 
@@ -114,26 +219,21 @@ class Timestamp(models.Model):
         if self.end_date and self.end_date < self.start_date:
             raise ValidationError(
                 'Дата окончания не может быть раньше даты начала.')
-
-        user = getattr(self, 'user', None)
-        if user is not None:
-            model_class = self.__class__
-            qs = model_class.objects.filter(user=user)
-            if self.pk:
-                qs = qs.exclude(pk=self.pk)
-            count = qs.count()
-            if count >= MAX_EDUCATION_AND_EXPERIENCE:
-                raise ValidationError(
-                    f'У одного пользователя может быть максимум '
-                    f'{MAX_EDUCATION_AND_EXPERIENCE} элементов в '
-                    f'{model_class.__name__}.'
-                )
+        self.check_quota()
 
 
 class NormalizedPairModel(models.Model):
     field1_name: str = None
     field2_name: str = None
 
+    normalized_key = models.CharField(
+        'Ключ пары',
+        max_length=MAX_NORMALIZED_KEY_LENGTH,
+        unique=True,
+        editable=False,
+        help_text='Пара значений без учёта регистра, пробелов и ё/е.',
+    )
+
     class Meta:
         abstract = True
 
@@ -147,12 +247,12 @@ class NormalizedPairModel(models.Model):
         Model = self.__class__
         val1 = getattr(self, self.field1_name)
         val2 = getattr(self, self.field2_name)
-        # Для SQLite лучше использовать __iregex для работы с кирилецей:
-        filters = {
-            f'{self.field1_name}__iregex': rf'^\s*{val1}\s*$',
-            f'{self.field2_name}__iregex': rf'^\s*{val2}\s*$',
-        }
-        if Model.objects.filter(**filters).exclude(pk=self.pk).exists():
+        self.normalized_key = Model.build_normalized_key(val1, val2)
+        if (
+            Model.objects
+            .filter(normalized_key=self.normalized_key)
+            .exclude(pk=self.pk).exists()
+        ):
             raise ValidationError({
                 self.field1_name: (
                     f'Запись с такими значениями уже существует: '
@@ -160,15 +260,31 @@ class NormalizedPairModel(models.Model):
                 )
             })
 
+    def save(
+        self: 'NormalizedPairModel', *args: tuple, **kwargs: dict
+    ) -> None:
+        self.normalized_key = self.build_normalized_key(
+            getattr(self, self.field1_name), getattr(self, self.field2_name))
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and (
+            {self.field1_name, self.field2_name} & set(update_fields)
+        ):
+            kwargs['update_fields'] = {*update_fields, 'normalized_key'}
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def build_normalized_key(val1: str, val2: str) -> str:
+        return (
+            f'{normalize_name(val1)}{NORMALIZED_KEY_SEPARATOR}'
+            f'{normalize_name(val2)}'
+        )
+
     @classmethod
     def update_or_create_normalized(
         cls: type['NormalizedPairModel'], val1: str, val2: str
     ) -> tuple['NormalizedPairModel', bool]:
-        filters = {
-            f'{cls.field1_name}__iregex': rf'^\s*{val1}\s*$',
-            f'{cls.field2_name}__iregex': rf'^\s*{val2}\s*$',
-        }
-        instance = cls.objects.filter(**filters).first()
+        instance = cls.objects.filter(
+            normalized_key=cls.build_normalized_key(val1, val2)).first()
         if instance:
             setattr(instance, cls.field1_name, val1)
             setattr(instance, cls.field2_name, val2)
@@ -0,0 +1,156 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Iterator, Optional
+
+from django.db.models import Model, Q, QuerySet
+from django.http import Http404, QueryDict
+
+
+class InvalidCursor(Exception):
+    """Ошибка: курсор пагинации повреждён или подделан."""
+
+
+def encode_cursor(created_at: datetime, pk: int, reverse: bool) -> str:
+    payload = json.dumps([created_at.isoformat(), pk, int(reverse)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int, bool]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, pk, reverse = json.loads(
+            base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(pk), bool(reverse)
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise InvalidCursor(cursor)
+
+
+class KeysetPage:
+    """
+    Страница keyset-пагинации по ключу (-created_at, pk): без OFFSET и
+    COUNT(*), поэтому стоимость не зависит от глубины страницы.
+    """
+    is_keyset = True
+
+    def __init__(
+        self: 'KeysetPage',
+        object_list: list[Model],
+        next_cursor: Optional[str],
+        previous_cursor: Optional[str],
+    ) -> None:
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self: 'KeysetPage') -> Iterator[Model]:
+        return iter(self.object_list)
+
+    def __len__(self: 'KeysetPage') -> int:
+        return len(self.object_list)
+
+    def __getitem__(self: 'KeysetPage', index: int) -> Model:
+        return self.object_list[index]
+
+    def has_next(self: 'KeysetPage') -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self: 'KeysetPage') -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self: 'KeysetPage') -> bool:
+        return self.has_next() or self.has_previous()
+
+
+def supports_keyset(queryset: QuerySet) -> bool:
+    """Результаты поиска сортируются по релевантности, а не по дате."""
+    return 'search_rank' not in queryset.query.annotations
+
+
+def paginate_keyset(
+    queryset: QuerySet, cursor: Optional[str], per_page: int
+) -> KeysetPage:
+    if cursor:
+        created_at, pk, reverse = decode_cursor(cursor)
+    else:
+        created_at, pk, reverse = None, None, False
+
+    if reverse:
+        queryset = queryset.order_by('created_at', '-pk')
+        if created_at is not None:
+            queryset = queryset.filter(
+                Q(created_at__gt=created_at)
+                | Q(created_at=created_at, pk__lt=pk)
+            )
+    else:
+        queryset = queryset.order_by('-created_at', 'pk')
+        if created_at is not None:
+            queryset = queryset.filter(
+                Q(created_at__lt=created_at)
+                | Q(created_at=created_at, pk__gt=pk)
+            )
+
+    items = list(queryset[:per_page + 1])
+    has_more = len(items) > per_page
+    items = items[:per_page]
+    if reverse:
+        items.reverse()
+
+    has_next = (not reverse and has_more) or (reverse and bool(cursor))
+    has_previous = (reverse and has_more) or (not reverse and bool(cursor))
+    next_cursor = (
+        encode_cursor(items[-1].created_at, items[-1].pk, reverse=False)
+        if has_next and items else None
+    )
+    previous_cursor = (
+        encode_cursor(items[0].created_at, items[0].pk, reverse=True)
+        if has_previous and items else None
+    )
+    return KeysetPage(items, next_cursor, previous_cursor)
+
+
+def cursor_query_string(
+    params: QueryDict, cursor: str, cursor_param: str = 'cursor'
+) -> str:
+    params = params.copy()
+    params.pop('page', None)
+    params[cursor_param] = cursor
+    return params.urlencode()
+
+
+class KeysetPaginationMixin:
+    """
+    Keyset-пагинация для ListView. Старые ссылки вида ?page=N продолжают
+    работать через обычную постраничную пагинацию (режим совместимости).
+    """
+    cursor_kwarg = 'cursor'
+
+    def paginate_queryset(
+        self: 'KeysetPaginationMixin', queryset: QuerySet, page_size: int
+    ) -> tuple[Any, Any, Any, bool]:
+        if (
+            self.page_kwarg in self.request.GET
+            or not supports_keyset(queryset)
+        ):
+            return super().paginate_queryset(queryset, page_size)
+        try:
+            page = paginate_keyset(
+                queryset, self.request.GET.get(self.cursor_kwarg), page_size)
+        except InvalidCursor:
+            raise Http404('Неверный курсор пагинации.')
+        return None, page, page.object_list, page.has_other_pages()
+
+    def get_context_data(
+        self: 'KeysetPaginationMixin', **kwargs: dict
+    ) -> dict:
+        context = super().get_context_data(**kwargs)
+        page = context.get('page_obj')
+        if getattr(page, 'is_keyset', False):
+            if page.has_next():
+                context['next_page_query'] = cursor_query_string(
+                    self.request.GET, page.next_cursor, self.cursor_kwarg)
+            if page.has_previous():
+                context['previous_page_query'] = cursor_query_string(
+                    self.request.GET, page.previous_cursor, self.cursor_kwarg)
+        return context
@@ -0,0 +1,128 @@
+from typing import NamedTuple, Optional
+
+from django.apps import apps
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, Model, QuerySet
+from django.db.models.functions import Greatest
+
+
+class Quota(NamedTuple):
+    """
+    Ограничение количества записей владельца (пользователя, резюме).
+    Проверка стоит O(1): вместо COUNT(*) используется счётчик в отдельной
+    таблице, который меняется атомарным условным UPDATE ... SET F() + n,
+    поэтому параллельные запросы не превысят лимит.
+    """
+    # Модель счётчиков ('app.Model'), первичный ключ — владелец:
+    counters_model: str
+    # Поле счётчика в модели счётчиков:
+    field: str
+    # Считаемая модель ('app.Model') и её поле со ссылкой на владельца:
+    counted_model: str
+    owner_field: str
+    limit: int
+    message: str
+    # Дополнительный фильтр считаемых записей (например, статус):
+    filters: tuple[tuple[str, object], ...] = ()
+
+    def owner_id(self: 'Quota', instance: Model) -> int:
+        return getattr(instance, self.owner_field)
+
+    def count_rows(self: 'Quota', owner_id: int) -> int:
+        """Фактическое количество записей (для создания счётчика)."""
+        return apps.get_model(self.counted_model).objects.filter(
+            **{self.owner_field: owner_id}, **dict(self.filters)
+        ).count()
+
+    def used(self: 'Quota', owner_id: int) -> int:
+        value = self._counters(owner_id).values_list(
+            self.field, flat=True).first()
+        return self.count_rows(owner_id) if value is None else value
+
+    def is_exhausted(self: 'Quota', owner_id: int, amount: int = 1) -> bool:
+        return self.used(owner_id) + amount > self.limit
+
+    def acquire(
+        self: 'Quota', owner_id: int, amount: int = 1, enforce: bool = True
+    ) -> None:
+        """
+        Увеличивает счётчик на amount; при enforce — только если лимит не
+        будет превышен, иначе ValidationError. Вызывать в одной транзакции
+        с созданием записей.
+        """
+        if amount <= 0:
+            return
+        counters = self._counters(owner_id)
+        if enforce:
+            counters = counters.filter(
+                **{f'{self.field}__lte': self.limit - amount})
+        if counters.update(**{self.field: F(self.field) + amount}):
+            return
+        if not self._counters(owner_id).exists():
+            create_counters(self.counters_model, owner_id)
+            return self.acquire(owner_id, amount, enforce)
+        raise ValidationError(self.message)
+
+    def release(self: 'Quota', owner_id: int, amount: int = 1) -> None:
+        if amount > 0:
+            self._counters(owner_id).update(
+                **{self.field: Greatest(F(self.field) - amount, 0)})
+
+    def _counters(self: 'Quota', owner_id: int) -> QuerySet:
+        return apps.get_model(self.counters_model).objects.filter(
+            pk=owner_id)
+
+
+# Все квоты, по которым создаются строки счётчиков:
+QUOTAS: list[Quota] = []
+
+
+def register_quota(quota: Quota) -> Quota:
+    QUOTAS.append(quota)
+    return quota
+
+
+def create_counters(counters_model: str, owner_id: int) -> None:
+    """
+    Создаёт строку счётчиков владельца по фактическому количеству записей
+    (владельцы, появившиеся до счётчиков, или пропавшая строка).
+    """
+    model = apps.get_model(counters_model)
+    model.objects.bulk_create(
+        [
+            model(pk=owner_id, **{
+                quota.field: quota.count_rows(owner_id)
+                for quota in QUOTAS
+                if quota.counters_model == counters_model
+            })
+        ],
+        ignore_conflicts=True,
+    )
+
+
+class QuotaModelMixin:
+    """
+    Модель с квотой: clean() проверяет лимит по счётчику, а save() при
+    создании записи занимает место в квоте в той же транзакции.
+    Освобождение квоты при удалении — в обработчике post_delete.
+    """
+    quota: Optional[Quota] = None
+
+    def check_quota(self: 'QuotaModelMixin') -> None:
+        quota = self.quota
+        if (
+            quota is not None
+            and self._state.adding
+            and quota.owner_id(self) is not None
+            and quota.is_exhausted(quota.owner_id(self))
+        ):
+            raise ValidationError(quota.message)
+
+    def save(self: 'QuotaModelMixin', *args: tuple, **kwargs: dict) -> None:
+        quota = self.quota
+        if quota is None or not self._state.adding:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            quota.acquire(quota.owner_id(self))
+            super().save(*args, **kwargs)
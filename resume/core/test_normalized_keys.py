@@ -0,0 +1,24 @@
+import pytest
+from django.core.exceptions import ValidationError
+from user.models import HardSkillName, Location
+
+
+@pytest.mark.django_db
+def test_skill_dedupe_by_normalized_key() -> None:
+    skill, created = HardSkillName.update_or_create_normalized('C++')
+    assert created
+    same, created = HardSkillName.update_or_create_normalized('  c++ ')
+    assert (same, created) == (skill, False)
+
+    with pytest.raises(ValidationError):
+        HardSkillName(name='C++').full_clean()
+
+
+@pytest.mark.django_db
+def test_pair_dedupe_folds_case_spaces_and_yo() -> None:
+    location, _ = Location.update_or_create_normalized('Россия', 'Орёл')
+    same, created = Location.update_or_create_normalized(
+        'россия', '  ОРЕЛ ')
+    assert (same, created) == (location, False)
+    assert same.city == '  ОРЕЛ '
+    assert Location.objects.get().normalized_key == 'россия\nорел'
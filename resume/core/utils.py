@@ -1,104 +1,79 @@
-import re
-import shutil
-from datetime import datetime
-from typing import Callable, List, TypeVar
+import time
+from datetime import date, datetime
+from typing import Callable, Iterable, List, Optional, TypeVar
 
 from colorama import Fore, Style
-from django.db.models import QuerySet
+from django.utils import timezone
 
 from .constants import MAX_GRID_SIZE_X, MAX_GRID_SIZE_Y
 
 T = TypeVar('T')
 
 
-def build_grid(
-    models: QuerySet,
+def build_sparse_grid(
+    cells: Iterable[tuple[int, int, T]],
     max_rows: int = MAX_GRID_SIZE_Y,
     max_cols: int = MAX_GRID_SIZE_X,
 ) -> List[List[List[T]]]:
     """
-    Формирует сетку (матрицу) для моделей наследованных от Grid,
-    отсортированных по координатам и дате.
-    После построения удаляет пустые строки и столбцы с конца,
-    чтобы не оставалось пустых ячеек после последней непустой.
+    Формирует сетку из троек (строка, столбец, элемент) с нумерацией
+    с единицы. Последняя непустая строка и столбец отслеживаются за тот же
+    проход, поэтому пустых ячеек после них в сетке не остаётся.
     """
-    grid = [[[] for _ in range(max_cols)] for _ in range(max_rows)]
-    for model in models.order_by('grid_row', 'grid_column', 'updated_at'):
-        row = model.grid_row - 1
-        col = model.grid_column - 1
+    occupied = {}
+    last_row = last_col = -1
+    for row, col, item in cells:
+        row -= 1
+        col -= 1
         if 0 <= row < max_rows and 0 <= col < max_cols:
-            grid[row][col].append(model)
-
-    last_row = -1
-    for i in range(max_rows - 1, -1, -1):
-        if any(grid[i][j] for j in range(max_cols)):
-            last_row = i
-            break
-
-    last_col = -1
-    for j in range(max_cols - 1, -1, -1):
-        if any(grid[i][j] for i in range(max_rows)):
-            last_col = j
-            break
-
-    if last_row == -1 or last_col == -1:
-        return []
-
-    trimmed_grid = [row[:last_col + 1] for row in grid[:last_row + 1]]
-    return trimmed_grid
-
-
-def grid_contains_any_items(grid: list[list[list]]) -> bool:
-    for row in grid:
-        for cell in row:
-            if cell:
-                return True
-    return False
-
-
-def progress_bar(
-    iteration: int,
-    total: int,
-    message: str = 'Загрузка: ',
-    bar_color: str = Fore.LIGHTGREEN_EX,
-) -> None:
-    if total == 0:
-        return
-
-    terminal_width = shutil.get_terminal_size((80, 20)).columns
-    iteration += 1
-
-    percent = round((iteration / total) * 100, 2)
-    count_info = f'[{percent}% ({iteration}/{total})]'
-    bar_length = 30
-    right_padding: int = 3
-
-    filled_length = int(bar_length * iteration // total)
-    bar = (
-        f'{bar_color}█' * filled_length
-        + f'{Fore.LIGHTBLACK_EX}█' * (bar_length - filled_length)
+            occupied.setdefault((row, col), []).append(item)
+            last_row = max(last_row, row)
+            last_col = max(last_col, col)
+
+    return [
+        [occupied.get((row, col), []) for col in range(last_col + 1)]
+        for row in range(last_row + 1)
+    ]
+
+
+def calculate_age(date_of_birth: Optional[date]) -> Optional[int]:
+    if date_of_birth is None:
+        return None
+    today = timezone.now().date()
+    return (
+        today.year - date_of_birth.year
+        - (
+            (today.month, today.day) < (
+                date_of_birth.month, date_of_birth.day)
+        )
     )
-    bar_display = f'{Fore.BLACK}|{bar}{Fore.BLACK}|'
 
-    left_part = f'{Fore.BLUE}{message}{Fore.WHITE}{count_info}'
-    left_length = len(strip_ansi(left_part))
-    bar_length_real = len(strip_ansi(bar_display))
-    padding = terminal_width - left_length - bar_length_real - right_padding
-    if padding < 1:
-        padding = 1
-    spacer = ' ' * padding
-    end_space = ' ' * right_padding
 
-    print(f'{left_part}{spacer}{bar_display}{end_space}', end='\r')
-
-    if iteration == total:
-        print(Style.RESET_ALL)
-
-
-def strip_ansi(text: str) -> str:
-    """Удаляет ANSI-коды из строки для корректного измерения длины."""
-    ansi_escape = re.compile(r'\x1b\[[0-9;]*m')
-    return ansi_escape.sub('', text)
+def normalize_name(value: str) -> str:
+    """
+    Ключ сравнения названий: без учёта регистра, лишних пробелов и
+    различия ё/е.
+    """
+    return ' '.join(value.casefold().replace('ё', 'е').split())
+
+
+class Throttle:
+    """Ограничивает частоту действия: не чаще одного раза в interval сек."""
+
+    def __init__(self: 'Throttle', interval: float) -> None:
+        self.interval = interval
+        self.last_time: Optional[float] = None
+
+    def ready(self: 'Throttle', force: bool = False) -> bool:
+        now = time.monotonic()
+        if (
+            force
+            or self.last_time is None
+            or now - self.last_time >= self.interval
+        ):
+            self.last_time = now
+            return True
+        return False
 
 
 def execution_time(func: Callable[..., T]) -> Callable[..., T]:
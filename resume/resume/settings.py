@@ -35,6 +35,7 @@ INSTALLED_APPS = [
     'pages.apps.PagesConfig',
     'services.apps.ServicesConfig',
     'api.apps.ApiConfig',
+    'search.apps.SearchConfig',
 ]
 
 MIDDLEWARE = [
@@ -85,6 +86,13 @@ DATABASES = {
     # }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': web_config.CACHE_BACKEND,
+        'LOCATION': web_config.CACHE_LOCATION,
+    }
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': (
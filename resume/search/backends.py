@@ -0,0 +1,133 @@
+import re
+from abc import ABC, abstractmethod
+from functools import lru_cache
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.db.models.expressions import RawSQL
+
+from .constants import (MAX_SEARCH_QUERY_LENGTH, MAX_SEARCH_TERMS,
+                        MIN_STEM_LENGTH, POSTGRES_SEARCH_CONFIG,
+                        RUSSIAN_ENDINGS, SQLITE_FIELD_WEIGHTS)
+from .models import ResumeSearchDocument
+
+DOCUMENT_TABLE = ResumeSearchDocument._meta.db_table
+SQLITE_FTS_TABLE = f'{DOCUMENT_TABLE}_fts'
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def normalize_text(value: str | None) -> str:
+    return (value or '').casefold().replace('ё', 'е')
+
+
+class BaseSearchBackend(ABC):
+    """
+    Полнотекстовый поиск по резюме. Работает с любым QuerySet, первичный
+    ключ которого совпадает с id резюме (Resume, ResumeCard): фильтрует его
+    по совпадению, добавляет аннотацию search_rank и сортирует по ней.
+    """
+    def search(
+        self: 'BaseSearchBackend', queryset: QuerySet, query: str
+    ) -> QuerySet:
+        query = normalize_text(query.strip()[:MAX_SEARCH_QUERY_LENGTH])
+        params = self.query_params(query)
+        if params is None:
+            return queryset.none()
+
+        model = queryset.model
+        outer_pk = (
+            f'{connection.ops.quote_name(model._meta.db_table)}.'
+            f'{connection.ops.quote_name(model._meta.pk.column)}'
+        )
+        return (
+            queryset
+            .filter(pk__in=RawSQL(self.match_sql(), params))
+            .annotate(search_rank=RawSQL(self.rank_sql(outer_pk), params))
+            .order_by('-search_rank', 'pk')
+        )
+
+    @abstractmethod
+    def query_params(
+        self: 'BaseSearchBackend', query: str
+    ) -> list[str] | None:
+        """Параметры запроса или None, если искать нечего."""
+
+    @abstractmethod
+    def match_sql(self: 'BaseSearchBackend') -> str:
+        """SQL, выбирающий id подходящих резюме."""
+
+    @abstractmethod
+    def rank_sql(self: 'BaseSearchBackend', outer_pk: str) -> str:
+        """SQL релевантности резюме с первичным ключом outer_pk."""
+
+
+class PostgresSearchBackend(BaseSearchBackend):
+    """tsvector (генерируемая колонка search_vector) + GIN индекс."""
+    tsquery = 'websearch_to_tsquery(%s::regconfig, %s)'
+
+    def query_params(
+        self: 'PostgresSearchBackend', query: str
+    ) -> list[str] | None:
+        return [POSTGRES_SEARCH_CONFIG, query] if query else None
+
+    def match_sql(self: 'PostgresSearchBackend') -> str:
+        return (
+            f'SELECT resume_id FROM {DOCUMENT_TABLE} '
+            f'WHERE search_vector @@ {self.tsquery}'
+        )
+
+    def rank_sql(self: 'PostgresSearchBackend', outer_pk: str) -> str:
+        return (
+            f'SELECT ts_rank(d.search_vector, {self.tsquery}) '
+            f'FROM {DOCUMENT_TABLE} d WHERE d.resume_id = {outer_pk}'
+        )
+
+
+class SQLiteSearchBackend(BaseSearchBackend):
+    """
+    Виртуальная таблица FTS5 поверх таблицы документов. Русского стеммера
+    в FTS5 нет, поэтому слова обрезаются до основы и ищутся по префиксу.
+    """
+    @staticmethod
+    def stem(word: str) -> str:
+        for ending in RUSSIAN_ENDINGS:
+            if (
+                word.endswith(ending)
+                and len(word) - len(ending) >= MIN_STEM_LENGTH
+            ):
+                return word[:-len(ending)]
+        return word
+
+    def query_params(
+        self: 'SQLiteSearchBackend', query: str
+    ) -> list[str] | None:
+        terms = WORD_RE.findall(query)[:MAX_SEARCH_TERMS]
+        if not terms:
+            return None
+        return [' '.join(f'"{self.stem(term)}"*' for term in terms)]
+
+    def match_sql(self: 'SQLiteSearchBackend') -> str:
+        return (
+            f'SELECT rowid FROM {SQLITE_FTS_TABLE} '
+            f'WHERE {SQLITE_FTS_TABLE} MATCH %s'
+        )
+
+    def rank_sql(self: 'SQLiteSearchBackend', outer_pk: str) -> str:
+        weights = ', '.join(str(weight) for weight in SQLITE_FIELD_WEIGHTS)
+        # bm25 возвращает тем меньшее значение, чем выше релевантность:
+        return (
+            f'SELECT -bm25({SQLITE_FTS_TABLE}, {weights}) '
+            f'FROM {SQLITE_FTS_TABLE} '
+            f'WHERE {SQLITE_FTS_TABLE} MATCH %s AND rowid = {outer_pk}'
+        )
+
+
+@lru_cache(maxsize=None)
+def get_search_backend() -> BaseSearchBackend:
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    return SQLiteSearchBackend()
+
+
+def search_resumes(queryset: QuerySet, query: str) -> QuerySet:
+    return get_search_backend().search(queryset, query)
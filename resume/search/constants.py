@@ -0,0 +1,24 @@
+from typing import Final
+
+POSTGRES_SEARCH_CONFIG: Final[str] = 'russian'
+SEARCH_DOCUMENT_BATCH_SIZE: Final[int] = 500
+MAX_SEARCH_QUERY_LENGTH: Final[int] = 255
+MAX_SEARCH_TERMS: Final[int] = 16
+
+# Веса полей документа (A > B > C > D) для bm25 в SQLite FTS5:
+SQLITE_FIELD_WEIGHTS: Final[tuple[float, ...]] = (10.0, 4.0, 2.0, 1.0)
+
+# Для SQLite нет русского стеммера, поэтому отрезаем типичные окончания
+# и ищем по префиксу:
+MIN_STEM_LENGTH: Final[int] = 4
+RUSSIAN_ENDINGS: Final[tuple[str, ...]] = tuple(sorted(
+    (
+        'иями', 'ями', 'ами', 'ого', 'его', 'ому', 'ему', 'ыми', 'ими',
+        'ией', 'ий', 'ый', 'ой', 'ая', 'яя', 'ое', 'ее', 'ые', 'ие', 'ых',
+        'их', 'ую', 'юю', 'ом', 'ем', 'ам', 'ям', 'ах', 'ях', 'ов', 'ев',
+        'ей', 'ия', 'ию', 'ии', 'а', 'я', 'о', 'е', 'ы', 'и', 'у',
+        'ю', 'ь',
+    ),
+    key=len,
+    reverse=True,
+))
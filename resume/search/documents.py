@@ -0,0 +1,91 @@
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Prefetch, QuerySet
+from user.models import HardSkill, Resume, SoftSkill
+
+from .backends import normalize_text
+from .constants import SEARCH_DOCUMENT_BATCH_SIZE
+from .models import ResumeSearchDocument
+
+DOCUMENT_FIELDS = ('names', 'position', 'content', 'about')
+
+
+def document_source_queryset() -> QuerySet[Resume]:
+    return (
+        Resume.objects
+        .select_related('user', 'position')
+        .prefetch_related(
+            'experiences',
+            Prefetch(
+                'hard_skills',
+                queryset=HardSkill.objects.select_related('skill'),
+            ),
+            Prefetch(
+                'soft_skills',
+                queryset=SoftSkill.objects.select_related('skill'),
+            ),
+        )
+    )
+
+
+def _join(values: Iterable[str | None]) -> str:
+    return normalize_text(' '.join(value for value in values if value))
+
+
+def build_document(resume: Resume) -> ResumeSearchDocument:
+    user = resume.user
+    return ResumeSearchDocument(
+        resume_id=resume.pk,
+        names=_join((
+            user.last_name, user.first_name, user.patronymic, user.username,
+        )),
+        position=_join((resume.position.position, resume.position.category)),
+        content=_join(
+            [skill.skill.name for skill in resume.hard_skills.all()]
+            + [skill.skill.name for skill in resume.soft_skills.all()]
+            + [experience.company for experience in resume.experiences.all()]
+        ),
+        about=normalize_text(resume.about_me),
+    )
+
+
+def _upsert_documents(documents: list[ResumeSearchDocument]) -> None:
+    ResumeSearchDocument.objects.bulk_create(
+        documents,
+        batch_size=SEARCH_DOCUMENT_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=('resume',),
+        update_fields=(*DOCUMENT_FIELDS, 'updated_at'),
+    )
+
+
+def refresh_search_documents(resume_ids: Iterable[int]) -> None:
+    resume_ids = set(resume_ids)
+    if not resume_ids:
+        return
+
+    documents = [
+        build_document(resume)
+        for resume in document_source_queryset().filter(pk__in=resume_ids)
+    ]
+    if documents:
+        with transaction.atomic():
+            _upsert_documents(documents)
+
+
+def rebuild_search_documents() -> int:
+    total = 0
+    with transaction.atomic():
+        ResumeSearchDocument.objects.all().delete()
+        queryset = document_source_queryset().order_by('pk')
+        resume_ids = list(queryset.values_list('pk', flat=True))
+        for start in range(0, len(resume_ids), SEARCH_DOCUMENT_BATCH_SIZE):
+            batch_ids = resume_ids[start:start + SEARCH_DOCUMENT_BATCH_SIZE]
+            documents = [
+                build_document(resume)
+                for resume in queryset.filter(pk__in=batch_ids)
+            ]
+            ResumeSearchDocument.objects.bulk_create(documents)
+            total += len(documents)
+    return total
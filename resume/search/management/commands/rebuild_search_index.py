@@ -0,0 +1,16 @@
+from colorama import Fore, Style
+from core.utils import execution_time
+from django.core.management.base import BaseCommand
+from search.documents import rebuild_search_documents
+
+
+class Command(BaseCommand):
+    help = 'Полная пересборка поисковых документов резюме'
+
+    @execution_time
+    def handle(self: 'Command', *args: tuple, **options: dict) -> None:
+        total = rebuild_search_documents()
+        print(
+            f'{Fore.BLUE}Поисковых документов пересобрано: '
+            f'{Style.RESET_ALL}{total}'
+        )
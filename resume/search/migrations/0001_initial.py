@@ -0,0 +1,31 @@
+# Generated by Django 4.2.20 on 2026-10-17 23:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('user', '0025_resumecard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeSearchDocument',
+            fields=[
+                ('resume', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='user.resume', verbose_name='Резюме')),
+                ('names', models.TextField(blank=True, verbose_name='ФИО и имя пользователя (вес A)')),
+                ('position', models.TextField(blank=True, verbose_name='Должность и категория (вес B)')),
+                ('content', models.TextField(blank=True, verbose_name='Навыки и компании (вес C)')),
+                ('about', models.TextField(blank=True, verbose_name='О себе (вес D)')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата обновления')),
+            ],
+            options={
+                'verbose_name': 'поисковый документ',
+                'verbose_name_plural': 'Поисковые документы',
+            },
+        ),
+    ]
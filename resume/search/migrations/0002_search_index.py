@@ -0,0 +1,97 @@
+from django.db import migrations
+
+TABLE = 'search_resumesearchdocument'
+FTS_TABLE = f'{TABLE}_fts'
+
+POSTGRES_FORWARD = (
+    f"""
+    ALTER TABLE {TABLE} ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('russian', coalesce(names, '')), 'A')
+        || setweight(to_tsvector('russian', coalesce(position, '')), 'B')
+        || setweight(to_tsvector('russian', coalesce(content, '')), 'C')
+        || setweight(to_tsvector('russian', coalesce(about, '')), 'D')
+    ) STORED
+    """,
+    f'CREATE INDEX {TABLE}_vector_gin ON {TABLE} USING GIN (search_vector)',
+)
+POSTGRES_BACKWARD = (
+    f'DROP INDEX IF EXISTS {TABLE}_vector_gin',
+    f'ALTER TABLE {TABLE} DROP COLUMN IF EXISTS search_vector',
+)
+
+SQLITE_FORWARD = (
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        names, position, content, about,
+        content='{TABLE}',
+        content_rowid='resume_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, names, position, content, about)
+        VALUES (new.resume_id, new.names, new.position, new.content,
+                new.about);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, names, position,
+                                content, about)
+        VALUES ('delete', old.resume_id, old.names, old.position,
+                old.content, old.about);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, names, position,
+                                content, about)
+        VALUES ('delete', old.resume_id, old.names, old.position,
+                old.content, old.about);
+        INSERT INTO {FTS_TABLE}(rowid, names, position, content, about)
+        VALUES (new.resume_id, new.names, new.position, new.content,
+                new.about);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+)
+SQLITE_BACKWARD = (
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_au',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_ai',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+)
+
+STATEMENTS = {
+    'postgresql': (POSTGRES_FORWARD, POSTGRES_BACKWARD),
+    'sqlite': (SQLITE_FORWARD, SQLITE_BACKWARD),
+}
+
+
+def _execute(schema_editor, forward):
+    statements = STATEMENTS.get(schema_editor.connection.vendor)
+    if statements is None:
+        return
+    for sql in statements[0 if forward else 1]:
+        schema_editor.execute(sql)
+
+
+def create_search_index(apps, schema_editor):
+    _execute(schema_editor, forward=True)
+
+
+def drop_search_index(apps, schema_editor):
+    _execute(schema_editor, forward=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
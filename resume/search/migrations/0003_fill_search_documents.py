@@ -0,0 +1,59 @@
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def normalize_text(value):
+    # Копия search.backends.normalize_text на момент миграции:
+    return (value or '').casefold().replace('ё', 'е')
+
+
+def join(values):
+    return normalize_text(' '.join(value for value in values if value))
+
+
+def fill_search_documents(apps, schema_editor):
+    Resume = apps.get_model('user', 'Resume')
+    ResumeSearchDocument = apps.get_model('search', 'ResumeSearchDocument')
+    resumes = (
+        Resume.objects
+        .select_related('user', 'position')
+        .prefetch_related(
+            'experiences', 'hard_skills__skill', 'soft_skills__skill')
+        .order_by('pk')
+    )
+    documents = []
+    for resume in resumes.iterator(chunk_size=BATCH_SIZE):
+        user = resume.user
+        documents.append(ResumeSearchDocument(
+            resume_id=resume.pk,
+            names=join((
+                user.last_name, user.first_name, user.patronymic,
+                user.username,
+            )),
+            position=join(
+                (resume.position.position, resume.position.category)),
+            content=join(
+                [skill.skill.name for skill in resume.hard_skills.all()]
+                + [skill.skill.name for skill in resume.soft_skills.all()]
+                + [item.company for item in resume.experiences.all()]
+            ),
+            about=normalize_text(resume.about_me),
+        ))
+        if len(documents) == BATCH_SIZE:
+            ResumeSearchDocument.objects.bulk_create(
+                documents, ignore_conflicts=True)
+            documents = []
+    ResumeSearchDocument.objects.bulk_create(
+        documents, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+from django.db import models
+from user.models import Resume
+
+
+class ResumeSearchDocument(models.Model):
+    """
+    Поисковый документ резюме. Текст разложен по полям с убывающим весом,
+    а индекс строится средствами СУБД (см. search.backends):
+    tsvector + GIN в PostgreSQL или FTS5 в SQLite.
+    """
+    resume = models.OneToOneField(
+        Resume,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document',
+        verbose_name='Резюме',
+    )
+    names = models.TextField('ФИО и имя пользователя (вес A)', blank=True)
+    position = models.TextField('Должность и категория (вес B)', blank=True)
+    content = models.TextField('Навыки и компании (вес C)', blank=True)
+    about = models.TextField('О себе (вес D)', blank=True)
+    updated_at = models.DateTimeField('Дата обновления', auto_now=True)
+
+    class Meta:
+        verbose_name = 'поисковый документ'
+        verbose_name_plural = 'Поисковые документы'
+
+    def __str__(self: 'ResumeSearchDocument') -> str:
+        return str(self.resume_id)
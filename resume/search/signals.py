@@ -0,0 +1,12 @@
+from django.db.models import Model
+from django.dispatch import receiver
+from user.signals import resume_content_changed
+
+from .documents import refresh_search_documents
+
+
+@receiver(resume_content_changed)
+def refresh_documents(
+    sender: type[Model], resume_ids: set[int], **kwargs: dict
+) -> None:
+    refresh_search_documents(resume_ids)
@@ -0,0 +1,81 @@
+import pytest
+from user.models import (Experience, HardSkill, HardSkillName, Position,
+                         Resume, User)
+
+from .backends import BaseSearchBackend, search_resumes
+
+
+@pytest.fixture
+def resumes() -> dict[str, Resume]:
+    developer = User.objects.create(
+        username='dev', email='dev@mail.com', last_name='Смирнов')
+    analyst = User.objects.create(
+        username='analyst', email='analyst@mail.com', last_name='Петров')
+    developer_resume = Resume.objects.create(
+        user=developer,
+        position=Position.objects.create(
+            category='IT', position='Python разработчик'),
+        about_me='Пишу бэкенд',
+    )
+    analyst_resume = Resume.objects.create(
+        user=analyst,
+        position=Position.objects.create(
+            category='Аналитика', position='Аналитик данных'),
+        about_me='Строю отчёты для разработчиков',
+    )
+    HardSkill.objects.create(
+        resume=developer_resume,
+        skill=HardSkillName.objects.create(name='Django'),
+    )
+    experience = Experience.objects.create(
+        user=analyst,
+        company='Яндекс',
+        position='Аналитик',
+        start_date='2020-01-01',
+    )
+    analyst_resume.experiences.add(experience)
+    return {'developer': developer_resume, 'analyst': analyst_resume}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    ('query', 'expected'),
+    (
+        ('django', ['developer']),
+        ('яндексе', ['analyst']),
+        ('Аналитиков', ['analyst']),
+        ('несуществующий', []),
+    )
+)
+def test_search_matches_document_fields(
+    resumes: dict[str, Resume], query: str, expected: list[str]
+) -> None:
+    found = list(search_resumes(Resume.objects.all(), query))
+    assert found == [resumes[name] for name in expected]
+
+
+@pytest.mark.django_db
+def test_search_ranks_position_above_about_me(
+    resumes: dict[str, Resume]
+) -> None:
+    found = list(search_resumes(Resume.objects.all(), 'разработчик'))
+    # Совпадение в должности весит больше, чем в тексте "обо мне":
+    assert found[0] == resumes['developer']
+    assert set(found) == set(resumes.values())
+
+
+@pytest.mark.django_db
+def test_search_document_follows_skill_changes(
+    resumes: dict[str, Resume]
+) -> None:
+    HardSkillName.objects.filter(name='Django').get().delete()
+    assert not search_resumes(Resume.objects.all(), 'django').exists()
+
+
+def test_backend_without_overrides_cannot_be_created() -> None:
+    class PartialBackend(BaseSearchBackend):
+        def match_sql(self: 'PartialBackend') -> str:
+            return ''
+
+    with pytest.raises(TypeError):
+        PartialBackend()
@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.core.handlers.wsgi import WSGIRequest
 from django.db.models.query import QuerySet
 
+from .autocomplete import get_autocomplete_index
 from .constants import (MAX_EDUCATIONS_PER_PAGE, MAX_EXPERIANCE_PER_PAGE,
                         MAX_LOCATIONS_PER_PAGE, MAX_POSITION_PER_PAGE,
                         MAX_RESUMES_PER_PAGE, MAX_SKILLS_PER_PAGE,
@@ -11,6 +12,51 @@ from .models import (Education, Experience, HardSkill, HardSkillName, Location,
                      SoftSkill, SoftSkillName, User)
 
 
+class AutocompleteIndexMixin:
+    """
+    Виджеты autocomplete_fields ищут по префиксному индексу справочника
+    вместо icontains-поиска по проиндексированным полям; остальные поля
+    search_fields (например, категория должности) ищутся как обычно.
+    Поиск в списке записей не меняется.
+    """
+    autocomplete_kind: str = None
+
+    def get_search_fields(
+        self: 'AutocompleteIndexMixin', request: WSGIRequest
+    ) -> tuple[str, ...]:
+        fields = super().get_search_fields(request)
+        indexed = getattr(request, '_autocomplete_indexed_fields', None)
+        if indexed is None:
+            return fields
+        return tuple(
+            field for field in fields if field.lstrip('^=@') not in indexed)
+
+    def get_search_results(
+        self: 'AutocompleteIndexMixin',
+        request: WSGIRequest,
+        queryset: QuerySet,
+        search_term: str,
+    ) -> tuple[QuerySet, bool]:
+        match = request.resolver_match
+        if not search_term or match is None or (
+            match.url_name != 'autocomplete'
+        ):
+            return super().get_search_results(request, queryset, search_term)
+
+        index = get_autocomplete_index(self.autocomplete_kind)
+        found = queryset.filter(pk__in=[
+            obj.pk for obj in index.search(search_term, limit=None)])
+        request._autocomplete_indexed_fields = index.fields
+        try:
+            if not self.get_search_fields(request):
+                return found, False
+            others, may_have_duplicates = super().get_search_results(
+                request, queryset, search_term)
+        finally:
+            del request._autocomplete_indexed_fields
+        return found | others, may_have_duplicates
+
+
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
     list_display = (
@@ -47,7 +93,8 @@ class UserAdmin(admin.ModelAdmin):
 
 
 @admin.register(Location)
-class LocatiomAdmin(admin.ModelAdmin):
+class LocatiomAdmin(AutocompleteIndexMixin, admin.ModelAdmin):
+    autocomplete_kind = 'locations'
     list_display = ('pk', 'country', 'city',)
     search_fields = ('city',)
     list_filter = ('country',)
@@ -55,7 +102,8 @@ class LocatiomAdmin(admin.ModelAdmin):
 
 
 @admin.register(Position)
-class PostionAdmin(admin.ModelAdmin):
+class PostionAdmin(AutocompleteIndexMixin, admin.ModelAdmin):
+    autocomplete_kind = 'positions'
     list_display = ('pk', 'category', 'position',)
     search_fields = ('category', 'position',)
     list_filter = ('category',)
@@ -63,7 +111,8 @@ class PostionAdmin(admin.ModelAdmin):
 
 
 @admin.register(HardSkillName)
-class HardSkillNameAdmin(admin.ModelAdmin):
+class HardSkillNameAdmin(AutocompleteIndexMixin, admin.ModelAdmin):
+    autocomplete_kind = 'hard-skills'
     list_display = ('pk', 'name', 'description',)
     search_fields = ('name',)
     list_editable = ('description',)
@@ -71,7 +120,8 @@ class HardSkillNameAdmin(admin.ModelAdmin):
 
 
 @admin.register(SoftSkillName)
-class SoftSkillNameAdmin(admin.ModelAdmin):
+class SoftSkillNameAdmin(AutocompleteIndexMixin, admin.ModelAdmin):
+    autocomplete_kind = 'soft-skills'
     list_display = ('pk', 'name', 'description',)
     search_fields = ('name',)
     list_editable = ('description',)
@@ -0,0 +1,155 @@
+from bisect import bisect_left, insort
+from threading import Lock
+from typing import Callable, Iterable, Optional
+
+from core.utils import normalize_name
+from django.db.models import Model
+from unidecode import unidecode
+
+from .constants import AUTOCOMPLETE_LIMIT
+from .dictionaries import ReferenceDictionary, get_reference_dictionary
+from .models import HardSkillName, Location, Position, SoftSkillName
+
+
+def autocomplete_keys(values: Iterable[str]) -> frozenset[str]:
+    """
+    Ключи индекса для значений: нормализованная строка и её транслитерация,
+    а также их хвосты с начала каждого слова (поиск по любому слову).
+    """
+    keys = set()
+    for value in values:
+        variants = (normalize_name(value), normalize_name(unidecode(value)))
+        for variant in variants:
+            words = variant.split(' ')
+            keys.update(
+                ' '.join(words[i:]) for i in range(len(words)) if words[i])
+    return frozenset(keys)
+
+
+class AutocompleteIndex:
+    """
+    Префиксный индекс справочника в памяти процесса: отсортированный массив
+    пар (ключ, pk), поиск — двоичный (bisect). Первое построение — одна
+    сортировка; при смене версии справочника ключи пересчитываются только
+    для записей, у которых изменились индексируемые поля.
+    """
+
+    def __init__(
+        self: 'AutocompleteIndex',
+        dictionary: ReferenceDictionary,
+        fields: tuple[str, ...],
+        label: Callable[[Model], str] = str,
+    ) -> None:
+        self.dictionary = dictionary
+        self.fields = fields
+        self.label = label
+        self._entries: list[tuple[str, int]] = []
+        self._keys: dict[int, frozenset[str]] = {}
+        self._values: dict[int, tuple] = {}
+        self._objects: dict[int, Model] = {}
+        self._lock = Lock()
+
+    def object_values(self: 'AutocompleteIndex', obj: Model) -> tuple:
+        return tuple(getattr(obj, field) or '' for field in self.fields)
+
+    def sync(self: 'AutocompleteIndex') -> None:
+        objects = self.dictionary.all()
+        if objects is self._objects:
+            return
+        with self._lock:
+            if objects is self._objects:
+                return
+            removed = self._keys.keys() - objects.keys()
+            changed = {}
+            for pk, obj in objects.items():
+                values = self.object_values(obj)
+                if self._values.get(pk) != values:
+                    changed[pk] = values
+
+            if len(removed) + len(changed) > len(self._entries) // 4:
+                self._rebuild(removed, changed)
+            else:
+                for pk in removed | changed.keys():
+                    self._remove(pk)
+                for pk, values in changed.items():
+                    keys = self._update(pk, values)
+                    for key in keys:
+                        insort(self._entries, (key, pk))
+            self._objects = objects
+
+    def _update(
+        self: 'AutocompleteIndex', pk: int, values: tuple
+    ) -> frozenset[str]:
+        self._values[pk] = values
+        keys = self._keys[pk] = autocomplete_keys(values)
+        return keys
+
+    def _rebuild(
+        self: 'AutocompleteIndex',
+        removed: set[int],
+        changed: dict[int, tuple],
+    ) -> None:
+        """Пересборка одной сортировкой (первое построение, много правок)."""
+        for pk in removed:
+            self._keys.pop(pk, None)
+            self._values.pop(pk, None)
+        for pk, values in changed.items():
+            self._update(pk, values)
+        self._entries = sorted(
+            (key, pk) for pk, keys in self._keys.items() for key in keys)
+
+    def _remove(self: 'AutocompleteIndex', pk: int) -> None:
+        self._values.pop(pk, None)
+        for key in self._keys.pop(pk, ()):
+            index = bisect_left(self._entries, (key, pk))
+            del self._entries[index]
+
+    def search(
+        self: 'AutocompleteIndex',
+        query: str,
+        limit: Optional[int] = AUTOCOMPLETE_LIMIT,
+    ) -> list[Model]:
+        """Записи, у которых какое-либо слово начинается с запроса."""
+        self.sync()
+        prefixes = {normalize_name(query), normalize_name(unidecode(query))}
+        prefixes.discard('')
+
+        found: dict[int, str] = {}
+        # sync() в другом потоке может менять массив и подменять записи:
+        with self._lock:
+            entries, objects = self._entries, self._objects
+            for prefix in prefixes:
+                # Записи отсортированы по ключу: первые limit записей
+                # префикса уже содержат все, что попадут в ответ.
+                matched: dict[int, str] = {}
+                index = bisect_left(entries, (prefix,))
+                while index < len(entries) and (
+                    limit is None or len(matched) < limit
+                ):
+                    key, pk = entries[index]
+                    if not key.startswith(prefix):
+                        break
+                    matched.setdefault(pk, key)
+                    index += 1
+                for pk, key in matched.items():
+                    if pk not in found or key < found[pk]:
+                        found[pk] = key
+
+            pks = sorted(found, key=lambda pk: (found[pk], pk))
+            return [objects[pk] for pk in pks[:limit]]
+
+
+AUTOCOMPLETE_INDEXES: dict[str, AutocompleteIndex] = {
+    'hard-skills': AutocompleteIndex(
+        get_reference_dictionary(HardSkillName), ('name',)),
+    'soft-skills': AutocompleteIndex(
+        get_reference_dictionary(SoftSkillName), ('name',)),
+    'positions': AutocompleteIndex(
+        get_reference_dictionary(Position), ('position',)),
+    'locations': AutocompleteIndex(
+        get_reference_dictionary(Location), ('city',)),
+}
+
+
+def get_autocomplete_index(kind: str) -> Optional[AutocompleteIndex]:
+    return AUTOCOMPLETE_INDEXES.get(kind)
@@ -0,0 +1,172 @@
+import os
+from io import BytesIO
+from typing import IO, NamedTuple, Optional
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from .constants import (AVATAR_DISPLAY_SIZES, AVATAR_MAX_DIMENSION,
+                        AVATAR_MAX_PIXELS, AVATAR_MIN_DIMENSION,
+                        AVATAR_ORIGINAL_FORMATS, AVATAR_QUALITY, AVATAR_SIZES,
+                        AVATAR_VARIANT_FORMATS)
+
+# Ошибки Pillow для повреждённых и слишком больших изображений:
+IMAGE_ERRORS = (OSError, ValueError, Image.DecompressionBombError)
+
+
+class AvatarImage(NamedTuple):
+    """Источники для <picture>: миниатюры или, пока их нет, оригинал."""
+    src: str
+    webp_srcset: str = ''
+    jpeg_srcset: str = ''
+    sizes: str = AVATAR_DISPLAY_SIZES
+
+
+class ProcessedAvatar(NamedTuple):
+    # Имя очищенного оригинала:
+    name: str
+    # Все созданные файлы (оригинал и миниатюры):
+    files: list[str]
+
+
+def variant_name(name: str, size: int, extension: str) -> str:
+    """Миниатюра лежит рядом с оригиналом: users/a.png -> users/a_64.webp."""
+    root, _ = os.path.splitext(name)
+    return f'{root}_{size}.{extension}'
+
+
+def variant_names(name: str) -> list[str]:
+    return [
+        variant_name(name, size, extension)
+        for size in AVATAR_SIZES
+        for extension in AVATAR_VARIANT_FORMATS
+    ]
+
+
+def avatar_image(name: str, ready: bool) -> Optional[AvatarImage]:
+    if not name:
+        return None
+    if not ready:
+        return AvatarImage(default_storage.url(name))
+
+    def srcset(extension: str) -> str:
+        return ', '.join(
+            f'{default_storage.url(variant_name(name, size, extension))} '
+            f'{size}w'
+            for size in AVATAR_SIZES
+        )
+
+    return AvatarImage(
+        src=default_storage.url(
+            variant_name(name, AVATAR_SIZES[-1], 'jpg')),
+        webp_srcset=srcset('webp'),
+        jpeg_srcset=srcset('jpg'),
+    )
+
+
+def check_avatar_dimensions(width: int, height: int) -> None:
+    if min(width, height) < AVATAR_MIN_DIMENSION:
+        raise ValidationError(
+            f'Аватар должен быть не меньше {AVATAR_MIN_DIMENSION}×'
+            f'{AVATAR_MIN_DIMENSION} пикселей.'
+        )
+    if (
+        max(width, height) > AVATAR_MAX_DIMENSION
+        or width * height > AVATAR_MAX_PIXELS
+    ):
+        raise ValidationError(
+            f'Аватар должен быть не больше {AVATAR_MAX_DIMENSION}×'
+            f'{AVATAR_MAX_DIMENSION} пикселей.'
+        )
+
+
+def validate_avatar_dimensions(file: IO) -> None:
+    """
+    Проверяет размеры изображения по заголовку файла, не декодируя его.
+    Уже сохранённые файлы не перепроверяются.
+    """
+    if getattr(file, '_committed', False):
+        return
+    file.seek(0)
+    try:
+        with Image.open(file) as image:
+            width, height = image.size
+    except IMAGE_ERRORS:
+        raise ValidationError('Загрузите корректное изображение.')
+    finally:
+        file.seek(0)
+
+    check_avatar_dimensions(width, height)
+
+
+def _encode(image: Image.Image, image_format: str, **options: dict) -> bytes:
+    if image_format == 'JPEG' and image.mode != 'RGB':
+        # JPEG без прозрачности: подкладываем белый фон.
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    buffer = BytesIO()
+    image.save(buffer, image_format, **options)
+    return buffer.getvalue()
+
+
+def _save(name: str, content: bytes) -> str:
+    if default_storage.exists(name):
+        default_storage.delete(name)
+    return default_storage.save(name, ContentFile(content))
+
+
+def process_avatar(name: str) -> ProcessedAvatar:
+    """
+    Перекодирует оригинал без EXIF и прочих метаданных (с учётом
+    ориентации из EXIF) и создаёт рядом с ним квадратные миниатюры
+    AVATAR_SIZES во всех форматах AVATAR_VARIANT_FORMATS. Прежний оригинал
+    не удаляется: это делает вызывающий после сохранения нового имени.
+    """
+    with default_storage.open(name, 'rb') as file:
+        with Image.open(file) as source:
+            image_format = source.format
+            image = ImageOps.exif_transpose(source)
+
+    has_alpha = (
+        image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info)
+    image = image.convert('RGBA' if has_alpha else 'RGB')
+    # Метаданные (EXIF с геолокацией, XMP, комментарии) не переносим:
+    image.info = {}
+
+    root, extension = os.path.splitext(name)
+    if image_format not in AVATAR_ORIGINAL_FORMATS:
+        image_format, extension = 'PNG', '.png'
+    original = default_storage.save(
+        f'{root}{extension}',
+        ContentFile(_encode(image, image_format, quality=AVATAR_QUALITY)),
+    )
+
+    files = [original]
+    try:
+        for size in AVATAR_SIZES:
+            thumbnail = ImageOps.fit(
+                image, (size, size), Image.Resampling.LANCZOS)
+            for ext, variant_format in AVATAR_VARIANT_FORMATS.items():
+                files.append(_save(
+                    variant_name(original, size, ext),
+                    _encode(thumbnail, variant_format, quality=AVATAR_QUALITY),
+                ))
+    except Exception:
+        delete_files(files)
+        raise
+    return ProcessedAvatar(original, files)
+
+
+def delete_files(names: list[str]) -> None:
+    for name in names:
+        if default_storage.exists(name):
+            default_storage.delete(name)
+
+
+def delete_avatar_files(name: str) -> None:
+    """Удаляет оригинал аватара и все его миниатюры."""
+    if name:
+        delete_files([name, *variant_names(name)])
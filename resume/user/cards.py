@@ -0,0 +1,148 @@
+from collections import Counter
+from typing import Iterable, Iterator
+
+from django.db import transaction
+from django.db.models import QuerySet
+
+from .facets import apply_facet_deltas, count_facet_keys, rebuild_facets
+from .models import Resume, ResumeCard
+
+CARD_BATCH_SIZE = 500
+CARD_UPDATE_FIELDS = (
+    'slug',
+    'full_name',
+    'username',
+    'avatar',
+    'avatar_ready',
+    'date_of_birth',
+    'country',
+    'city',
+    'category',
+    'position',
+    'about_me',
+    'created_at',
+    'updated_at',
+)
+
+
+def card_source_queryset() -> QuerySet[Resume]:
+    """Резюме, которые должны быть представлены карточкой в списке."""
+    return (
+        Resume.objects
+        .filter(is_published=True, user__is_active=True)
+        .select_related('user', 'user__location', 'position')
+    )
+
+
+def build_card(resume: Resume) -> ResumeCard:
+    user = resume.user
+    location = user.location
+    return ResumeCard(
+        resume_id=resume.pk,
+        slug=resume.slug,
+        full_name=user.get_full_name(),
+        username=user.username,
+        avatar=user.avatar.name if user.avatar else '',
+        avatar_ready=user.avatar_status == user.AVATAR_READY,
+        date_of_birth=user.date_of_birth,
+        country=location.country if location else '',
+        city=location.city if location else '',
+        category=resume.position.category,
+        position=resume.position.position,
+        about_me=resume.about_me,
+        created_at=resume.created_at,
+    )
+
+
+def _upsert_cards(cards: list[ResumeCard]) -> None:
+    ResumeCard.objects.bulk_create(
+        cards,
+        batch_size=CARD_BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=('resume',),
+        update_fields=CARD_UPDATE_FIELDS,
+    )
+
+
+def refresh_resume_cards(resume_ids: Iterable[int]) -> None:
+    """
+    Пересобирает карточки указанных резюме: создаёт или обновляет карточки
+    опубликованных резюме и удаляет карточки остальных.
+    """
+    resume_ids = set(resume_ids)
+    if not resume_ids:
+        return
+
+    with transaction.atomic():
+        _lock_resumes(resume_ids)
+        cards = [
+            build_card(resume)
+            for resume in card_source_queryset().filter(pk__in=resume_ids)
+        ]
+        stale_ids = resume_ids - {card.resume_id for card in cards}
+        before = count_facet_keys(_card_facet_values(resume_ids))
+        if stale_ids:
+            ResumeCard.objects.filter(resume_id__in=stale_ids).delete()
+        if cards:
+            _upsert_cards(cards)
+        deltas = count_facet_keys(
+            (card.country, card.category) for card in cards)
+        deltas.subtract(before)
+        apply_facet_deltas(deltas)
+
+
+def remove_resume_cards(resume_ids: Iterable[int]) -> None:
+    """Удаляет карточки (например, перед удалением самих резюме)."""
+    resume_ids = set(resume_ids)
+    with transaction.atomic():
+        _lock_resumes(resume_ids)
+        deltas = Counter()
+        deltas.subtract(count_facet_keys(_card_facet_values(resume_ids)))
+        ResumeCard.objects.filter(resume_id__in=resume_ids).delete()
+        apply_facet_deltas(deltas)
+
+
+def _lock_resumes(resume_ids: set[int]) -> None:
+    """
+    Блокирует строки резюме до конца транзакции: параллельные обновления
+    карточек тех же резюме выполняются по очереди и не применяют дельты
+    фасетов дважды от одного и того же прежнего состояния.
+    """
+    list(
+        Resume.objects
+        .select_for_update()
+        .filter(pk__in=resume_ids)
+        .order_by('pk')
+        .values_list('pk', flat=True)
+    )
+
+
+def _card_facet_values(resume_ids: set[int]) -> list[tuple[str, str]]:
+    return list(
+        ResumeCard.objects
+        .filter(resume_id__in=resume_ids)
+        .values_list('country', 'category')
+    )
+
+
+def _iter_card_batches() -> Iterator[list[ResumeCard]]:
+    batch = []
+    for resume in card_source_queryset().iterator(chunk_size=CARD_BATCH_SIZE):
+        batch.append(build_card(resume))
+        if len(batch) >= CARD_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def rebuild_resume_cards() -> int:
+    """Полностью пересобирает таблицу карточек. Возвращает их количество."""
+    total = 0
+    with transaction.atomic():
+        ResumeCard.objects.all().delete()
+        for batch in _iter_card_batches():
+            ResumeCard.objects.bulk_create(batch)
+            total += len(batch)
+        rebuild_facets()
+    return total
@@ -9,6 +9,12 @@ MAX_RESUMES_PER_PAGE: Final[int] = 20
 MAX_POSITION_PER_PAGE: Final[int] = 20
 
 MAX_USER_PATRONYMIC_LENGTH: Final[int] = 150
+MAX_USERNAME_LENGTH: Final[int] = 150
+MAX_USER_FULL_NAME_LENGTH: Final[int] = 455
+MAX_AVATAR_PATH_LENGTH: Final[int] = 255
+MAX_AVATAR_STATUS_LENGTH: Final[int] = 16
+MAX_FACET_KIND_LENGTH: Final[int] = 16
+MAX_FACET_VALUE_LENGTH: Final[int] = 255
 MAX_COUNTRY_LENGTH: Final[int] = 255
 MAX_CITY_LENGTH: Final[int] = 255
 MAX_GITHUB_LINK_LENGTH: Final[int] = 255
@@ -19,8 +25,45 @@ MAX_COMPANY_NAME_LENGTH: Final[int] = 255
 MAX_POSITION_LENGTH: Final[int] = 255
 MAX_PHONE_LENGTH: Final[int] = 20
 MAX_SLUG_LENGTH: Final[int] = 255
+# Кандидатов слага резюме (с числовым суффиксом) до отказа:
+MAX_SLUG_ATTEMPTS: Final[int] = 100
 MAX_CATEGORY_LENGTH: Final[int] = 255
 MAX_RESUME_TEXT_LENGTH: Final[int] = 2048
 
 MAX_RESUME_COUNT: Final[int] = 5
 MAX_RESUME_PER_PAGE_ON_FRONT: Final[int] = 5
+
+FACETS_CACHE_KEY: Final[str] = 'resume:facets'
+FACETS_CACHE_TIMEOUT: Final[int] = 60 * 60 * 24
+
+RESUME_STAMP_CACHE_KEY: Final[str] = 'resume:stamp:{slug}'
+RESUME_SLUG_CACHE_KEY: Final[str] = 'resume:slug:{pk}'
+RESUME_FRAGMENTS_CACHE_KEY: Final[str] = (
+    'resume:fragments:{pk}:{version}:{date}')
+RESUME_PAGE_CACHE_TIMEOUT: Final[int] = 60 * 60 * 24
+
+DICTIONARY_VERSION_CACHE_KEY: Final[str] = 'dictionary:{name}:version'
+
+AUTOCOMPLETE_LIMIT: Final[int] = 10
+MAX_AUTOCOMPLETE_LIMIT: Final[int] = 100
+
+IMPORT_CHUNK_SIZE: Final[int] = 1000
+MAX_IMPORT_SHEET_NAME_LENGTH: Final[int] = 255
+MAX_IMPORT_CHECKSUM_LENGTH: Final[int] = 32
+
+# Аватары: допустимые размеры оригинала (проверяются по заголовку файла):
+AVATAR_MIN_DIMENSION: Final[int] = 64
+AVATAR_MAX_DIMENSION: Final[int] = 8192
+AVATAR_MAX_PIXELS: Final[int] = 40_000_000
+# Квадратные миниатюры (px) и их форматы (расширение: формат Pillow):
+AVATAR_SIZES: Final[tuple[int, ...]] = (64, 160, 320)
+AVATAR_VARIANT_FORMATS: Final[dict[str, str]] = {
+    'webp': 'WEBP',
+    'jpg': 'JPEG',
+}
+AVATAR_QUALITY: Final[int] = 85
+# Форматы, в которых сохраняется очищенный оригинал (остальные — в PNG):
+AVATAR_ORIGINAL_FORMATS: Final[tuple[str, ...]] = ('JPEG', 'PNG', 'WEBP')
+# Ширина аватара на страницах (см. .resume-meta img в CSS):
+AVATAR_DISPLAY_SIZES: Final[str] = '(max-width: 768px) 200px, 250px'
+AVATAR_QUEUE_BATCH_SIZE: Final[int] = 20
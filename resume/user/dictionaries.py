@@ -0,0 +1,77 @@
+from typing import Iterable, Optional
+from uuid import uuid4
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model
+
+from .constants import DICTIONARY_VERSION_CACHE_KEY
+from .models import HardSkillName, Location, Position, SoftSkillName
+
+
+class ReferenceDictionary:
+    """
+    Справочник, загруженный в память процесса. Актуальность проверяется по
+    версии в общем кэше: её смена после записи в любом воркере приводит к
+    перезагрузке справочника во всех остальных.
+    """
+
+    def __init__(self: 'ReferenceDictionary', model: type[Model]) -> None:
+        self.model = model
+        self.version_key = DICTIONARY_VERSION_CACHE_KEY.format(
+            name=model._meta.model_name)
+        self._state: tuple[Optional[str], dict[int, Model]] = (None, {})
+
+    def current_version(self: 'ReferenceDictionary') -> str:
+        version = cache.get(self.version_key)
+        if version is None:
+            # Версия пропала из кэша (очистка, вытеснение): новая версия
+            # заставит все процессы перечитать справочник.
+            cache.add(self.version_key, uuid4().hex, None)
+            version = cache.get(self.version_key)
+        return version
+
+    def all(self: 'ReferenceDictionary') -> dict[int, Model]:
+        version = self.current_version()
+        loaded_version, objects = self._state
+        if loaded_version != version:
+            objects = {obj.pk: obj for obj in self.model.objects.all()}
+            self._state = (version, objects)
+        return objects
+
+    def get(self: 'ReferenceDictionary', pk: int) -> Optional[Model]:
+        return self.all().get(pk)
+
+    def get_many(
+        self: 'ReferenceDictionary', pks: Iterable[int]
+    ) -> dict[int, Model]:
+        """
+        Объекты по набору id: из памяти, если справочник уже загружен и
+        актуален, иначе одним запросом id__in без загрузки справочника.
+        """
+        pks = set(pks)
+        loaded_version, objects = self._state
+        if loaded_version is None or loaded_version != (
+            self.current_version()
+        ):
+            return self.model.objects.in_bulk(pks)
+        return {pk: objects[pk] for pk in pks if pk in objects}
+
+    def invalidate(self: 'ReferenceDictionary') -> None:
+        self._bump_version()
+        # Повторно меняем версию после коммита, чтобы другой воркер не
+        # остался с данными, прочитанными до фиксации транзакции:
+        transaction.on_commit(self._bump_version)
+
+    def _bump_version(self: 'ReferenceDictionary') -> None:
+        cache.set(self.version_key, uuid4().hex, None)
+
+
+REFERENCE_DICTIONARIES: dict[type[Model], ReferenceDictionary] = {
+    model: ReferenceDictionary(model)
+    for model in (HardSkillName, SoftSkillName, Location, Position)
+}
+
+
+def get_reference_dictionary(model: type[Model]) -> ReferenceDictionary:
+    return REFERENCE_DICTIONARIES[model]
@@ -0,0 +1,96 @@
+from collections import Counter
+from typing import Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+
+from .constants import FACETS_CACHE_KEY, FACETS_CACHE_TIMEOUT
+from .models import ResumeCard, ResumeFacet
+
+FacetKey = tuple[str, str]
+
+FACET_GROUPS = {
+    ResumeFacet.COUNTRY: 'countries',
+    ResumeFacet.CATEGORY: 'categories',
+}
+
+
+def card_facet_keys(country: str, category: str) -> list[FacetKey]:
+    keys = [(ResumeFacet.CATEGORY, category)]
+    if country:
+        keys.append((ResumeFacet.COUNTRY, country))
+    return keys
+
+
+def count_facet_keys(cards: Iterable[tuple[str, str]]) -> Counter[FacetKey]:
+    """Считает фасеты по парам (страна, категория) карточек."""
+    counter = Counter()
+    for country, category in cards:
+        counter.update(card_facet_keys(country, category))
+    return counter
+
+
+def invalidate_facets() -> None:
+    cache.delete(FACETS_CACHE_KEY)
+    # Повторно сбрасываем после коммита, чтобы параллельный запрос не
+    # закэшировал данные, прочитанные до фиксации транзакции:
+    transaction.on_commit(lambda: cache.delete(FACETS_CACHE_KEY))
+
+
+def apply_facet_deltas(deltas: Counter[FacetKey]) -> None:
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        ResumeFacet.objects.bulk_create(
+            [
+                ResumeFacet(kind=kind, value=value)
+                for (kind, value), delta in deltas.items() if delta > 0
+            ],
+            ignore_conflicts=True,
+        )
+        for (kind, value), delta in deltas.items():
+            ResumeFacet.objects.filter(kind=kind, value=value).update(
+                resume_count=Greatest(F('resume_count') + delta, 0))
+
+        affected = Q()
+        for kind, value in deltas:
+            affected |= Q(kind=kind, value=value)
+        ResumeFacet.objects.filter(affected, resume_count=0).delete()
+
+    invalidate_facets()
+
+
+def rebuild_facets() -> None:
+    facets = [
+        ResumeFacet(kind=kind, value=row['value'], resume_count=row['count'])
+        for kind in FACET_GROUPS
+        for row in (
+            ResumeCard.objects
+            .exclude(**{kind: ''})
+            .values(value=F(kind))
+            .annotate(count=Count('pk'))
+        )
+    ]
+    with transaction.atomic():
+        ResumeFacet.objects.all().delete()
+        ResumeFacet.objects.bulk_create(facets)
+    invalidate_facets()
+
+
+def get_facets() -> dict[str, list[dict]]:
+    """
+    Доступные страны и категории с количеством опубликованных резюме.
+    На пути запроса читается только кэш, таблица фасетов — при промахе.
+    """
+    facets = cache.get(FACETS_CACHE_KEY)
+    if facets is None:
+        facets = {group: [] for group in FACET_GROUPS.values()}
+        for facet in ResumeFacet.objects.filter(resume_count__gt=0):
+            facets[FACET_GROUPS[facet.kind]].append(
+                {'value': facet.value, 'count': facet.resume_count})
+        cache.set(FACETS_CACHE_KEY, facets, FACETS_CACHE_TIMEOUT)
+    return facets
@@ -0,0 +1,59 @@
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .constants import RESUME_FRAGMENTS_CACHE_KEY, RESUME_PAGE_CACHE_TIMEOUT
+from .models import Resume
+from .versions import ResumeStamp
+
+SECTION_TEMPLATES = {
+    'summary': 'resume/includes/summary.html',
+    'skills': 'resume/includes/skills.html',
+    'education': 'resume/includes/education.html',
+    'experience': 'resume/includes/experience.html',
+}
+
+
+def render_resume_fragments(resume: Resume) -> dict[str, str]:
+    """
+    Отрисовывает секции страницы резюме. Пустые секции (нет навыков,
+    образования или опыта) представлены пустой строкой.
+    """
+    context = {
+        'resume': resume,
+        'hard_skills': resume.skill_layout.get('hard'),
+        'soft_skills': resume.skill_layout.get('soft'),
+    }
+    present = {
+        'summary': True,
+        'skills': bool(context['hard_skills'] or context['soft_skills']),
+        'education': bool(resume.educations.all()),
+        'experience': bool(resume.experiences.all()),
+    }
+    fragments = {
+        section: render_to_string(template, context) if present[section]
+        else ''
+        for section, template in SECTION_TEMPLATES.items()
+    }
+    fragments['title'] = resume.user.get_full_name()
+    return fragments
+
+
+def get_resume_fragments(stamp: ResumeStamp) -> dict[str, str]:
+    """
+    Секции страницы резюме из кэша по версии содержимого. В ключ входит
+    дата, так как в карточке выводится возраст.
+    """
+    key = RESUME_FRAGMENTS_CACHE_KEY.format(
+        pk=stamp.pk, version=stamp.version, date=timezone.localdate())
+    fragments = cache.get(key)
+    if fragments is None:
+        resume = (
+            Resume.objects
+            .select_related('user', 'user__location', 'position')
+            .prefetch_related('educations', 'experiences')
+            .get(pk=stamp.pk)
+        )
+        fragments = render_resume_fragments(resume)
+        cache.set(key, fragments, RESUME_PAGE_CACHE_TIMEOUT)
+    return fragments
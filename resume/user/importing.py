@@ -0,0 +1,345 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from itertools import islice
+from logging import Logger
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional
+
+import pandas as pd
+from core.constants import NORMALIZED_KEY_SEPARATOR
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Model
+
+from .constants import IMPORT_CHUNK_SIZE
+from .dictionaries import get_reference_dictionary
+from .models import ImportChecksum
+from .signals import affected_resume_ids, resumes_changed
+from .sources import read_source
+
+Row = dict[str, str]
+
+CHECKSUM_SEPARATOR = '\x1f'
+
+# Поля, значения которых начинаются с заглавной буквы:
+CAPITALIZED_FIELDS = frozenset(
+    {'country', 'city', 'category', 'position', 'description'})
+
+
+class ImportSpec(NamedTuple):
+    """Что и куда импортируется: модель справочника, лист и его поля."""
+    model: type[Model]
+    sheet_name: str
+    fields: tuple[str, ...]
+    # Поля, из которых строится normalized_key модели:
+    key_fields: tuple[str, ...]
+
+    def normalized_key(self: 'ImportSpec', row: Row) -> str:
+        """Ключ строки: вычисленный при очистке или по полям модели."""
+        if key := row.get('normalized_key'):
+            return key
+        return self.model.build_normalized_key(
+            *(row[field] for field in self.key_fields))
+
+
+@dataclass
+class ImportStats:
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    invalid: int = 0
+    removed: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows(self: 'ImportStats') -> int:
+        return self.created + self.updated + self.unchanged + self.invalid
+
+    @property
+    def rows_per_second(self: 'ImportStats') -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def normalize_names(values: pd.Series) -> pd.Series:
+    """Векторный аналог core.utils.normalize_name для столбца."""
+    return (
+        values.str.casefold()
+        .str.replace('ё', 'е', regex=False)
+        .str.replace(r'\s+', ' ', regex=True)
+        .str.strip()
+    )
+
+
+def clean_frame(spec: ImportSpec, frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Очищает пачку строк операциями над столбцами целиком: обрезает
+    пробелы, делает первую букву заглавной, отбрасывает строки с
+    незаполненными полями и вычисляет столбец normalized_key.
+    """
+    frame = frame.reindex(columns=list(spec.fields))
+    for field in spec.fields:
+        values = frame[field]
+        values = values.astype('string').str.strip()
+        if field in CAPITALIZED_FIELDS:
+            values = values.str[:1].str.upper() + values.str[1:]
+        frame[field] = values.mask(values == '')
+    frame = frame.dropna()
+
+    key = normalize_names(frame[spec.key_fields[0]])
+    for field in spec.key_fields[1:]:
+        key = key + NORMALIZED_KEY_SEPARATOR + normalize_names(frame[field])
+    return frame.assign(normalized_key=key)
+
+
+def clean_rows(
+    spec: ImportSpec,
+    raw_rows: Iterable[dict[str, object]],
+    batch_size: int = IMPORT_CHUNK_SIZE,
+    seen: Optional[set[str]] = None,
+) -> Iterator[Row]:
+    """
+    Лениво очищает строки источника пачками (см. clean_frame) и
+    отбрасывает повторы normalized_key (остаётся первая строка) до любых
+    обращений к БД. Между пачками хранится только множество ключей seen.
+    """
+    seen = set() if seen is None else seen
+    for batch in chunked(raw_rows, batch_size):
+        frame = clean_frame(spec, pd.DataFrame.from_records(batch))
+        frame = frame[~frame['normalized_key'].isin(seen)]
+        frame = frame.drop_duplicates('normalized_key')
+        seen.update(frame['normalized_key'])
+        yield from frame.astype(object).to_dict('records')
+
+
+def chunked(rows: Iterable[Row], size: int) -> Iterator[list[Row]]:
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def _import_chunk(
+    spec: ImportSpec,
+    chunk: list[Row],
+    stats: ImportStats,
+    logger: Optional[Logger],
+) -> set[str]:
+    """Записывает пачку строк и возвращает ключи строк с ошибками."""
+    model = spec.model
+    # Повтор ключа внутри пачки: побеждает последняя строка.
+    rows_by_key = {spec.normalized_key(row): row for row in chunk}
+    stats.unchanged += len(chunk) - len(rows_by_key)
+    existing = model.objects.in_bulk(
+        list(rows_by_key), field_name='normalized_key')
+
+    to_create, to_update, invalid_keys = [], [], set()
+    for key, row in rows_by_key.items():
+        instance = existing.get(key)
+        if instance is None:
+            instance = model(
+                normalized_key=key,
+                **{field: row[field] for field in spec.fields},
+            )
+            target = to_create
+        elif all(getattr(instance, f) == row[f] for f in spec.fields):
+            stats.unchanged += 1
+            continue
+        else:
+            for field in spec.fields:
+                setattr(instance, field, row[field])
+            target = to_update
+        try:
+            instance.clean_fields(exclude=('normalized_key',))
+        except ValidationError as e:
+            stats.invalid += 1
+            invalid_keys.add(key)
+            if logger is not None:
+                logger.warning(
+                    f'{[row[f] for f in spec.fields]} -- ошибка: {e}')
+            continue
+        target.append(instance)
+
+    with transaction.atomic():
+        if to_create:
+            # Конфликт возможен, если запись добавили параллельно:
+            model.objects.bulk_create(
+                to_create,
+                update_conflicts=True,
+                unique_fields=('normalized_key',),
+                update_fields=spec.fields,
+            )
+        if to_update:
+            model.objects.bulk_update(to_update, spec.fields)
+        if to_create or to_update:
+            # bulk-операции обходят сигналы dictionary_changed и
+            # обновления резюме — вызываем их явно:
+            get_reference_dictionary(model).invalidate()
+        if to_update:
+            resumes_changed(affected_resume_ids(model, to_update), model)
+
+    stats.created += len(to_create)
+    stats.updated += len(to_update)
+    return invalid_keys
+
+
+def row_checksum(spec: ImportSpec, row: Row) -> str:
+    return hashlib.md5(
+        CHECKSUM_SEPARATOR.join(row[f] for f in spec.fields).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+
+
+class SheetChecksum:
+    """
+    Контрольная сумма листа в том виде, в каком он лежит в источнике.
+    Считается по ходу того же чтения, из которого берутся строки.
+    """
+
+    def __init__(self: 'SheetChecksum', spec: ImportSpec) -> None:
+        self.digest = hashlib.md5(
+            repr(spec.fields).encode(), usedforsecurity=False)
+
+    def track(
+        self: 'SheetChecksum', raw_rows: Iterable[dict[str, object]]
+    ) -> Iterator[dict[str, object]]:
+        for raw_row in raw_rows:
+            self.digest.update(repr(tuple(raw_row.items())).encode())
+            yield raw_row
+
+    def hexdigest(self: 'SheetChecksum') -> str:
+        return self.digest.hexdigest()
+
+
+def import_sheet(
+    spec: ImportSpec,
+    source: str,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    logger: Optional[Logger] = None,
+    dry_run: bool = False,
+    force: bool = False,
+    on_change: Optional[Callable[[str, Row], None]] = None,
+    on_chunk: Optional[Callable[[ImportStats], None]] = None,
+) -> Optional[ImportStats]:
+    """
+    Инкрементальный импорт листа за одно чтение источника. В БД попадают
+    только добавленные и изменённые строки (по контрольным суммам строк),
+    а удалённые из источника записи справочника удаляются, если на них
+    ничего не ссылается. Если контрольная сумма листа не изменилась с
+    прошлого импорта, ни одна строка не записывается и возвращается None.
+
+    on_change получает изменение: '+' (добавлена), '~' (изменена) или
+    '-' (удалена; у строки известен только normalized_key). В режиме
+    dry_run изменения только перечисляются, БД не меняется.
+    """
+    checksums = ImportChecksum.objects.filter(sheet_name=spec.sheet_name)
+    stored_sheet_checksum = (
+        checksums.filter(row_key='').values_list('checksum', flat=True)
+        .first()
+    )
+
+    stats = ImportStats()
+    started = time.perf_counter()
+    seen = set()
+    sheet_checksum = SheetChecksum(spec)
+    rows = clean_rows(
+        spec,
+        sheet_checksum.track(read_source(source, spec.sheet_name)),
+        chunk_size,
+        seen,
+    )
+    for chunk in chunked(rows, chunk_size):
+        row_checksums = {
+            row['normalized_key']: row_checksum(spec, row) for row in chunk}
+        stored = dict(
+            checksums
+            .filter(row_key__in=list(row_checksums))
+            .values_list('row_key', 'checksum')
+        )
+        changed = [
+            row for row in chunk
+            if force or stored.get(row['normalized_key']) != (
+                row_checksums[row['normalized_key']])
+        ]
+        stats.unchanged += len(chunk) - len(changed)
+        for row in changed:
+            change = '~' if row['normalized_key'] in stored else '+'
+            if on_change is not None:
+                on_change(change, row)
+            if dry_run and change == '+':
+                stats.created += 1
+            elif dry_run:
+                stats.updated += 1
+
+        if changed and not dry_run:
+            with transaction.atomic():
+                invalid_keys = _import_chunk(spec, changed, stats, logger)
+                _save_checksums(spec.sheet_name, {
+                    row['normalized_key']: row_checksums[
+                        row['normalized_key']]
+                    for row in changed
+                    if row['normalized_key'] not in invalid_keys
+                })
+        stats.seconds = time.perf_counter() - started
+        if on_chunk is not None:
+            on_chunk(stats)
+
+    checksum = sheet_checksum.hexdigest()
+    if not force and checksum == stored_sheet_checksum:
+        # Все строки совпали с сохранёнными — записывать нечего:
+        return None
+
+    removed_keys = [
+        key for key in (
+            checksums.exclude(row_key='')
+            .values_list('row_key', flat=True).iterator()
+        )
+        if key not in seen
+    ]
+    if on_change is not None:
+        for key in removed_keys:
+            on_change('-', {'normalized_key': key})
+    stats.removed = len(removed_keys)
+    if not dry_run:
+        with transaction.atomic():
+            stats.removed = _remove_rows(spec, removed_keys, logger)
+            checksums.filter(row_key__in=removed_keys).delete()
+            # Лист с ошибками в строках повторно проверяется целиком:
+            if not stats.invalid:
+                _save_checksums(spec.sheet_name, {'': checksum})
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def _save_checksums(sheet_name: str, checksums: dict[str, str]) -> None:
+    ImportChecksum.objects.bulk_create(
+        [
+            ImportChecksum(
+                sheet_name=sheet_name, row_key=key, checksum=checksum)
+            for key, checksum in checksums.items()
+        ],
+        update_conflicts=True,
+        unique_fields=('sheet_name', 'row_key'),
+        update_fields=('checksum',),
+    )
+
+
+def _remove_rows(
+    spec: ImportSpec, keys: list[str], logger: Optional[Logger]
+) -> int:
+    """
+    Удаляет записи справочника, исчезнувшие из источника. Записи, на
+    которые ссылаются пользователи или резюме, остаются: удаление
+    каскадом затронуло бы пользовательские данные.
+    """
+    if not keys:
+        return 0
+    model = spec.model
+    queryset = model.objects.filter(normalized_key__in=keys)
+    unused = queryset
+    for relation in model._meta.related_objects:
+        unused = unused.filter(**{f'{relation.name}__isnull': True})
+    if logger is not None:
+        for instance in queryset.exclude(pk__in=unused.values('pk')):
+            logger.warning(f'{instance} -- используется, не удалена')
+    unused_ids = list(unused.values_list('pk', flat=True))
+    model.objects.filter(pk__in=unused_ids).delete()
+    return len(unused_ids)
@@ -1,13 +1,14 @@
 import argparse
 
-import pandas as pd
-from colorama import init
+from colorama import Fore, Style, init
 from core.config import WebConfig
+from core.constants import PROGRESS_BAR_REFRESH_INTERVAL
 from core.logger import FileRotatingLogger
-from core.utils import execution_time, progress_bar
+from core.utils import Throttle, execution_time
 from django.conf import settings
-from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand
+from user.constants import IMPORT_CHUNK_SIZE
+from user.importing import ImportSpec, ImportStats, import_sheet
 from user.models import HardSkillName, Location, Position, SoftSkillName
 
 init(autoreset=True)
@@ -17,6 +18,13 @@ data_2_db_logger = FileRotatingLogger(
 ).get_logger()
 
 
+CHANGE_COLORS = {
+    '+': Fore.GREEN,
+    '~': Fore.YELLOW,
+    '-': Fore.RED,
+}
+
+
 class Command(BaseCommand):
     help = 'Импорт данных из Excel в Location, HardSkillName, SoftSkillName'
 
@@ -31,77 +39,105 @@ class Command(BaseCommand):
             '--soft_skills', type=bool, help='Импорт данных с soft skills')
         parser.add_argument(
             '--positions', type=bool, help='Импорт данных с должностями')
+        parser.add_argument(
+            '--source',
+            default=WebConfig.DATA_2_DB_PATH,
+            help=(
+                'Книга XLSX, файл CSV/JSON Lines или каталог с файлами '
+                '<лист>.csv / <лист>.jsonl'
+            ),
+        )
+        parser.add_argument(
+            '--chunk_size',
+            type=int,
+            default=IMPORT_CHUNK_SIZE,
+            help='Количество строк, записываемых в БД одной транзакцией',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Показать изменения относительно прошлого импорта без '
+                 'записи в БД',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Импортировать все строки, не сверяя контрольные суммы',
+        )
 
     def handle(self: 'Command', *args: tuple, **options: dict) -> None:
         tasks = [
             (
                 options['locations'],
-                Location, 'Locations',
-                ('country', 'city')
+                ImportSpec(
+                    Location, 'Locations',
+                    ('country', 'city'), ('country', 'city'))
             ),
             (
                 options['hard_skills'],
-                HardSkillName, 'HardSkills',
-                ('name', 'description')
+                ImportSpec(
+                    HardSkillName, 'HardSkills',
+                    ('name', 'description'), ('name',))
             ),
             (
                 options['soft_skills'],
-                SoftSkillName, 'SoftSkills',
-                ('name', 'description')
+                ImportSpec(
+                    SoftSkillName, 'SoftSkills',
+                    ('name', 'description'), ('name',))
             ),
             (
                 options['positions'],
-                Position, 'Positions',
-                ('category', 'position')
+                ImportSpec(
+                    Position, 'Positions',
+                    ('category', 'position'), ('category', 'position'))
             ),
         ]
-        run_all = not any(opt for opt, *_ in tasks)
+        run_all = not any(opt for opt, _ in tasks)
 
-        for opt, model, sheet, fields in tasks:
+        for opt, spec in tasks:
             if opt or run_all:
-                self.import_generic(model, sheet, fields)
+                self.import_generic(spec, options)
 
     @execution_time
     def import_generic(
-        self: 'Command',
-        model: Location | SoftSkillName | HardSkillName | Position,
-        sheet_name: str,
-        fields: tuple[str, ...]
+        self: 'Command', spec: ImportSpec, options: dict
     ) -> None:
-        df = self._read_cleaned_df(sheet_name)
-        total = len(df)
-
-        for index, row in df.iterrows():
-            progress_bar(index, total, f'Импорт данных в {model.__name__}: ')
+        message = f'Импорт данных в {spec.model.__name__}: '
+        throttle = Throttle(PROGRESS_BAR_REFRESH_INTERVAL)
 
-            cleaned_values = []
-            for field in fields:
-                val = self.valid_str_value(row.get(field))
-                val = self.valid_name_value(val) if field in {
-                    'country', 'city', 'category', 'position', 'description',
-                } else val
-                cleaned_values.append(val)
+        def show_progress(stats: ImportStats) -> None:
+            if throttle.ready() and not options['dry_run']:
+                print(
+                    f'{Fore.BLUE}{message}{Style.RESET_ALL}{stats.rows} строк',
+                    end='\r',
+                )
 
-            if all(cleaned_values):
-                try:
-                    model.update_or_create_normalized(*cleaned_values)
-                except ValidationError as e:
-                    data_2_db_logger.warning(
-                        f'{cleaned_values} -- ошибка: {e}')
+        def show_change(change: str, row: dict[str, str]) -> None:
+            values = [row[f] for f in spec.fields] if change != '-' else [
+                row['normalized_key'].replace('\n', ' ')]
+            print(f'{CHANGE_COLORS[change]}{change} {Style.RESET_ALL}'
+                  f'{" | ".join(values)}')
 
-    @staticmethod
-    def valid_str_value(value: str | None) -> str | None:
-        return stripped if (
-            value and (stripped := str(value).strip())
-        ) else None
-
-    @staticmethod
-    def valid_name_value(value: str | None) -> str | None:
-        return value[0].upper() + value[1:] if value else value
-
-    def _read_cleaned_df(self: 'Command', sheet_name: str) -> pd.DataFrame:
-        df = pd.read_excel(WebConfig.DATA_2_DB_PATH, sheet_name)
-        return (
-            df.where(pd.notna(df), None).drop_duplicates()
-            .reset_index(drop=True)
+        stats = import_sheet(
+            spec,
+            options['source'],
+            chunk_size=options['chunk_size'],
+            logger=data_2_db_logger,
+            dry_run=options['dry_run'],
+            force=options['force'],
+            on_change=show_change if options['dry_run'] else None,
+            on_chunk=show_progress,
+        )
+        if stats is None:
+            print(f'{Fore.BLUE}{message}{Style.RESET_ALL}лист не изменился')
+            return
+        print(
+            f'{Fore.BLUE}{message}{Style.RESET_ALL}'
+            f'{Fore.BLUE}добавлено: {Style.RESET_ALL}{stats.created} '
+            f'{Fore.BLUE}обновлено: {Style.RESET_ALL}{stats.updated} '
+            f'{Fore.BLUE}удалено: {Style.RESET_ALL}{stats.removed} '
+            f'{Fore.BLUE}без изменений: {Style.RESET_ALL}{stats.unchanged} '
+            f'{Fore.BLUE}с ошибками: {Style.RESET_ALL}{stats.invalid} '
+            f'{Fore.BLUE}скорость: {Style.RESET_ALL}'
+            f'{stats.rows_per_second:.0f} строк/с'
         )
@@ -0,0 +1,79 @@
+import time
+
+from core.config import web_config
+from core.logger import FileRotatingLogger
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from user.avatars import IMAGE_ERRORS, delete_files, process_avatar
+from user.constants import AVATAR_QUEUE_BATCH_SIZE
+from user.models import Resume, User
+from user.signals import resumes_changed
+
+avatar_logger = FileRotatingLogger(
+    web_config.LOG_DIR, 'avatars.log', debug=settings.DEBUG
+).get_logger()
+
+
+class Command(BaseCommand):
+    help = (
+        'Фоновая обработка аватаров: очистка метаданных и миниатюры '
+        'WebP/JPEG'
+    )
+
+    def add_arguments(self: 'Command', parser: CommandParser) -> None:
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Обработать очередь один раз и завершиться',
+        )
+
+    def handle(self: 'Command', *args: tuple, **options: dict) -> None:
+        while True:
+            start_time = time.time()
+            processed = self._process_avatars()
+            if options['once']:
+                if processed < AVATAR_QUEUE_BATCH_SIZE:
+                    return
+                continue
+            if processed == AVATAR_QUEUE_BATCH_SIZE:
+                # Очередь не исчерпана — берём следующую пачку сразу.
+                continue
+            elapsed_time = time.time() - start_time
+            wait_time = max(
+                0, web_config.MIN_WAIT_AVATAR.total_seconds() - elapsed_time)
+            time.sleep(wait_time)
+
+    def _process_avatars(self: 'Command') -> int:
+        pending = list(
+            User.objects
+            .filter(avatar_status=User.AVATAR_PENDING)
+            .exclude(avatar='')
+            .exclude(avatar__isnull=True)
+            .values_list('pk', 'avatar')[:AVATAR_QUEUE_BATCH_SIZE]
+        )
+        for pk, name in pending:
+            # Условие по имени файла: пока шла обработка, пользователь мог
+            # загрузить другой аватар.
+            queued = User.objects.filter(pk=pk, avatar=name)
+            try:
+                processed = process_avatar(name)
+            except IMAGE_ERRORS as e:
+                avatar_logger.exception(e)
+                queued.update(avatar_status=User.AVATAR_FAILED)
+                continue
+
+            with transaction.atomic():
+                updated = queued.update(
+                    avatar=processed.name, avatar_status=User.AVATAR_READY)
+                if updated:
+                    resumes_changed(
+                        Resume.objects.filter(user_id=pk)
+                        .values_list('pk', flat=True),
+                        User,
+                    )
+            if not updated:
+                delete_files(processed.files)
+            elif processed.name != name:
+                delete_files([name])
+        return len(pending)
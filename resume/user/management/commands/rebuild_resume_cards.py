@@ -0,0 +1,16 @@
+from colorama import Fore, Style
+from core.utils import execution_time
+from django.core.management.base import BaseCommand
+from user.cards import rebuild_resume_cards
+
+
+class Command(BaseCommand):
+    help = 'Полная пересборка витрины карточек резюме (ResumeCard)'
+
+    @execution_time
+    def handle(self: 'Command', *args: tuple, **options: dict) -> None:
+        total = rebuild_resume_cards()
+        print(
+            f'{Fore.BLUE}Карточек резюме пересобрано: '
+            f'{Style.RESET_ALL}{total}'
+        )
@@ -0,0 +1,84 @@
+# Generated by Django 4.2.20 on 2026-10-17 23:18
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_resume_cards(apps, schema_editor):
+    Resume = apps.get_model('user', 'Resume')
+    ResumeCard = apps.get_model('user', 'ResumeCard')
+    resumes = (
+        Resume.objects
+        .filter(is_published=True, user__is_active=True)
+        .select_related('user', 'user__location', 'position')
+    )
+    cards = []
+    for resume in resumes.iterator():
+        user = resume.user
+        location = user.location
+        full_name = (
+            f'{user.last_name or ""} '
+            f'{user.first_name or ""} '
+            f'{user.patronymic or ""} '
+            .strip()
+        )
+        cards.append(ResumeCard(
+            resume_id=resume.pk,
+            slug=resume.slug,
+            full_name=full_name or user.username,
+            username=user.username,
+            avatar=user.avatar.name if user.avatar else '',
+            date_of_birth=user.date_of_birth,
+            country=location.country if location else '',
+            city=location.city if location else '',
+            category=resume.position.category,
+            position=resume.position.position,
+            about_me=resume.about_me,
+            created_at=resume.created_at,
+        ))
+    ResumeCard.objects.bulk_create(cards, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0024_alter_user_patronymic'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='resume',
+            name='about_me',
+            field=models.TextField(help_text='Максимум 2048 символов', validators=[django.core.validators.MaxLengthValidator(2048)], verbose_name='Обо мне'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='email',
+            field=models.EmailField(max_length=254, unique=True, verbose_name='Email'),
+        ),
+        migrations.CreateModel(
+            name='ResumeCard',
+            fields=[
+                ('resume', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='user.resume', verbose_name='Резюме')),
+                ('slug', models.SlugField(max_length=255, verbose_name='Слаг')),
+                ('full_name', models.CharField(max_length=455, verbose_name='ФИО')),
+                ('username', models.CharField(max_length=150, verbose_name='Имя пользователя')),
+                ('avatar', models.CharField(blank=True, max_length=255, verbose_name='Путь к аватару')),
+                ('date_of_birth', models.DateField(blank=True, null=True, verbose_name='Дата рождения')),
+                ('country', models.CharField(blank=True, max_length=255, verbose_name='Страна')),
+                ('city', models.CharField(blank=True, max_length=255, verbose_name='Город')),
+                ('category', models.CharField(max_length=255, verbose_name='Категория')),
+                ('position', models.CharField(max_length=255, verbose_name='Должность')),
+                ('about_me', models.TextField(verbose_name='Обо мне')),
+                ('created_at', models.DateTimeField(verbose_name='Дата создания')),
+            ],
+            options={
+                'verbose_name': 'карточка резюме',
+                'verbose_name_plural': 'Карточки резюме',
+                'ordering': ('-created_at', 'resume'),
+                'indexes': [models.Index(fields=['-created_at', 'resume'], name='resume_card_created_idx'), models.Index(fields=['country'], name='resume_card_country_idx'), models.Index(fields=['category'], name='resume_card_category_idx')],
+            },
+        ),
+        migrations.RunPython(fill_resume_cards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 4.2.20 on 2026-10-17 23:22
+
+from django.db import migrations, models
+
+
+def fill_resume_facets(apps, schema_editor):
+    ResumeCard = apps.get_model('user', 'ResumeCard')
+    ResumeFacet = apps.get_model('user', 'ResumeFacet')
+    facets = []
+    for kind in ('country', 'category'):
+        rows = (
+            ResumeCard.objects
+            .exclude(**{kind: ''})
+            .values(kind)
+            .annotate(count=models.Count('pk'))
+        )
+        facets.extend(
+            ResumeFacet(kind=kind, value=row[kind], resume_count=row['count'])
+            for row in rows
+        )
+    ResumeFacet.objects.bulk_create(facets)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0025_resumecard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('country', 'Страна'), ('category', 'Категория')], max_length=16, verbose_name='Тип фильтра')),
+                ('value', models.CharField(max_length=255, verbose_name='Значение')),
+                ('resume_count', models.PositiveIntegerField(default=0, verbose_name='Количество резюме')),
+            ],
+            options={
+                'verbose_name': 'фасет резюме',
+                'verbose_name_plural': 'Фасеты резюме',
+                'ordering': ('kind', 'value'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='resumefacet',
+            constraint=models.UniqueConstraint(fields=('kind', 'value'), name='unique_resume_facet'),
+        ),
+        migrations.RunPython(fill_resume_facets, migrations.RunPython.noop),
+    ]
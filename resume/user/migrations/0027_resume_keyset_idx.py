@@ -0,0 +1,17 @@
+# Generated by Django 4.2.20 on 2026-10-17 23:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0026_resumefacet'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='resume',
+            index=models.Index(fields=['-created_at', 'id'], name='resume_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.20 on 2026-10-17 23:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def fill_resume_versions(apps, schema_editor):
+    Resume = apps.get_model('user', 'Resume')
+    ResumeVersion = apps.get_model('user', 'ResumeVersion')
+    ResumeVersion.objects.bulk_create(
+        ResumeVersion(resume_id=pk, updated_at=created_at)
+        for pk, created_at in Resume.objects.values_list('pk', 'created_at')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0027_resume_keyset_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeVersion',
+            fields=[
+                ('resume', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='content_version', serialize=False, to='user.resume', verbose_name='Резюме')),
+                ('version', models.PositiveBigIntegerField(default=1, verbose_name='Версия')),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Дата изменения')),
+            ],
+            options={
+                'verbose_name': 'версия резюме',
+                'verbose_name_plural': 'Версии резюме',
+            },
+        ),
+        migrations.RunPython(fill_resume_versions, migrations.RunPython.noop),
+    ]
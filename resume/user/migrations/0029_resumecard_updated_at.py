@@ -0,0 +1,18 @@
+# Generated by Django 4.2.20 on 2026-10-17 23:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0028_resumeversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumecard',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Дата изменения'),
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 4.2.20 on 2026-10-17 23:30
+
+from django.db import migrations, models
+
+# Копия core.utils.build_sparse_grid и размеров сетки на момент миграции:
+MAX_GRID_SIZE_X = 5
+MAX_GRID_SIZE_Y = 10
+
+
+def build_sparse_grid(cells):
+    occupied = {}
+    last_row = last_col = -1
+    for row, col, item in cells:
+        row -= 1
+        col -= 1
+        if 0 <= row < MAX_GRID_SIZE_Y and 0 <= col < MAX_GRID_SIZE_X:
+            occupied.setdefault((row, col), []).append(item)
+            last_row = max(last_row, row)
+            last_col = max(last_col, col)
+    return [
+        [occupied.get((row, col), []) for col in range(last_col + 1)]
+        for row in range(last_row + 1)
+    ]
+
+
+def fill_skill_layouts(apps, schema_editor):
+    Resume = apps.get_model('user', 'Resume')
+    skill_models = {
+        'hard': apps.get_model('user', 'HardSkill'),
+        'soft': apps.get_model('user', 'SoftSkill'),
+    }
+    for resume in Resume.objects.only('pk'):
+        layout = {}
+        for kind, model in skill_models.items():
+            rows = (
+                model.objects
+                .filter(resume=resume)
+                .order_by('grid_row', 'grid_column', 'updated_at')
+                .values_list(
+                    'grid_row',
+                    'grid_column',
+                    'skill_id',
+                    'skill__name',
+                    'skill__description',
+                )
+            )
+            layout[kind] = build_sparse_grid(
+                (row, col, {'id': pk, 'name': name, 'description': desc})
+                for row, col, pk, name, desc in rows
+            )
+        resume.skill_layout = layout
+        resume.save(update_fields=['skill_layout'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0029_resumecard_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='skill_layout',
+            field=models.JSONField(blank=True, default=dict, editable=False, help_text='Обрезанные сетки hard и soft навыков. Пересчитывается автоматически при изменении навыков.', verbose_name='Сетка навыков'),
+        ),
+        migrations.RunPython(fill_skill_layouts, migrations.RunPython.noop),
+    ]
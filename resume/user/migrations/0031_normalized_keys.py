@@ -0,0 +1,93 @@
+from django.db import migrations, models
+
+# Копии core.constants.NORMALIZED_KEY_SEPARATOR и core.utils.normalize_name
+# на момент миграции: изменения нормализации в коде приложения не должны
+# менять то, что записывает эта миграция.
+NORMALIZED_KEY_SEPARATOR = '\n'
+
+
+def normalize_name(value):
+    return ' '.join(value.casefold().replace('ё', 'е').split())
+
+
+NORMALIZED_MODELS = {
+    'hardskillname': ('name',),
+    'softskillname': ('name',),
+    'location': ('country', 'city'),
+    'position': ('category', 'position'),
+}
+
+
+def fill_normalized_keys(apps, schema_editor):
+    for model_name, fields in NORMALIZED_MODELS.items():
+        Model = apps.get_model('user', model_name)
+        seen = set()
+        objects = list(Model.objects.order_by('pk'))
+        for obj in objects:
+            key = NORMALIZED_KEY_SEPARATOR.join(
+                normalize_name(getattr(obj, field)) for field in fields)
+            # Дубликаты, которые не находил прежний поиск по iregex
+            # (например, ё/е), остаются отдельными записями:
+            if key in seen:
+                key = f'{key}{NORMALIZED_KEY_SEPARATOR}#{obj.pk}'
+            seen.add(key)
+            obj.normalized_key = key
+        Model.objects.bulk_update(objects, ['normalized_key'])
+
+
+def normalized_key_field(unique, label, help_text):
+    return models.CharField(
+        editable=False,
+        help_text=help_text,
+        max_length=1024,
+        null=not unique,
+        unique=unique,
+        verbose_name=label,
+    )
+
+
+def add_fields():
+    return [
+        migrations.AddField(
+            model_name=model_name,
+            name='normalized_key',
+            field=normalized_key_field(False, *labels),
+        )
+        for model_name, labels in FIELD_LABELS.items()
+    ]
+
+
+def alter_fields():
+    return [
+        migrations.AlterField(
+            model_name=model_name,
+            name='normalized_key',
+            field=normalized_key_field(True, *labels),
+        )
+        for model_name, labels in FIELD_LABELS.items()
+    ]
+
+
+SKILL_LABELS = (
+    'Ключ названия', 'Название без учёта регистра, пробелов и ё/е.')
+PAIR_LABELS = (
+    'Ключ пары', 'Пара значений без учёта регистра, пробелов и ё/е.')
+FIELD_LABELS = {
+    'hardskillname': SKILL_LABELS,
+    'softskillname': SKILL_LABELS,
+    'location': PAIR_LABELS,
+    'position': PAIR_LABELS,
+}
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0030_resume_skill_layout'),
+    ]
+
+    operations = [
+        *add_fields(),
+        migrations.RunPython(fill_normalized_keys, migrations.RunPython.noop),
+        *alter_fields(),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.20 on 2026-10-17 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0031_normalized_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportChecksum',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sheet_name', models.CharField(max_length=255, verbose_name='Лист')),
+                ('row_key', models.CharField(blank=True, max_length=1024, verbose_name='Ключ строки')),
+                ('checksum', models.CharField(max_length=32, verbose_name='Контрольная сумма')),
+            ],
+            options={
+                'verbose_name': 'контрольная сумма импорта',
+                'verbose_name_plural': 'Контрольные суммы импорта',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importchecksum',
+            constraint=models.UniqueConstraint(fields=('sheet_name', 'row_key'), name='unique_import_checksum'),
+        ),
+    ]
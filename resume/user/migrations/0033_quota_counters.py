@@ -0,0 +1,79 @@
+# Generated by Django 4.2.20 on 2026-10-17 23:49
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_counters(apps, schema_editor):
+    User = apps.get_model('user', 'User')
+    Resume = apps.get_model('user', 'Resume')
+    UserCounters = apps.get_model('user', 'UserCounters')
+    ResumeCounters = apps.get_model('user', 'ResumeCounters')
+    UserCounters.objects.bulk_create(
+        UserCounters(
+            user_id=row['pk'],
+            published_resumes=row['published_resumes'],
+            draft_resumes=row['draft_resumes'],
+            educations=row['educations'],
+            experiences=row['experiences'],
+        )
+        for row in User.objects.values('pk').annotate(
+            published_resumes=models.Count(
+                'resume', filter=models.Q(resume__is_published=True),
+                distinct=True),
+            draft_resumes=models.Count(
+                'resume', filter=models.Q(resume__is_published=False),
+                distinct=True),
+            educations=models.Count('educations', distinct=True),
+            experiences=models.Count('experiences', distinct=True),
+        )
+    )
+    ResumeCounters.objects.bulk_create(
+        ResumeCounters(
+            resume_id=row['pk'],
+            hard_skills=row['hard_skills'],
+            soft_skills=row['soft_skills'],
+        )
+        for row in Resume.objects.values('pk').annotate(
+            hard_skills=models.Count('hard_skills', distinct=True),
+            soft_skills=models.Count('soft_skills', distinct=True),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0032_import_checksum'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeCounters',
+            fields=[
+                ('resume', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='counters', serialize=False, to='user.resume', verbose_name='Резюме')),
+                ('hard_skills', models.PositiveIntegerField(default=0, verbose_name='Профессиональных навыков')),
+                ('soft_skills', models.PositiveIntegerField(default=0, verbose_name='Личностных навыков')),
+            ],
+            options={
+                'verbose_name': 'счётчики резюме',
+                'verbose_name_plural': 'Счётчики резюме',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserCounters',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='counters', serialize=False, to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+                ('published_resumes', models.PositiveIntegerField(default=0, verbose_name='Опубликованных резюме')),
+                ('draft_resumes', models.PositiveIntegerField(default=0, verbose_name='Черновиков резюме')),
+                ('educations', models.PositiveIntegerField(default=0, verbose_name='Образований')),
+                ('experiences', models.PositiveIntegerField(default=0, verbose_name='Мест работы')),
+            ],
+            options={
+                'verbose_name': 'счётчики пользователя',
+                'verbose_name_plural': 'Счётчики пользователей',
+            },
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.20 on 2026-10-17 23:57
+
+from django.db import migrations, models
+import user.avatars
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user', '0033_quota_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumecard',
+            name='avatar_ready',
+            field=models.BooleanField(default=False, verbose_name='Миниатюры аватара готовы'),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='avatar_status',
+            field=models.CharField(choices=[('pending', 'Ожидает обработки'), ('ready', 'Миниатюры готовы'), ('failed', 'Ошибка обработки')], db_index=True, default='pending', help_text='Миниатюры и очистку метаданных выполняет команда process_avatars.', max_length=16, verbose_name='Состояние аватара'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='avatar',
+            field=models.ImageField(blank=True, null=True, upload_to='users/', validators=[user.avatars.validate_avatar_dimensions], verbose_name='Аватар'),
+        ),
+    ]
@@ -1,23 +1,37 @@
-from core.models import Grid, NormalizedPairModel, Skill, Timestamp
+from typing import Iterator
+
+from core.constants import (MAX_EDUCATION_AND_EXPERIENCE, MAX_GRID_SIZE_X,
+                            MAX_GRID_SIZE_Y, MAX_NORMALIZED_KEY_LENGTH)
+from core.models import (Grid, NormalizedPairModel, Skill, Timestamp,
+                         TrackedFieldsMixin)
+from core.quotas import Quota, QuotaModelMixin, register_quota
+from core.utils import calculate_age
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
 from django.core.files.storage import default_storage
 from django.core.validators import MaxLengthValidator
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
 from django.utils.text import slugify
 from unidecode import unidecode
 
-from .constants import (MAX_CATEGORY_LENGTH, MAX_CITY_LENGTH,
+from .avatars import (AvatarImage, avatar_image, delete_avatar_files,
+                      validate_avatar_dimensions)
+from .constants import (MAX_AVATAR_PATH_LENGTH, MAX_AVATAR_STATUS_LENGTH,
+                        MAX_CATEGORY_LENGTH, MAX_CITY_LENGTH,
                         MAX_COMPANY_NAME_LENGTH, MAX_COUNTRY_LENGTH,
-                        MAX_EDUCATION_DEGREE_LENGTH, MAX_FIELD_OF_STUDY_LENGTH,
-                        MAX_GITHUB_LINK_LENGTH, MAX_INSTITUTION_NAME_LENGTH,
-                        MAX_PHONE_LENGTH, MAX_POSITION_LENGTH,
-                        MAX_RESUME_COUNT, MAX_RESUME_TEXT_LENGTH,
-                        MAX_SLUG_LENGTH, MAX_USER_PATRONYMIC_LENGTH)
-
-
-class User(AbstractUser):
+                        MAX_EDUCATION_DEGREE_LENGTH, MAX_FACET_KIND_LENGTH,
+                        MAX_FACET_VALUE_LENGTH, MAX_FIELD_OF_STUDY_LENGTH,
+                        MAX_GITHUB_LINK_LENGTH, MAX_IMPORT_CHECKSUM_LENGTH,
+                        MAX_IMPORT_SHEET_NAME_LENGTH,
+                        MAX_INSTITUTION_NAME_LENGTH, MAX_PHONE_LENGTH,
+                        MAX_POSITION_LENGTH, MAX_RESUME_COUNT,
+                        MAX_RESUME_TEXT_LENGTH, MAX_SLUG_ATTEMPTS,
+                        MAX_SLUG_LENGTH, MAX_USER_FULL_NAME_LENGTH,
+                        MAX_USER_PATRONYMIC_LENGTH, MAX_USERNAME_LENGTH)
+
+
+class User(TrackedFieldsMixin, AbstractUser):
     email = models.EmailField('Email', unique=True)
     patronymic = models.CharField(
         'Отчество',
@@ -60,6 +74,43 @@ class User(AbstractUser):
         upload_to='users/',
         blank=True,
         null=True,
+        validators=[validate_avatar_dimensions],
+    )
+    AVATAR_PENDING = 'pending'
+    AVATAR_READY = 'ready'
+    AVATAR_FAILED = 'failed'
+    AVATAR_STATUS_CHOICES = (
+        (AVATAR_PENDING, 'Ожидает обработки'),
+        (AVATAR_READY, 'Миниатюры готовы'),
+        (AVATAR_FAILED, 'Ошибка обработки'),
+    )
+    avatar_status = models.CharField(
+        'Состояние аватара',
+        max_length=MAX_AVATAR_STATUS_LENGTH,
+        choices=AVATAR_STATUS_CHOICES,
+        default=AVATAR_PENDING,
+        db_index=True,
+        help_text=(
+            'Миниатюры и очистку метаданных выполняет команда '
+            'process_avatars.'
+        ),
+    )
+
+    # Поля, от которых зависят резюме, слаги и файл аватара (смена пароля
+    # или last_login при входе их не затрагивает):
+    tracked_fields = (
+        'username',
+        'email',
+        'first_name',
+        'last_name',
+        'patronymic',
+        'telegram_id',
+        'location',
+        'git_hub_link',
+        'date_of_birth',
+        'phone',
+        'avatar',
+        'is_active',
     )
 
     def get_full_name(self: 'User') -> str:
@@ -72,16 +123,14 @@ class User(AbstractUser):
         return full_name or self.username
 
     def age(self: 'User') -> int | None:
-        if self.date_of_birth:
-            today = timezone.now().date()
-            return (
-                today.year - self.date_of_birth.year
-                - (
-                    (today.month, today.day) < (
-                        self.date_of_birth.month, self.date_of_birth.day)
-                )
-            )
-        return None
+        return calculate_age(self.date_of_birth)
+
+    @property
+    def avatar_image(self: 'User') -> AvatarImage | None:
+        return avatar_image(
+            self.avatar.name if self.avatar else '',
+            self.avatar_status == self.AVATAR_READY,
+        )
 
     class Meta:
         verbose_name = 'пользователь'
@@ -91,16 +140,30 @@ class User(AbstractUser):
         return self.username
 
     def save(self: 'User', *args: tuple, **kwargs: dict) -> None:
-        try:
-            old_avatar = User.objects.get(pk=self.pk).avatar
-        except User.DoesNotExist:
-            old_avatar = None
+        adding = self._state.adding
+        update_fields = kwargs.get('update_fields')
+        changed = self.changed_fields(update_fields)
+        old_avatar = self.loaded_value('avatar')
+
+        if 'avatar' in changed:
+            self.avatar_status = self.AVATAR_PENDING
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'avatar_status'}
+        else:
+            # Аватар меняет и фоновый обработчик (process_avatars): не
+            # перезаписываем его значением, загруженным до обработки.
+            self.exclude_from_full_save(kwargs, ('avatar', 'avatar_status'))
 
         super().save(*args, **kwargs)
 
-        if old_avatar and old_avatar != self.avatar:
-            if default_storage.exists(old_avatar.name):
-                default_storage.delete(old_avatar.name)
+        if 'username' in changed and not adding:
+            # Слаги резюме содержат имя пользователя:
+            for resume in self.resume.select_related('position'):
+                resume.user = self
+                resume.refresh_slug()
+
+        if 'avatar' in changed and old_avatar:
+            delete_avatar_files(old_avatar)
 
     def clean(self: 'User') -> None:
         super().clean()
@@ -117,7 +180,7 @@ class User(AbstractUser):
 
     def delete(self: 'User', *args: tuple, **kwargs: dict) -> None:
         if self.avatar:
-            self.avatar.delete(save=False)
+            delete_avatar_files(self.avatar.name)
         super().delete(*args, **kwargs)
 
 
@@ -176,6 +239,18 @@ class HardSkill(Grid):
         db_index=True,
     )
 
+    quota = register_quota(Quota(
+        counters_model='user.ResumeCounters',
+        field='hard_skills',
+        counted_model='user.HardSkill',
+        owner_field='resume_id',
+        limit=MAX_GRID_SIZE_Y * MAX_GRID_SIZE_X,
+        message=(
+            f'У одного резюме может быть максимум '
+            f'{MAX_GRID_SIZE_Y * MAX_GRID_SIZE_X} элементов в HardSkill.'
+        ),
+    ))
+
     class Meta:
         verbose_name = 'проффесиональный навык'
         verbose_name_plural = 'Профессиональные навыки'
@@ -206,6 +281,18 @@ class SoftSkill(Grid):
         db_index=True,
     )
 
+    quota = register_quota(Quota(
+        counters_model='user.ResumeCounters',
+        field='soft_skills',
+        counted_model='user.SoftSkill',
+        owner_field='resume_id',
+        limit=MAX_GRID_SIZE_Y * MAX_GRID_SIZE_X,
+        message=(
+            f'У одного резюме может быть максимум '
+            f'{MAX_GRID_SIZE_Y * MAX_GRID_SIZE_X} элементов в SoftSkill.'
+        ),
+    ))
+
     class Meta:
         verbose_name = 'личностный навык'
         verbose_name_plural = 'Личностные навыки'
@@ -242,6 +329,18 @@ class Education(Timestamp):
         max_length=MAX_FIELD_OF_STUDY_LENGTH,
     )
 
+    quota = register_quota(Quota(
+        counters_model='user.UserCounters',
+        field='educations',
+        counted_model='user.Education',
+        owner_field='user_id',
+        limit=MAX_EDUCATION_AND_EXPERIENCE,
+        message=(
+            f'У одного пользователя может быть максимум '
+            f'{MAX_EDUCATION_AND_EXPERIENCE} элементов в Education.'
+        ),
+    ))
+
     class Meta:
         verbose_name = 'образование'
         verbose_name_plural = 'Образование'
@@ -283,6 +382,18 @@ class Experience(Timestamp):
         help_text='В качестве разделителя используйте "новую строку"',
     )
 
+    quota = register_quota(Quota(
+        counters_model='user.UserCounters',
+        field='experiences',
+        counted_model='user.Experience',
+        owner_field='user_id',
+        limit=MAX_EDUCATION_AND_EXPERIENCE,
+        message=(
+            f'У одного пользователя может быть максимум '
+            f'{MAX_EDUCATION_AND_EXPERIENCE} элементов в Experience.'
+        ),
+    ))
+
     class Meta:
         verbose_name = 'опыт работы'
         verbose_name_plural = 'Опыт работы'
@@ -298,7 +409,7 @@ class Experience(Timestamp):
         return f'{self.user}: {self.company} - {self.position}'
 
 
-class Resume(models.Model):
+class Resume(TrackedFieldsMixin, QuotaModelMixin, models.Model):
     user = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -348,6 +459,16 @@ class Resume(models.Model):
         blank=True,
         help_text='Слаг для резюме. Генерируется автоматически.',
     )
+    skill_layout = models.JSONField(
+        'Сетка навыков',
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text=(
+            'Обрезанные сетки hard и soft навыков. Пересчитывается '
+            'автоматически при изменении навыков.'
+        ),
+    )
 
     class Meta:
         verbose_name = 'резюме'
@@ -358,40 +479,97 @@ class Resume(models.Model):
                 name='unique_resume'
             )
         ]
+        indexes = [
+            # Ключ keyset-пагинации (-created_at, pk):
+            models.Index(
+                fields=['-created_at', 'id'], name='resume_keyset_idx'),
+        ]
         ordering = ('-created_at',)
 
     def __str__(self: 'Resume') -> str:
         return f'{self.user}: {self.position}'
 
-    def save(self: 'Resume', *args: tuple, **kwargs: dict) -> None:
-        if self.pk is None:
-            count = Resume.objects.filter(
-                user=self.user, is_published=self.is_published).count()
-            if count >= MAX_RESUME_COUNT:
-                status = 'опубликованных' if self.is_published else (
-                    'черновиков')
-                raise ValidationError(
-                    f'У пользователя может быть максимум {MAX_RESUME_COUNT} '
-                    f'{status} резюме.'
-                )
-
-        first_slug = slugify(
-            unidecode(f'{self.user.username}-{self.position.position}')
-        )
-        second_slug = slugify(
-            unidecode(
-                f'{self.user.username}-'
-                f'{self.position.category}-{self.position.position}'
-            )
+    tracked_fields = ('is_published', 'user', 'position')
+
+    @property
+    def quota(self: 'Resume') -> Quota:
+        return (
+            PUBLISHED_RESUMES_QUOTA if self.is_published
+            else DRAFT_RESUMES_QUOTA
         )
 
+    def save(self: 'Resume', *args: tuple, **kwargs: dict) -> None:
+        # Сетку навыков пересчитывает refresh_skill_layouts: не
+        # перезаписываем её значением, загруженным до пересчёта.
+        self.exclude_from_full_save(kwargs, ('skill_layout',))
+        if not self._state.adding and 'is_published' in self.changed_fields(
+            kwargs.get('update_fields')
+        ):
+            # Смена статуса переносит резюме между квотами; лимит, как и
+            # раньше, проверяется только при создании.
+            with transaction.atomic():
+                (
+                    DRAFT_RESUMES_QUOTA if self.is_published
+                    else PUBLISHED_RESUMES_QUOTA
+                ).release(self.user_id)
+                self.quota.acquire(self.user_id, enforce=False)
+                self._save_with_slug(*args, **kwargs)
+        else:
+            self._save_with_slug(*args, **kwargs)
+
+    def refresh_slug(self: 'Resume') -> None:
+        """Перевыделяет слаг (например, после смены имени пользователя)."""
+        self._slug_outdated = True
+        self.save(update_fields=['slug'])
+
+    def slug_candidates(self: 'Resume') -> Iterator[str]:
+        username = self.user.username
+        position = self.position
+        yield slugify(unidecode(f'{username}-{position.position}'))
+        fallback = slugify(unidecode(
+            f'{username}-{position.category}-{position.position}'))
+        yield fallback
+        for suffix in range(2, MAX_SLUG_ATTEMPTS + 1):
+            yield f'{fallback}-{suffix}'
+
+    def _save_with_slug(
+        self: 'Resume', *args: tuple, **kwargs: dict
+    ) -> None:
+        """
+        Слаг выделяется только для нового резюме и при смене пользователя,
+        должности или имени пользователя. Свободен ли слаг, проверяет
+        уникальный индекс: при конфликте пробуется следующий кандидат.
+        """
         if not (
-            Resume.objects.exclude(pk=self.pk).filter(slug=first_slug).exists()
+            getattr(self, '_slug_outdated', False)
+            or not self.slug
+            or self.has_changed('user')
+            or self.has_changed('position')
         ):
-            self.slug = first_slug
+            return super().save(*args, **kwargs)
+
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'slug'}
+        for slug in self.slug_candidates():
+            if slug == self.slug and not self._state.adding:
+                # Текущий слаг уже принадлежит резюме:
+                break
+            self.slug = slug
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+            except IntegrityError:
+                if Resume.objects.exclude(pk=self.pk).filter(
+                    slug=slug
+                ).exists():
+                    continue
+                raise
+            self._slug_outdated = False
+            return
         else:
-            self.slug = second_slug
-
+            raise ValidationError(
+                'Не удалось подобрать свободный слаг для резюме.')
+        self._slug_outdated = False
         super().save(*args, **kwargs)
 
 
@@ -437,7 +615,7 @@ class ResumeEducation(models.Model):
         ]
 
 
-class Position(NormalizedPairModel):
+class Position(TrackedFieldsMixin, NormalizedPairModel):
     category = models.CharField(
         'Категория',
         max_length=MAX_CATEGORY_LENGTH,
@@ -451,6 +629,8 @@ class Position(NormalizedPairModel):
 
     field1_name = 'category'
     field2_name = 'position'
+    # Поля, из которых строятся слаги и карточки резюме:
+    tracked_fields = ('category', 'position')
 
     class Meta:
         verbose_name = 'должность'
@@ -462,3 +642,212 @@ class Position(NormalizedPairModel):
             )
         ]
         ordering = ('-category', '-position',)
+
+
+class ResumeCard(models.Model):
+    """
+    Плоская витрина опубликованных резюме для списка на главной странице.
+    Одна строка на каждое опубликованное резюме активного пользователя,
+    синхронизируется сигналами (user.signals) и командой
+    rebuild_resume_cards.
+    """
+    resume = models.OneToOneField(
+        Resume,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='card',
+        verbose_name='Резюме',
+    )
+    slug = models.SlugField('Слаг', max_length=MAX_SLUG_LENGTH)
+    full_name = models.CharField('ФИО', max_length=MAX_USER_FULL_NAME_LENGTH)
+    username = models.CharField(
+        'Имя пользователя', max_length=MAX_USERNAME_LENGTH)
+    avatar = models.CharField(
+        'Путь к аватару', max_length=MAX_AVATAR_PATH_LENGTH, blank=True)
+    avatar_ready = models.BooleanField(
+        'Миниатюры аватара готовы', default=False)
+    date_of_birth = models.DateField('Дата рождения', blank=True, null=True)
+    country = models.CharField(
+        'Страна', max_length=MAX_COUNTRY_LENGTH, blank=True)
+    city = models.CharField('Город', max_length=MAX_CITY_LENGTH, blank=True)
+    category = models.CharField('Категория', max_length=MAX_CATEGORY_LENGTH)
+    position = models.CharField('Должность', max_length=MAX_POSITION_LENGTH)
+    about_me = models.TextField('Обо мне')
+    created_at = models.DateTimeField('Дата создания')
+    updated_at = models.DateTimeField('Дата изменения', auto_now=True)
+
+    class Meta:
+        verbose_name = 'карточка резюме'
+        verbose_name_plural = 'Карточки резюме'
+        indexes = [
+            models.Index(
+                fields=['-created_at', 'resume'],
+                name='resume_card_created_idx',
+            ),
+            models.Index(fields=['country'], name='resume_card_country_idx'),
+            models.Index(
+                fields=['category'], name='resume_card_category_idx'),
+        ]
+        ordering = ('-created_at', 'resume',)
+
+    def __str__(self: 'ResumeCard') -> str:
+        return f'{self.username}: {self.position}'
+
+    def age(self: 'ResumeCard') -> int | None:
+        return calculate_age(self.date_of_birth)
+
+    @property
+    def avatar_url(self: 'ResumeCard') -> str | None:
+        return default_storage.url(self.avatar) if self.avatar else None
+
+    @property
+    def avatar_image(self: 'ResumeCard') -> AvatarImage | None:
+        return avatar_image(self.avatar, self.avatar_ready)
+
+
+class ResumeFacet(models.Model):
+    """
+    Счётчик опубликованных резюме по значению фильтра (страна, категория).
+    Поддерживается инкрементально при изменении карточек резюме.
+    """
+    COUNTRY = 'country'
+    CATEGORY = 'category'
+    KIND_CHOICES = (
+        (COUNTRY, 'Страна'),
+        (CATEGORY, 'Категория'),
+    )
+
+    kind = models.CharField(
+        'Тип фильтра', max_length=MAX_FACET_KIND_LENGTH, choices=KIND_CHOICES)
+    value = models.CharField('Значение', max_length=MAX_FACET_VALUE_LENGTH)
+    resume_count = models.PositiveIntegerField('Количество резюме', default=0)
+
+    class Meta:
+        verbose_name = 'фасет резюме'
+        verbose_name_plural = 'Фасеты резюме'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'value'],
+                name='unique_resume_facet'
+            )
+        ]
+        ordering = ('kind', 'value',)
+
+    def __str__(self: 'ResumeFacet') -> str:
+        return f'{self.kind}: {self.value} ({self.resume_count})'
+
+
+class ResumeVersion(models.Model):
+    """
+    Версия содержимого резюме. Увеличивается при любом изменении резюме и
+    связанных с ним объектов и служит ключом кэша отрисованной страницы.
+    """
+    resume = models.OneToOneField(
+        Resume,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='content_version',
+        verbose_name='Резюме',
+    )
+    version = models.PositiveBigIntegerField('Версия', default=1)
+    updated_at = models.DateTimeField('Дата изменения', default=timezone.now)
+
+    class Meta:
+        verbose_name = 'версия резюме'
+        verbose_name_plural = 'Версии резюме'
+
+    def __str__(self: 'ResumeVersion') -> str:
+        return f'{self.resume_id}: v{self.version}'
+
+
+class ImportChecksum(models.Model):
+    """
+    Контрольные суммы последнего импорта справочников (data_2_db): листа
+    целиком (пустой row_key) и каждой строки по её normalized_key.
+    """
+    sheet_name = models.CharField(
+        'Лист', max_length=MAX_IMPORT_SHEET_NAME_LENGTH)
+    row_key = models.CharField(
+        'Ключ строки',
+        max_length=MAX_NORMALIZED_KEY_LENGTH,
+        blank=True,
+    )
+    checksum = models.CharField(
+        'Контрольная сумма', max_length=MAX_IMPORT_CHECKSUM_LENGTH)
+
+    class Meta:
+        verbose_name = 'контрольная сумма импорта'
+        verbose_name_plural = 'Контрольные суммы импорта'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['sheet_name', 'row_key'],
+                name='unique_import_checksum'
+            )
+        ]
+
+    def __str__(self: 'ImportChecksum') -> str:
+        return f'{self.sheet_name}: {self.row_key or "*"}'
+
+
+def resume_quota(field: str, is_published: bool) -> Quota:
+    status = 'опубликованных' if is_published else 'черновиков'
+    return register_quota(Quota(
+        counters_model='user.UserCounters',
+        field=field,
+        counted_model='user.Resume',
+        owner_field='user_id',
+        limit=MAX_RESUME_COUNT,
+        message=(
+            f'У пользователя может быть максимум {MAX_RESUME_COUNT} '
+            f'{status} резюме.'
+        ),
+        filters=(('is_published', is_published),),
+    ))
+
+
+PUBLISHED_RESUMES_QUOTA = resume_quota('published_resumes', True)
+DRAFT_RESUMES_QUOTA = resume_quota('draft_resumes', False)
+
+
+class UserCounters(models.Model):
+    """Счётчики записей пользователя для квот (см. core.quotas.Quota)."""
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='counters',
+        verbose_name='Пользователь',
+    )
+    published_resumes = models.PositiveIntegerField(
+        'Опубликованных резюме', default=0)
+    draft_resumes = models.PositiveIntegerField('Черновиков резюме', default=0)
+    educations = models.PositiveIntegerField('Образований', default=0)
+    experiences = models.PositiveIntegerField('Мест работы', default=0)
+
+    class Meta:
+        verbose_name = 'счётчики пользователя'
+        verbose_name_plural = 'Счётчики пользователей'
+
+    def __str__(self: 'UserCounters') -> str:
+        return str(self.user_id)
+
+
+class ResumeCounters(models.Model):
+    """Счётчики записей резюме для квот (см. core.quotas.Quota)."""
+    resume = models.OneToOneField(
+        Resume,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='counters',
+        verbose_name='Резюме',
+    )
+    hard_skills = models.PositiveIntegerField(
+        'Профессиональных навыков', default=0)
+    soft_skills = models.PositiveIntegerField('Личностных навыков', default=0)
+
+    class Meta:
+        verbose_name = 'счётчики резюме'
+        verbose_name_plural = 'Счётчики резюме'
+
+    def __str__(self: 'ResumeCounters') -> str:
+        return str(self.resume_id)
@@ -0,0 +1,168 @@
+from typing import NamedTuple
+
+from django.db.models import Model
+from django.utils import timezone
+
+from .models import Education, Experience, HardSkill, Resume, SoftSkill, User
+from .signals import affected_resume_ids
+
+
+class NaturalKeySpec(NamedTuple):
+    """Модель пользовательских записей и её естественный ключ."""
+    model: type[Model]
+    key_fields: tuple[str, ...]
+    value_fields: tuple[str, ...]
+
+    def key(self: 'NaturalKeySpec', data: dict | Model) -> tuple:
+        if isinstance(data, Model):
+            return tuple(getattr(data, f) for f in self.key_fields)
+        return tuple(data.get(f) for f in self.key_fields)
+
+
+EDUCATION_SPEC = NaturalKeySpec(
+    Education,
+    ('institution', 'start_date'),
+    ('degree', 'field_of_study', 'end_date'),
+)
+EXPERIENCE_SPEC = NaturalKeySpec(
+    Experience,
+    ('company', 'start_date'),
+    ('position', 'responsibilities', 'end_date'),
+)
+
+# Вложенные списки сериализаторов пользователя и резюме:
+USER_ITEM_SPECS = {
+    'educations': EDUCATION_SPEC,
+    'experiences': EXPERIENCE_SPEC,
+}
+
+
+class Reconciled(NamedTuple):
+    # Записи в порядке входных данных (повторы ключа объединены):
+    instances: list[Model]
+    # Резюме, которые ссылались на изменённые или удалённые записи:
+    affected_resume_ids: set[int]
+
+
+def reconcile_user_items(
+    spec: NaturalKeySpec,
+    user: User,
+    items: list[dict],
+    delete_missing: bool = False,
+) -> Reconciled:
+    """
+    Сверяет записи пользователя (образование, опыт) с входными данными по
+    естественному ключу: новые — одним bulk_create, изменённые — одним
+    bulk_update, отсутствующие во входных данных (при delete_missing) —
+    одним delete; квота пользователя меняется одним UPDATE. Вызывать
+    внутри transaction.atomic() и bulk_write().
+    """
+    model = spec.model
+    existing = {
+        spec.key(instance): instance
+        for instance in model.objects.filter(user=user)
+    }
+    # Повтор ключа: побеждают последние значения, порядок — первый.
+    incoming = {}
+    for data in items:
+        incoming[spec.key(data)] = data
+
+    instances, to_create, to_update = [], [], []
+    for key, data in incoming.items():
+        instance = existing.get(key)
+        values = {f: data.get(f) for f in spec.value_fields}
+        if instance is None:
+            instance = model(
+                user=user, **dict(zip(spec.key_fields, key)), **values)
+            to_create.append(instance)
+        elif any(getattr(instance, f) != v for f, v in values.items()):
+            for field, value in values.items():
+                setattr(instance, field, value)
+            to_update.append(instance)
+        instances.append(instance)
+
+    to_delete = [
+        instance for key, instance in existing.items()
+        if delete_missing and key not in incoming
+    ]
+    affected = affected_resume_ids(model, [*to_update, *to_delete])
+    if to_delete:
+        model.objects.filter(pk__in=[i.pk for i in to_delete]).delete()
+        model.quota.release(user.pk, len(to_delete))
+    if to_update:
+        model.objects.bulk_update(to_update, spec.value_fields)
+    if to_create:
+        model.quota.acquire(user.pk, len(to_create))
+        model.objects.bulk_create(to_create)
+    return Reconciled(instances, affected)
+
+
+def reconcile_resume_links(
+    resume: Resume, field_name: str, instances: list[Model]
+) -> bool:
+    """
+    Приводит связи резюме (educations, experiences) к заданному набору:
+    удаляются и добавляются только изменившиеся строки промежуточной
+    таблицы. Возвращает True, если связи изменились.
+    """
+    field = Resume._meta.get_field(field_name)
+    through = field.remote_field.through
+    source = field.m2m_field_name()
+    target = f'{field.m2m_reverse_field_name()}_id'
+
+    links = through.objects.filter(**{source: resume})
+    current = set(links.values_list(target, flat=True))
+    desired = {instance.pk for instance in instances}
+    if removed := current - desired:
+        links.filter(**{f'{target}__in': removed}).delete()
+    if added := desired - current:
+        through.objects.bulk_create(
+            [through(**{source: resume, target: pk}) for pk in added])
+    return bool(removed or added)
+
+
+def reconcile_resume_skills(
+    model: type[HardSkill | SoftSkill], resume: Resume, items: list[dict]
+) -> bool:
+    """
+    Сверяет навыки резюме по навыку из справочника: новые — bulk_create,
+    перенесённые в другую ячейку сетки — bulk_update, убранные — одним
+    delete. Возвращает True, если навыки изменились.
+    """
+    existing = {
+        skill.skill_id: skill
+        for skill in model.objects.filter(resume=resume)
+    }
+    incoming = {data['skill'].pk: data for data in items}
+    grid_fields = ('grid_row', 'grid_column')
+    default_cell = {
+        f: model._meta.get_field(f).get_default() for f in grid_fields}
+
+    now = timezone.now()
+    to_create, to_update = [], []
+    for skill_id, data in incoming.items():
+        cell = {f: data.get(f, default_cell[f]) for f in grid_fields}
+        skill = existing.get(skill_id)
+        if skill is None:
+            to_create.append(
+                model(resume=resume, skill=data['skill'], **cell))
+        elif any(getattr(skill, f) != v for f, v in cell.items()):
+            for field, value in cell.items():
+                setattr(skill, field, value)
+            # bulk_update не обновляет auto_now-поля:
+            skill.updated_at = now
+            to_update.append(skill)
+
+    removed = [
+        skill.pk for skill_id, skill in existing.items()
+        if skill_id not in incoming
+    ]
+    if removed:
+        model.objects.filter(pk__in=removed).delete()
+        model.quota.release(resume.pk, len(removed))
+    if to_update:
+        model.objects.bulk_update(to_update, (*grid_fields, 'updated_at'))
+    if to_create:
+        model.quota.acquire(resume.pk, len(to_create))
+        model.objects.bulk_create(to_create)
+    return bool(removed or to_update or to_create)
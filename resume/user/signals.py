@@ -0,0 +1,241 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Iterable, Iterator
+
+from core.models import TrackedFieldsMixin
+from django.db.models import Model, QuerySet
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_delete)
+from django.dispatch import Signal, receiver
+
+from .cards import refresh_resume_cards, remove_resume_cards
+from .dictionaries import get_reference_dictionary
+from .models import (Education, Experience, HardSkill, HardSkillName, Location,
+                     Position, Resume, SoftSkill, SoftSkillName, User)
+from .skills import refresh_skill_layouts
+from .versions import bump_resume_versions
+
+# Сообщает другим приложениям (поиск, кэши), что содержимое резюме
+# изменилось. Аргументы: sender — модель-источник, resume_ids — set[int].
+resume_content_changed = Signal()
+
+# Модели, от которых зависят карточки резюме (ResumeCard):
+CARD_SOURCES = (Resume, User, Location, Position)
+# Модели, от которых зависит сохранённая сетка навыков:
+SKILL_LAYOUT_SOURCES = (HardSkill, SoftSkill, HardSkillName, SoftSkillName)
+
+# Включено внутри bulk_write(): обработчики сигналов резюме пропускаются.
+_bulk_write: ContextVar[bool] = ContextVar('resume_bulk_write', default=False)
+
+
+@contextmanager
+def bulk_write() -> Iterator[None]:
+    """
+    Массовая запись резюме и связанных объектов. Обработчики сигналов,
+    обновляющие производные данные резюме, на это время отключаются:
+    вызывающий код один раз сообщает об изменениях через resumes_changed.
+    """
+    token = _bulk_write.set(True)
+    try:
+        yield
+    finally:
+        _bulk_write.reset(token)
+
+
+def skip_during_bulk_write(
+    handler: Callable[..., None]
+) -> Callable[..., None]:
+    @wraps(handler)
+    def wrapper(*args: tuple, **kwargs: dict) -> None:
+        if not _bulk_write.get():
+            handler(*args, **kwargs)
+
+    return wrapper
+
+
+def resumes_changed(
+    resume_ids: Iterable[int], source: type[Model] = Resume
+) -> None:
+    """
+    Единая точка обновления производных данных резюме (read-модели, кэши).
+    Вызывается сигналами и путями массовой записи, которые сигналы обходят.
+    """
+    resume_ids = set(resume_ids)
+    if not resume_ids:
+        return
+    if source in CARD_SOURCES:
+        refresh_resume_cards(resume_ids)
+    if source in SKILL_LAYOUT_SOURCES:
+        refresh_skill_layouts(resume_ids)
+    bump_resume_versions(resume_ids)
+    resume_content_changed.send(sender=source, resume_ids=resume_ids)
+
+
+def _resume_ids(queryset: QuerySet[Resume]) -> list[int]:
+    return list(queryset.values_list('pk', flat=True))
+
+
+# Путь от резюме к связанной модели, изменение которой затрагивает резюме:
+RESUME_LOOKUPS: dict[type[Model], str] = {
+    User: 'user',
+    Location: 'user__location',
+    Position: 'position',
+    Education: 'educations',
+    Experience: 'experiences',
+    HardSkillName: 'hard_skills__skill',
+    SoftSkillName: 'soft_skills__skill',
+}
+
+AFFECTED_RESUMES: dict[type[Model], Callable[[Model], QuerySet[Resume]]] = {
+    model: (
+        lambda instance, lookup=lookup: Resume.objects.filter(
+            **{lookup: instance})
+    )
+    for model, lookup in RESUME_LOOKUPS.items()
+}
+
+
+def affected_resume_ids(
+    model: type[Model], objects: Iterable[Model]
+) -> set[int]:
+    """Резюме, затронутые изменением объектов (для путей массовой записи)."""
+    return set(
+        Resume.objects
+        .filter(**{f'{RESUME_LOOKUPS[model]}__in': list(objects)})
+        .values_list('pk', flat=True)
+    )
+
+
+@receiver(post_save, sender=Resume)
+@receiver(post_delete, sender=Resume)
+@skip_during_bulk_write
+def resume_changed(
+    sender: type[Resume], instance: Resume, **kwargs: dict
+) -> None:
+    resumes_changed([instance.pk])
+
+
+@receiver(post_delete, sender=Resume)
+@receiver(post_delete, sender=HardSkill)
+@receiver(post_delete, sender=SoftSkill)
+@receiver(post_delete, sender=Education)
+@receiver(post_delete, sender=Experience)
+@skip_during_bulk_write
+def quota_record_deleted(
+    sender: type[Model], instance: Model, **kwargs: dict
+) -> None:
+    # Пути массовой записи (bulk_write) освобождают квоту сами, одним
+    # UPDATE на пачку:
+    instance.quota.release(instance.quota.owner_id(instance))
+
+
+@receiver(pre_delete, sender=Resume)
+def resume_pre_delete(
+    sender: type[Resume], instance: Resume, **kwargs: dict
+) -> None:
+    # Карточка удалится каскадом, но счётчики фасетов нужно уменьшить:
+    remove_resume_cards([instance.pk])
+
+
+@receiver(post_save, sender=HardSkill)
+@receiver(post_save, sender=SoftSkill)
+@receiver(post_delete, sender=HardSkill)
+@receiver(post_delete, sender=SoftSkill)
+@skip_during_bulk_write
+def resume_skill_changed(
+    sender: type[HardSkill | SoftSkill],
+    instance: HardSkill | SoftSkill,
+    **kwargs: dict
+) -> None:
+    resumes_changed([instance.resume_id], sender)
+
+
+@receiver(m2m_changed, sender=Resume.educations.through)
+@receiver(m2m_changed, sender=Resume.experiences.through)
+@skip_during_bulk_write
+def resume_links_changed(
+    sender: type[Model], instance: Model, action: str, **kwargs: dict
+) -> None:
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if isinstance(instance, Resume):
+        resumes_changed([instance.pk], sender)
+    else:
+        resumes_changed(
+            _resume_ids(AFFECTED_RESUMES[type(instance)](instance)), sender)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Location)
+@receiver(post_save, sender=Position)
+@receiver(post_save, sender=Education)
+@receiver(post_save, sender=Experience)
+@receiver(post_save, sender=HardSkillName)
+@receiver(post_save, sender=SoftSkillName)
+@skip_during_bulk_write
+def related_object_saved(
+    sender: type[Model], instance: Model, **kwargs: dict
+) -> None:
+    if (
+        isinstance(instance, TrackedFieldsMixin)
+        and not kwargs['created']
+        and not instance.changed_fields(kwargs['update_fields'])
+    ):
+        # Сохранение не затронуло поля, которые выводятся в резюме:
+        return
+    resumes_changed(_resume_ids(AFFECTED_RESUMES[sender](instance)), sender)
+
+
+@receiver(post_save, sender=Position)
+def position_saved(
+    sender: type[Position], instance: Position, **kwargs: dict
+) -> None:
+    if kwargs['created'] or not instance.changed_fields(
+        kwargs['update_fields']
+    ):
+        return
+    # Слаги резюме содержат категорию и название должности. Более старые
+    # резюме первыми получают короткий слаг, как и при создании:
+    for resume in Resume.objects.filter(
+        position=instance
+    ).select_related('user').order_by('pk'):
+        resume.position = instance
+        resume.refresh_slug()
+
+
+@receiver(pre_delete, sender=Location)
+@receiver(pre_delete, sender=Education)
+@receiver(pre_delete, sender=Experience)
+@skip_during_bulk_write
+def related_object_pre_delete(
+    sender: type[Model], instance: Model, **kwargs: dict
+) -> None:
+    # После удаления связь уже разорвана (SET_NULL или каскад по
+    # промежуточной таблице), поэтому затронутые резюме запоминаем заранее:
+    instance._affected_resume_ids = _resume_ids(
+        AFFECTED_RESUMES[sender](instance))
+
+
+@receiver(post_delete, sender=Location)
+@receiver(post_delete, sender=Education)
+@receiver(post_delete, sender=Experience)
+@skip_during_bulk_write
+def related_object_deleted(
+    sender: type[Model], instance: Model, **kwargs: dict
+) -> None:
+    resumes_changed(getattr(instance, '_affected_resume_ids', ()), sender)
+
+
+@receiver(post_save, sender=HardSkillName)
+@receiver(post_save, sender=SoftSkillName)
+@receiver(post_save, sender=Location)
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=HardSkillName)
+@receiver(post_delete, sender=SoftSkillName)
+@receiver(post_delete, sender=Location)
+@receiver(post_delete, sender=Position)
+def dictionary_changed(
+    sender: type[Model], instance: Model, **kwargs: dict
+) -> None:
+    get_reference_dictionary(sender).invalidate()
@@ -0,0 +1,107 @@
+from typing import Iterable, Iterator
+
+from core.utils import build_sparse_grid
+from django.db import transaction
+from django.db.models import CharField, Model, QuerySet, Value
+
+from .models import HardSkill, Resume, SoftSkill
+
+SkillCell = dict[str, int | str | None]
+SkillGrid = list[list[list[SkillCell]]]
+SkillLayout = dict[str, SkillGrid]
+
+SKILL_MODELS: dict[str, type[Model]] = {
+    'hard': HardSkill,
+    'soft': SoftSkill,
+}
+
+
+def _skill_rows(kind: str, resume_ids: set[int]) -> QuerySet:
+    return (
+        SKILL_MODELS[kind].objects
+        .filter(resume_id__in=resume_ids)
+        .values_list(
+            'resume_id',
+            Value(kind, output_field=CharField()),
+            'grid_row',
+            'grid_column',
+            'updated_at',
+            'skill_id',
+            'skill__name',
+            'skill__description',
+        )
+        .order_by()
+    )
+
+
+def build_skill_layouts(resume_ids: Iterable[int]) -> dict[int, SkillLayout]:
+    """
+    Сетки профессиональных и личностных навыков резюме, собранные одним
+    запросом (UNION ALL). Ячейка — список навыков вида
+    {'id': ..., 'name': ..., 'description': ...} без ORM-объектов.
+    """
+    resume_ids = set(resume_ids)
+    hard_rows, soft_rows = (
+        _skill_rows(kind, resume_ids) for kind in SKILL_MODELS)
+    rows = hard_rows.union(soft_rows, all=True).order_by(
+        'grid_row', 'grid_column', 'updated_at')
+
+    cells = {
+        resume_id: {kind: [] for kind in SKILL_MODELS}
+        for resume_id in resume_ids
+    }
+    for resume_id, kind, row, col, _, pk, name, description in rows:
+        cells[resume_id][kind].append(
+            (row, col, {'id': pk, 'name': name, 'description': description}))
+    return {
+        resume_id: {
+            kind: build_sparse_grid(kind_cells)
+            for kind, kind_cells in resume_cells.items()
+        }
+        for resume_id, resume_cells in cells.items()
+    }
+
+
+def build_skill_grids(resume_id: int) -> SkillLayout:
+    return build_skill_layouts([resume_id])[resume_id]
+
+
+def refresh_skill_layouts(resume_ids: Iterable[int]) -> None:
+    """
+    Пересчитывает сохранённые сетки навыков резюме. Строки резюме
+    блокируются, чтобы параллельные правки навыков не перезаписали
+    сетку устаревшими данными.
+    """
+    resume_ids = set(resume_ids)
+    if not resume_ids:
+        return
+
+    with transaction.atomic():
+        locked_ids = list(
+            Resume.objects
+            .select_for_update()
+            .filter(pk__in=resume_ids)
+            .values_list('pk', flat=True)
+        )
+        if not locked_ids:
+            return
+        layouts = build_skill_layouts(locked_ids)
+        Resume.objects.bulk_update(
+            [
+                Resume(pk=resume_id, skill_layout=layout)
+                for resume_id, layout in layouts.items()
+            ],
+            ['skill_layout'],
+        )
+
+
+def iter_layout_skills(grid: SkillGrid) -> Iterator[dict]:
+    """Навыки сетки с координатами в порядке отображения."""
+    for row_number, row in enumerate(grid, start=1):
+        for column_number, cell in enumerate(row, start=1):
+            for skill in cell:
+                yield {
+                    'skill': skill,
+                    'grid_row': row_number,
+                    'grid_column': column_number,
+                }
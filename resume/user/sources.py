@@ -0,0 +1,68 @@
+import csv
+import json
+import os
+from typing import Iterator
+
+from openpyxl import load_workbook
+
+RawRow = dict[str, object]
+
+
+class UnsupportedSource(Exception):
+    """Ошибка: формат источника данных не поддерживается."""
+
+
+def read_xlsx(path: str, sheet_name: str) -> Iterator[RawRow]:
+    """
+    Потоковое чтение листа: в режиме read-only openpyxl не загружает
+    книгу в память целиком. Первая строка листа — заголовки.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        for values in rows:
+            yield dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def read_csv(path: str) -> Iterator[RawRow]:
+    with open(path, newline='', encoding='utf-8-sig') as file:
+        yield from csv.DictReader(file)
+
+
+def read_jsonl(path: str) -> Iterator[RawRow]:
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+FILE_READERS = {
+    '.csv': read_csv,
+    '.jsonl': read_jsonl,
+}
+
+
+def read_source(path: str, sheet_name: str) -> Iterator[RawRow]:
+    """
+    Строки листа из источника: книги XLSX, файла CSV/JSON Lines или
+    каталога с файлами вида <лист>.csv / <лист>.jsonl.
+    """
+    if os.path.isdir(path):
+        for extension, reader in FILE_READERS.items():
+            sheet_path = os.path.join(path, f'{sheet_name}{extension}')
+            if os.path.exists(sheet_path):
+                return reader(sheet_path)
+        raise UnsupportedSource(
+            f'В каталоге {path} нет файла для листа {sheet_name}.')
+
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.xlsx':
+        return read_xlsx(path, sheet_name)
+    if extension in FILE_READERS:
+        return FILE_READERS[extension](path)
+    raise UnsupportedSource(f'Неподдерживаемый формат источника: {path}.')
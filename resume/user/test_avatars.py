@@ -0,0 +1,98 @@
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+from PIL import Image
+
+from .avatars import validate_avatar_dimensions, variant_name, variant_names
+from .constants import AVATAR_SIZES
+from .models import Position, Resume, ResumeCard, User
+
+# Ориентация EXIF «повернуть на 90°» и модель камеры:
+EXIF_ORIENTATION, EXIF_MAKE = 0x0112, 0x010F
+
+
+def image_file(size: tuple[int, int], name: str = 'photo.jpg') -> ContentFile:
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = 6
+    exif[EXIF_MAKE] = 'Camera'
+    buffer = BytesIO()
+    Image.new('RGB', size, 'red').save(buffer, 'JPEG', exif=exif.tobytes())
+    return ContentFile(buffer.getvalue(), name=name)
+
+
+@pytest.fixture
+def avatar_resume(media: Path) -> Resume:
+    user = User.objects.create(
+        username='ivan', email='ivan@mail.com', avatar=image_file((400, 300)))
+    return Resume.objects.create(
+        user=user,
+        position=Position.objects.create(category='IT', position='Аналитик'),
+        is_published=True,
+    )
+
+
+def test_avatar_dimensions_are_validated() -> None:
+    validate_avatar_dimensions(image_file((100, 100)))
+    with pytest.raises(ValidationError):
+        validate_avatar_dimensions(image_file((32, 100)))
+    with pytest.raises(ValidationError):
+        validate_avatar_dimensions(ContentFile(b'not an image', name='a.jpg'))
+
+
+@pytest.mark.django_db
+def test_worker_strips_exif_and_creates_variants(
+    client: Client, avatar_resume: Resume
+) -> None:
+    original = avatar_resume.user.avatar.name
+    assert avatar_resume.user.avatar_status == User.AVATAR_PENDING
+
+    call_command('process_avatars', once=True)
+
+    user = User.objects.get(pk=avatar_resume.user_id)
+    assert user.avatar_status == User.AVATAR_READY
+    assert user.avatar.name != original
+    assert not default_storage.exists(original)
+    with default_storage.open(user.avatar.name) as file:
+        with Image.open(file) as image:
+            assert image.size == (300, 400)
+            assert not image.getexif()
+    for size in AVATAR_SIZES:
+        name = variant_name(user.avatar.name, size, 'webp')
+        with default_storage.open(name) as file:
+            with Image.open(file) as image:
+                assert image.size == (size, size)
+    assert ResumeCard.objects.get(resume=avatar_resume).avatar_ready
+
+    content = client.get(
+        reverse('user:resume_detail', kwargs={'slug': avatar_resume.slug})
+    ).content.decode()
+    assert 'type="image/webp"' in content
+    assert 'loading="lazy"' in content
+    assert f'{variant_name(user.avatar.name, 64, "webp")} 64w' in content
+
+
+@pytest.mark.django_db
+def test_stale_instance_does_not_overwrite_processed_avatar(
+    avatar_resume: Resume,
+) -> None:
+    user = User.objects.get(pk=avatar_resume.user_id)
+    call_command('process_avatars', once=True)
+
+    user.first_name = 'Иван'
+    user.save()
+    user = User.objects.get(pk=user.pk)
+    assert user.avatar_status == User.AVATAR_READY
+    assert default_storage.exists(user.avatar.name)
+
+    name = user.avatar.name
+    user.avatar = None
+    user.save()
+    assert not any(
+        default_storage.exists(file) for file in [name, *variant_names(name)])
@@ -0,0 +1,216 @@
+import json
+from pathlib import Path
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from openpyxl import Workbook
+
+from . import importing
+from .importing import ImportSpec, clean_rows, import_sheet
+from .models import (HardSkillName, ImportChecksum, Location, Position, Resume,
+                     User)
+from .sources import read_source
+
+LOCATIONS = ImportSpec(
+    Location, 'Locations', ('country', 'city'), ('country', 'city'))
+HARD_SKILLS = ImportSpec(
+    HardSkillName, 'HardSkills', ('name', 'description'), ('name',))
+
+
+POSITIONS = ImportSpec(
+    Position, 'Positions', ('category', 'position'), ('category', 'position'))
+
+
+def write_sheet(path: Path, rows: list[dict[str, str]]) -> str:
+    path.write_text(
+        '\n'.join(json.dumps(row, ensure_ascii=False) for row in rows),
+        encoding='utf-8',
+    )
+    return str(path)
+
+
+@pytest.mark.django_db
+def test_chunk_is_written_with_constant_number_of_queries(
+    django_assert_max_num_queries: callable, tmp_path: Path
+) -> None:
+    Location.objects.create(country='Россия', city='москва')
+    rows = [{'country': 'Россия', 'city': f'Город {i}'} for i in range(50)]
+    rows.append({'country': 'россия', 'city': 'Москва'})
+    source = write_sheet(tmp_path / 'Locations.jsonl', rows)
+
+    with django_assert_max_num_queries(15):
+        stats = import_sheet(LOCATIONS, source, chunk_size=100)
+
+    assert (stats.created, stats.updated) == (50, 1)
+    assert Location.objects.count() == 51
+    assert Location.objects.filter(country='Россия', city='Москва').exists()
+    assert stats.rows_per_second > 0
+
+
+@pytest.mark.django_db
+def test_unchanged_duplicate_and_invalid_rows_are_skipped(
+    tmp_path: Path,
+) -> None:
+    HardSkillName.objects.create(name='Python', description='Язык')
+    HardSkillName.objects.create(name='SQL', description='Запросы')
+    source = write_sheet(tmp_path / 'HardSkills.jsonl', [
+        {'name': 'Python', 'description': 'Язык'},
+        {'name': 'SQL', 'description': 'Запросы к БД'},
+        {'name': 'sql', 'description': 'Повтор ключа'},
+        {'name': 'Go', 'description': 'Язык'},
+        {'name': 'X' * 1000, 'description': 'Слишком длинное'},
+    ])
+
+    stats = import_sheet(HARD_SKILLS, source, chunk_size=2)
+
+    assert (stats.created, stats.updated, stats.invalid) == (1, 1, 1)
+    assert stats.unchanged == 1
+    assert HardSkillName.objects.get(normalized_key='sql').description == (
+        'Запросы к БД')
+
+
+@pytest.mark.django_db
+def test_updated_rows_refresh_dependent_resumes(tmp_path: Path) -> None:
+    position = Position.objects.create(category='IT', position='аналитик')
+    resume = Resume.objects.create(
+        user=User.objects.create(username='author', email='a@mail.com'),
+        position=position,
+        about_me='Обо мне',
+    )
+    version = resume.content_version.version
+
+    import_sheet(POSITIONS, write_sheet(
+        tmp_path / 'Positions.jsonl',
+        [{'category': 'IT', 'position': 'Аналитик'}],
+    ))
+
+    resume.content_version.refresh_from_db()
+    assert resume.content_version.version > version
+
+
+def test_sources_yield_cleaned_rows_without_duplicate_keys(
+    tmp_path: Path,
+) -> None:
+    rows = [
+        ('country', 'city'),
+        (' россия ', 'москва'),
+        ('Россия', 'Москва'),
+        ('Россия', None),
+        ('Россия', 'Тверь'),
+    ]
+    workbook = Workbook()
+    workbook.active.title = 'Locations'
+    for row in rows:
+        workbook.active.append(row)
+    workbook.save(tmp_path / 'data.xlsx')
+    (tmp_path / 'Locations.csv').write_text(
+        '\n'.join(','.join(value or '' for value in row) for row in rows),
+        encoding='utf-8',
+    )
+    (tmp_path / 'Locations.jsonl').write_text(
+        '\n'.join(json.dumps(dict(zip(rows[0], row))) for row in rows[1:]),
+        encoding='utf-8',
+    )
+    expected = [
+        {
+            'country': 'Россия',
+            'city': 'Москва',
+            'normalized_key': 'россия\nмосква',
+        },
+        {
+            'country': 'Россия',
+            'city': 'Тверь',
+            'normalized_key': 'россия\nтверь',
+        },
+    ]
+
+    for source in (
+        tmp_path / 'data.xlsx',
+        tmp_path / 'Locations.csv',
+        tmp_path / 'Locations.jsonl',
+    ):
+        assert list(
+            clean_rows(LOCATIONS, read_source(str(source), 'Locations'))
+        ) == expected
+    # Каталог: файл листа ищется по имени (первым — CSV):
+    assert list(
+        clean_rows(LOCATIONS, read_source(str(tmp_path), 'Locations'))
+    ) == expected
+
+
+def test_vectorized_keys_match_model_keys() -> None:
+    names = ['  ёлка  Новая ', 'SQL\tServer', 'Python']
+    rows = list(clean_rows(
+        HARD_SKILLS,
+        ({'name': name, 'description': 'описание'} for name in names),
+        batch_size=2,
+    ))
+    assert [row['normalized_key'] for row in rows] == [
+        HardSkillName.build_normalized_key(name) for name in names
+    ]
+    assert rows[0]['name'] == 'ёлка  Новая'
+    assert rows[0]['description'] == 'Описание'
+
+
+def write_locations(path: Path, *rows: tuple[str, str]) -> None:
+    path.write_text(
+        '\n'.join(','.join(row) for row in (('country', 'city'), *rows)),
+        encoding='utf-8',
+    )
+
+
+@pytest.mark.django_db
+def test_reimport_writes_only_changed_rows(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    reads = []
+    monkeypatch.setattr(
+        importing, 'read_source',
+        lambda *args: reads.append(args) or read_source(*args),
+    )
+    source = tmp_path / 'Locations.csv'
+    write_locations(
+        source,
+        ('Россия', 'Москва'), ('Россия', 'Тверь'), ('Россия', 'Омск'))
+    assert import_sheet(LOCATIONS, str(source)).created == 3
+    # Лист не изменился — он прочитан один раз, и ничего не записано:
+    with CaptureQueriesContext(connection) as queries:
+        assert import_sheet(LOCATIONS, str(source)) is None
+    assert len(reads) == 2
+    assert not any(
+        query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))
+        for query in queries.captured_queries
+    )
+
+    omsk = Location.objects.get(city='Омск')
+    User.objects.create(username='u', email='u@mail.com', location=omsk)
+    write_locations(
+        source,
+        ('Россия', 'москва '), ('Россия', 'Казань'), ('Россия', 'Тверь'))
+    changes = []
+    stats = import_sheet(
+        LOCATIONS,
+        str(source),
+        dry_run=True,
+        on_change=lambda change, row: changes.append(
+            (change, row['normalized_key'])),
+    )
+    assert sorted(changes) == [
+        ('+', 'россия\nказань'),
+        ('-', 'россия\nомск'),
+    ]
+    assert (stats.created, stats.updated, stats.removed) == (1, 0, 1)
+    assert not Location.objects.filter(city='Казань').exists()
+
+    write_locations(
+        source,
+        ('Россия', 'Москва'), ('Россия', 'Казань'), ('Беларусь', 'Минск'))
+    stats = import_sheet(LOCATIONS, str(source))
+    assert (stats.created, stats.unchanged) == (2, 1)
+    # Тверь удалена, Омск используется пользователем и остаётся:
+    assert stats.removed == 1
+    assert set(Location.objects.values_list('city', flat=True)) == {
+        'Москва', 'Казань', 'Минск', 'Омск'}
+    assert not ImportChecksum.objects.filter(
+        row_key__in=('россия\nтверь', 'россия\nомск')).exists()
@@ -0,0 +1,91 @@
+import pytest
+from core.constants import MAX_EDUCATION_AND_EXPERIENCE
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from .constants import MAX_RESUME_COUNT
+from .models import (Education, Position, Resume, ResumeCounters, User,
+                     UserCounters)
+
+
+def create_resume(user: User, index: int, is_published: bool = True) -> Resume:
+    position = Position.objects.create(category='IT', position=f'Роль {index}')
+    return Resume.objects.create(
+        user=user, position=position, is_published=is_published)
+
+
+@pytest.mark.django_db
+def test_resume_quota_checked_without_count(author: User) -> None:
+    for index in range(MAX_RESUME_COUNT):
+        create_resume(author, index)
+    position = Position.objects.create(category='IT', position='Лишняя')
+
+    with CaptureQueriesContext(connection) as queries:
+        with pytest.raises(ValidationError):
+            Resume.objects.create(user=author, position=position)
+    assert not any('COUNT(' in query['sql'] for query in queries)
+    assert Resume.objects.filter(user=author).count() == MAX_RESUME_COUNT
+
+    # Черновики считаются отдельно:
+    create_resume(author, 100, is_published=False)
+    assert author.counters.draft_resumes == 1
+
+
+@pytest.mark.django_db
+def test_counters_follow_deletes_and_status_changes(author: User) -> None:
+    resumes = [create_resume(author, index) for index in range(2)]
+    resumes[0].delete()
+    resume = Resume.objects.get(pk=resumes[1].pk)
+    resume.is_published = False
+    resume.save()
+
+    counters = UserCounters.objects.get(user=author)
+    assert (counters.published_resumes, counters.draft_resumes) == (0, 1)
+
+
+@pytest.mark.django_db
+def test_missing_counters_rebuilt_from_rows(author: User) -> None:
+    Education.objects.bulk_create(
+        Education(
+            user=author,
+            institution=f'ВУЗ {index}',
+            degree='Бакалавр',
+            field_of_study='Физика',
+            start_date='2015-09-01',
+        )
+        for index in range(MAX_EDUCATION_AND_EXPERIENCE)
+    )
+    UserCounters.objects.filter(user=author).delete()
+
+    with pytest.raises(ValidationError):
+        Education.objects.create(
+            user=author,
+            institution='Лишний',
+            degree='Бакалавр',
+            field_of_study='Физика',
+            start_date='2016-09-01',
+        )
+    assert Education.quota.used(author.pk) == MAX_EDUCATION_AND_EXPERIENCE
+
+
+@pytest.mark.django_db
+def test_skill_quota_rejects_bulk_write(
+    api_client: APIClient, author: User, hard_skill_names: callable
+) -> None:
+    resume = create_resume(author, 0)
+    skills = hard_skill_names(2)
+    ResumeCounters.objects.update_or_create(
+        resume=resume, defaults={'hard_skills': 49})
+
+    response = api_client.patch(
+        f'/api/v1/resumes/{resume.slug}/',
+        {'hard_skills': [
+            {'skill_id': skill.pk, 'grid_row': 1, 'grid_column': column}
+            for column, skill in enumerate(skills, start=1)
+        ]},
+        format='json',
+    )
+    assert response.status_code == 400
+    assert not resume.hard_skills.exists()
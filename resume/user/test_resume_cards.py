@@ -0,0 +1,64 @@
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from .models import Location, Resume, ResumeCard, User
+
+
+@pytest.fixture
+def author() -> User:
+    return User.objects.create(
+        username='author',
+        email='author@mail.com',
+        first_name='Иван',
+        last_name='Иванов',
+        location=Location.objects.create(country='Россия', city='Москва'),
+    )
+
+
+@pytest.mark.django_db
+def test_card_follows_resume_and_user_changes(resume: Resume) -> None:
+    card = ResumeCard.objects.get(resume=resume)
+    assert card.full_name == 'Иванов Иван'
+    assert (card.country, card.city) == ('Россия', 'Москва')
+
+    resume.user.first_name = 'Пётр'
+    resume.user.save()
+    assert ResumeCard.objects.get(resume=resume).full_name == 'Иванов Пётр'
+
+    resume.is_published = False
+    resume.save()
+    assert not ResumeCard.objects.filter(resume=resume).exists()
+
+
+@pytest.mark.django_db
+def test_card_removed_for_inactive_user(resume: Resume) -> None:
+    resume.user.is_active = False
+    resume.user.save()
+    assert not ResumeCard.objects.exists()
+
+
+@pytest.mark.django_db
+def test_resume_list_reads_cards(client: Client, resume: Resume) -> None:
+    response = client.get(reverse('user:resume_list'), {'country': 'Россия'})
+    assert list(response.context['page_obj']) == [resume.card]
+
+
+@pytest.mark.django_db
+def test_facets_follow_publish_unpublish_and_delete(
+    client: Client, resume: Resume
+) -> None:
+    url = reverse('api:resume-facets')
+    assert client.get(url).json() == {
+        'countries': [{'value': 'Россия', 'count': 1}],
+        'categories': [{'value': 'IT', 'count': 1}],
+    }
+
+    resume.is_published = False
+    resume.save()
+    assert client.get(url).json() == {'countries': [], 'categories': []}
+
+    resume.is_published = True
+    resume.save()
+    resume.delete()
+    assert client.get(url).json() == {'countries': [], 'categories': []}
@@ -0,0 +1,80 @@
+import datetime as dt
+
+import pytest
+from django.test import Client
+from django.urls import reverse
+
+from .models import Experience, Location, Resume, User
+
+
+@pytest.fixture
+def author() -> User:
+    return User.objects.create(
+        username='author',
+        email='author@mail.com',
+        first_name='Иван',
+        last_name='Иванов',
+        location=Location.objects.create(country='Россия', city='Москва'),
+    )
+
+
+def detail_url(resume: Resume) -> str:
+    return reverse('user:resume_detail', kwargs={'slug': resume.slug})
+
+
+@pytest.mark.django_db
+def test_warm_detail_page_does_not_hit_database(
+    client: Client, django_assert_num_queries: callable, resume: Resume
+) -> None:
+    client.get(detail_url(resume))
+    with django_assert_num_queries(0):
+        response = client.get(detail_url(resume))
+    assert 'Иванов Иван' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_related_changes_invalidate_cached_page(
+    client: Client, resume: Resume
+) -> None:
+    client.get(detail_url(resume))
+
+    experience = Experience.objects.create(
+        user=resume.user,
+        company='Рога и копыта',
+        position='Инженер',
+        start_date=dt.date(2020, 1, 1),
+    )
+    resume.experiences.add(experience)
+    assert 'Рога и копыта' in client.get(detail_url(resume)).content.decode()
+
+    resume.user.location.city = 'Казань'
+    resume.user.location.save()
+    assert 'Казань' in client.get(detail_url(resume)).content.decode()
+
+
+@pytest.mark.django_db
+def test_unpublished_page_visible_only_to_owner(
+    client: Client, resume: Resume
+) -> None:
+    client.get(detail_url(resume))
+    resume.is_published = False
+    resume.save()
+    assert client.get(detail_url(resume)).status_code == 404
+
+    client.force_login(resume.user)
+    assert client.get(detail_url(resume)).status_code == 200
+
+
+@pytest.mark.django_db
+def test_detail_page_answers_conditional_requests(
+    client: Client, resume: Resume
+) -> None:
+    response = client.get(detail_url(resume))
+    etag = response.headers['ETag']
+    assert response.headers['Last-Modified']
+    assert client.get(
+        detail_url(resume), HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    client.force_login(resume.user)
+    assert client.get(
+        detail_url(resume), HTTP_IF_NONE_MATCH=etag).status_code == 200
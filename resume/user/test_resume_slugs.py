@@ -0,0 +1,85 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from user.models import Position, Resume, User
+
+
+def create_user(username: str) -> User:
+    return User.objects.create(username=username, email=f'{username}@m.ru')
+
+
+@pytest.fixture
+def position() -> Position:
+    return Position.objects.create(category='IT', position='Тестировщик')
+
+
+@pytest.mark.django_db
+def test_saving_unrelated_fields_does_not_touch_slug(
+    position: Position,
+) -> None:
+    resume = Resume.objects.create(
+        user=create_user('ivan'), position=position)
+    resume = Resume.objects.get(pk=resume.pk)
+    with CaptureQueriesContext(connection) as queries:
+        resume.about_me = 'Обо мне'
+        resume.save()
+    # Занятость слага не проверяется отдельным запросом:
+    assert not any(
+        query['sql'].startswith('SELECT') and '"slug" =' in query['sql']
+        for query in queries.captured_queries
+    )
+    assert resume.slug == 'ivan-testirovshchik'
+
+
+@pytest.mark.django_db
+def test_slug_conflict_falls_back_to_category_and_suffix(
+    position: Position,
+) -> None:
+    # Имена различаются только регистром, а слаги — нет:
+    first, second, third = (
+        Resume.objects.create(user=create_user(name), position=position)
+        for name in ('ivan', 'Ivan', 'IVAN')
+    )
+
+    assert first.slug == 'ivan-testirovshchik'
+    assert second.slug == 'ivan-it-testirovshchik'
+    assert third.slug == 'ivan-it-testirovshchik-2'
+    assert Resume.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_slug_follows_position_and_username_changes(
+    position: Position,
+) -> None:
+    user = create_user('ivan')
+    resume = Resume.objects.create(user=user, position=position)
+
+    resume.position = Position.objects.create(
+        category='IT', position='Разработчик')
+    resume.save()
+    assert resume.slug == 'ivan-razrabotchik'
+
+    user.username = 'petr'
+    user.save()
+    resume.refresh_from_db()
+    assert resume.slug == 'petr-razrabotchik'
+
+
+@pytest.mark.django_db
+def test_position_rename_refreshes_slugs(position: Position) -> None:
+    first, second = (
+        Resume.objects.create(user=create_user(name), position=position)
+        for name in ('ivan', 'Ivan')
+    )
+
+    position.position = 'Аналитик'
+    position.save()
+    first.refresh_from_db()
+    second.refresh_from_db()
+    assert first.slug == 'ivan-analitik'
+    assert second.slug == 'ivan-it-analitik'
+
+    position.category = 'QA'
+    position.save()
+    second.refresh_from_db()
+    assert second.slug == 'ivan-qa-analitik'
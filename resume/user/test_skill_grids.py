@@ -0,0 +1,72 @@
+import pytest
+
+from .models import HardSkill, HardSkillName, Resume, SoftSkill, SoftSkillName
+from .skills import build_skill_grids
+
+
+@pytest.mark.django_db
+def test_both_grids_built_with_one_query(
+    django_assert_num_queries: callable, resume: Resume
+) -> None:
+    python = HardSkillName.objects.create(name='Python', description='Язык')
+    sql = HardSkillName.objects.create(name='SQL')
+    HardSkill.objects.create(
+        resume=resume, skill=python, grid_row=1, grid_column=1)
+    HardSkill.objects.create(
+        resume=resume, skill=sql, grid_row=2, grid_column=3)
+    SoftSkill.objects.create(
+        resume=resume,
+        skill=SoftSkillName.objects.create(name='Общение'),
+        grid_row=1,
+        grid_column=2,
+    )
+
+    with django_assert_num_queries(1):
+        grids = build_skill_grids(resume.pk)
+
+    assert grids['hard'] == [
+        [[{'id': python.pk, 'name': 'Python', 'description': 'Язык'}], [], []],
+        [[], [], [{'id': sql.pk, 'name': 'SQL', 'description': None}]],
+    ]
+    assert [[len(cell) for cell in row] for row in grids['soft']] == [[0, 1]]
+
+
+@pytest.mark.django_db
+def test_empty_grids(resume: Resume) -> None:
+    assert build_skill_grids(resume.pk) == {'hard': [], 'soft': []}
+
+
+@pytest.mark.django_db
+def test_layout_persisted_on_resume(resume: Resume) -> None:
+    skill = HardSkillName.objects.create(name='Python')
+    hard_skill = HardSkill.objects.create(
+        resume=resume, skill=skill, grid_row=2, grid_column=1)
+    resume.refresh_from_db()
+    assert resume.skill_layout == build_skill_grids(resume.pk)
+    assert resume.skill_layout['hard'][1][0][0]['name'] == 'Python'
+
+    skill.name = 'Python 3'
+    skill.save()
+    resume.refresh_from_db()
+    assert resume.skill_layout['hard'][1][0][0]['name'] == 'Python 3'
+
+    hard_skill.delete()
+    resume.refresh_from_db()
+    assert resume.skill_layout == {'hard': [], 'soft': []}
+
+
+@pytest.mark.django_db
+def test_stale_resume_does_not_overwrite_layout(resume: Resume) -> None:
+    stale = Resume.objects.get(pk=resume.pk)
+    HardSkill.objects.create(
+        resume=resume,
+        skill=HardSkillName.objects.create(name='Python'),
+        grid_row=1,
+        grid_column=1,
+    )
+
+    stale.about_me = 'Новый текст'
+    stale.save()
+    resume.refresh_from_db()
+    assert resume.skill_layout == build_skill_grids(resume.pk)
+    assert resume.skill_layout['hard'][0][0][0]['name'] == 'Python'
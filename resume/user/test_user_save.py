@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+
+from .models import Position, Resume, User
+
+
+@pytest.fixture
+def user() -> User:
+    user = User.objects.create(username='ivan', email='ivan@mail.com')
+    Resume.objects.create(
+        user=user,
+        position=Position.objects.create(category='IT', position='Аналитик'),
+    )
+    return User.objects.get(pk=user.pk)
+
+
+def resume_version(user: User) -> int:
+    return Resume.objects.get(user=user).content_version.version
+
+
+@pytest.mark.django_db
+def test_login_update_is_a_single_query(
+    django_assert_num_queries: callable, user: User
+) -> None:
+    version = resume_version(user)
+    with django_assert_num_queries(1):
+        user.save(update_fields=['last_login'])
+    with django_assert_num_queries(1):
+        user.set_password('new-password')
+        user.save()
+    assert resume_version(user) == version
+
+
+@pytest.mark.django_db
+def test_content_change_refreshes_resumes(user: User) -> None:
+    version = resume_version(user)
+    user.first_name = 'Иван'
+    user.save()
+    assert resume_version(user) > version
+
+
+@pytest.mark.django_db
+def test_replaced_avatar_is_removed_only_when_saved(
+    tmp_path: Path, user: User
+) -> None:
+    with override_settings(MEDIA_ROOT=tmp_path):
+        user.avatar = SimpleUploadedFile('old.png', b'old')
+        user.save()
+        old_name = user.avatar.name
+
+        user = User.objects.get(pk=user.pk)
+        user.avatar = SimpleUploadedFile('new.png', b'new')
+        user.first_name = 'Иван'
+        user.save(update_fields=['first_name'])
+        assert default_storage.exists(old_name)
+
+        user.save()
+        assert not default_storage.exists(old_name)
+        assert default_storage.exists(user.avatar.name)
+
+
+@pytest.mark.django_db
+def test_unsaved_instances_are_inserted(user: User) -> None:
+    User(pk=user.pk + 100, username='petr', email='petr@mail.com').save()
+    assert User.objects.filter(pk=user.pk + 100, username='petr').exists()
+
+    # Копия загруженного экземпляра:
+    user.pk = None
+    user.username = 'anna'
+    user.email = 'anna@mail.com'
+    user.save()
+    assert User.objects.filter(username='anna').exists()
+
+    # Повторная вставка удалённой строки с прежним pk:
+    copy = User.objects.get(username='anna')
+    pk = copy.pk
+    copy.delete()
+    copy.pk = pk
+    copy.save(force_insert=True)
+    assert User.objects.filter(pk=pk, username='anna').exists()
@@ -0,0 +1,136 @@
+from datetime import datetime, time
+from typing import Iterable, NamedTuple, Optional
+
+from core.conditional import strong_etag
+from django.contrib.auth.models import AbstractBaseUser, AnonymousUser
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .constants import (RESUME_PAGE_CACHE_TIMEOUT, RESUME_SLUG_CACHE_KEY,
+                        RESUME_STAMP_CACHE_KEY)
+from .models import Resume, ResumeVersion
+
+
+class ResumeStamp(NamedTuple):
+    """Всё, что нужно знать о резюме до обращения к БД."""
+    pk: int
+    user_id: int
+    slug: str
+    is_public: bool
+    version: int
+    updated_at: datetime
+
+    def is_visible_to(
+        self: 'ResumeStamp', user: AbstractBaseUser | AnonymousUser
+    ) -> bool:
+        return self.is_public or (
+            user.is_authenticated and user.pk == self.user_id)
+
+    def etag(self: 'ResumeStamp', *variant: object) -> str:
+        # Возраст в резюме зависит от текущей даты:
+        return strong_etag(
+            self.pk, self.version, f'{timezone.localdate():%Y%m%d}', *variant)
+
+    def last_modified(self: 'ResumeStamp') -> datetime:
+        today = timezone.make_aware(
+            datetime.combine(timezone.localdate(), time.min))
+        return max(self.updated_at, today)
+
+    @classmethod
+    def from_resume(
+        cls: type['ResumeStamp'], resume: Resume
+    ) -> 'ResumeStamp':
+        """Штамп уже загруженного резюме (с user и content_version)."""
+        version = getattr(resume, 'content_version', None)
+        return cls(
+            pk=resume.pk,
+            user_id=resume.user_id,
+            slug=resume.slug,
+            is_public=resume.is_published and resume.user.is_active,
+            version=version.version if version else 0,
+            updated_at=version.updated_at if version else resume.created_at,
+        )
+
+
+def bump_resume_versions(resume_ids: Iterable[int]) -> None:
+    """Увеличивает версии резюме и сбрасывает их закэшированные штампы."""
+    resume_ids = set(resume_ids)
+    if not resume_ids:
+        return
+
+    now = timezone.now()
+    with transaction.atomic():
+        updated = ResumeVersion.objects.filter(
+            resume_id__in=resume_ids
+        ).update(version=F('version') + 1, updated_at=now)
+        if updated < len(resume_ids):
+            missing_ids = Resume.objects.filter(
+                pk__in=resume_ids, content_version__isnull=True
+            ).values_list('pk', flat=True)
+            ResumeVersion.objects.bulk_create(
+                [
+                    ResumeVersion(resume_id=pk, updated_at=now)
+                    for pk in missing_ids
+                ],
+                ignore_conflicts=True,
+            )
+    invalidate_resume_stamps(resume_ids)
+
+
+def invalidate_resume_stamps(resume_ids: set[int]) -> None:
+    # Штамп хранится по слагу, а слаг мог измениться: сбрасываем и
+    # закэшированный прежний слаг, и текущий из БД.
+    slug_keys = [RESUME_SLUG_CACHE_KEY.format(pk=pk) for pk in resume_ids]
+    slugs = set(cache.get_many(slug_keys).values())
+    slugs.update(
+        Resume.objects.filter(pk__in=resume_ids).values_list('slug', flat=True)
+    )
+    stamp_keys = [RESUME_STAMP_CACHE_KEY.format(slug=slug) for slug in slugs]
+    cache.delete_many(stamp_keys)
+    # Повторно сбрасываем после коммита, чтобы параллельный запрос не
+    # закэшировал штамп, прочитанный до фиксации транзакции:
+    transaction.on_commit(lambda: cache.delete_many(stamp_keys))
+
+
+def get_resume_stamp(slug: str) -> Optional[ResumeStamp]:
+    """
+    Штамп резюме по слагу. При тёплом кэше — одно обращение к кэшу и ни
+    одного запроса к БД.
+    """
+    key = RESUME_STAMP_CACHE_KEY.format(slug=slug)
+    stamp = cache.get(key)
+    if stamp is not None:
+        return stamp
+
+    row = (
+        Resume.objects
+        .filter(slug=slug)
+        .values(
+            'pk',
+            'user_id',
+            'is_published',
+            'user__is_active',
+            'created_at',
+            'content_version__version',
+            'content_version__updated_at',
+        )
+        .first()
+    )
+    if row is None:
+        return None
+
+    stamp = ResumeStamp(
+        pk=row['pk'],
+        user_id=row['user_id'],
+        slug=slug,
+        is_public=row['is_published'] and row['user__is_active'],
+        version=row['content_version__version'] or 0,
+        updated_at=row['content_version__updated_at'] or row['created_at'],
+    )
+    cache.set_many(
+        {key: stamp, RESUME_SLUG_CACHE_KEY.format(pk=stamp.pk): slug},
+        RESUME_PAGE_CACHE_TIMEOUT,
+    )
+    return stamp
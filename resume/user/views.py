@@ -1,78 +1,76 @@
-from core.utils import build_grid, grid_contains_any_items
+from core.conditional import not_modified, page_etag, set_validators
+from core.pagination import KeysetPaginationMixin
 from django.contrib.auth import get_user_model
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q, QuerySet
+from django.db.models import QuerySet
+from django.http import Http404, HttpRequest, HttpResponse
 from django.views.generic import DetailView, ListView
+from search.backends import search_resumes
 
 from .constants import MAX_RESUME_PER_PAGE_ON_FRONT
-from .models import HardSkill, Location, Position, Resume, SoftSkill
+from .facets import get_facets
+from .fragments import get_resume_fragments
+from .models import Resume, ResumeCard
+from .versions import ResumeStamp, get_resume_stamp
 
 User = get_user_model()
 
 
-class ResumeListView(ListView):
-    model = Resume
+class ResumeListView(KeysetPaginationMixin, ListView):
+    model = ResumeCard
     template_name = 'resume/index.html'
     paginate_by = MAX_RESUME_PER_PAGE_ON_FRONT
 
-    def get_queryset(self: 'ResumeListView') -> 'QuerySet[Resume]':
-        queryset = (
-            Resume.objects
-            .filter(user__is_active=True, is_published=True)
-            .select_related('user', 'user__location', 'position')
-            .order_by('-created_at', 'pk')
-        )
+    def get_queryset(self: 'ResumeListView') -> 'QuerySet[ResumeCard]':
+        queryset = ResumeCard.objects.order_by('-created_at', 'resume')
 
         search_query = self.request.GET.get('q', '').strip()
         country = self.request.GET.get('country')
         category = self.request.GET.get('category')
 
-        if search_query:
-            words = search_query.split()
-            name_filter = Q()
-            for word in words:
-                name_filter &= (
-                    Q(user__first_name__icontains=word)
-                    | Q(user__last_name__icontains=word)
-                    | Q(user__patronymic__icontains=word)
-                )
-
-            queryset = queryset.filter(
-                name_filter
-                | Q(user__username__iexact=search_query)
-                | Q(position__position__icontains=search_query)
-            )
-
         if country:
-            queryset = queryset.filter(user__location__country=country)
+            queryset = queryset.filter(country=country)
 
         if category:
-            queryset = queryset.filter(position__category=category)
+            queryset = queryset.filter(category=category)
+
+        if search_query:
+            queryset = search_resumes(queryset, search_query)
 
         return queryset
 
+    def get(
+        self: 'ResumeListView',
+        request: HttpRequest,
+        *args: tuple,
+        **kwargs: dict
+    ) -> HttpResponse:
+        response = super().get(request, *args, **kwargs)
+        # Шаблон ещё не отрисован: при совпадении ETag отдаём 304 без него.
+        etag = self.get_etag(response.context_data)
+        return not_modified(request, etag) or set_validators(response, etag)
+
+    def get_etag(self: 'ResumeListView', context: dict) -> str:
+        page = context['page_obj']
+        total = None if getattr(page, 'is_keyset', False) else (
+            page.paginator.count)
+        return page_etag(
+            ((card.pk, card.updated_at) for card in page.object_list),
+            total,
+            context.get('next_page_query'),
+            context.get('previous_page_query'),
+            context['countries'],
+            context['categories'],
+            self.request.user.pk or 0,
+        )
+
     def get_context_data(self: 'ResumeListView', **kwargs: dict) -> dict:
         context = super().get_context_data(**kwargs)
         context['search_query'] = self.request.GET.get('q', '')
         context['selected_country'] = self.request.GET.get('country', '')
         context['selected_category'] = self.request.GET.get('category', '')
 
-        context['countries'] = (
-            Location.objects
-            .filter(users__resume__is_published=True, users__is_active=True)
-            .exclude(country__isnull=True)
-            .exclude(country__exact='')
-            .values_list('country', flat=True)
-            .distinct()
-            .order_by('country')
-        )
-        context['categories'] = (
-            Position.objects
-            .filter(resume__is_published=True, resume__user__is_active=True)
-            .values_list('category', flat=True)
-            .distinct()
-            .order_by('category')
-        )
+        context.update(get_facets())
 
         return context
 
@@ -93,39 +91,38 @@ class MyResumeListView(LoginRequiredMixin, ListView):
 
 
 class ResumeDetailView(DetailView):
-    model = Resume
+    """
+    Страница резюме. Секции берутся из кэша по версии содержимого: при
+    тёплом кэше страница не обращается к БД.
+    """
     template_name = 'resume/resume_detail.html'
-    context_object_name = 'resume'
-
-    def get_queryset(self: 'ResumeDetailView') -> QuerySet[Resume]:
-        base_qs = (
-            Resume.objects
-            .prefetch_related('educations', 'experiences')
-            .select_related('user', 'user__location')
-        )
-
-        if self.request.user.is_authenticated:
-            slug = self.kwargs.get('slug')
-            if slug:
-                try:
-                    resume = Resume.objects.only('user_id').get(slug=slug)
-                    if resume.user_id == self.request.user.id:
-                        return base_qs
-                except Resume.DoesNotExist:
-                    pass
-
-        return base_qs.filter(user__is_active=True, is_published=True)
+    context_object_name = 'stamp'
+
+    def get_object(
+        self: 'ResumeDetailView', queryset: QuerySet | None = None
+    ) -> ResumeStamp:
+        stamp = get_resume_stamp(self.kwargs['slug'])
+        if stamp is None or not stamp.is_visible_to(self.request.user):
+            raise Http404('Резюме не найдено.')
+        return stamp
+
+    def get(
+        self: 'ResumeDetailView',
+        request: HttpRequest,
+        *args: tuple,
+        **kwargs: dict
+    ) -> HttpResponse:
+        self.object = self.get_object()
+        # Шапка страницы зависит от пользователя, поэтому он входит в ETag:
+        etag = self.object.etag(request.user.pk or 0)
+        last_modified = self.object.last_modified()
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = self.render_to_response(
+                self.get_context_data(object=self.object))
+        return set_validators(response, etag, last_modified)
 
     def get_context_data(self: 'ResumeDetailView', **kwargs: dict) -> dict:
         context = super().get_context_data(**kwargs)
-        resume = self.object
-
-        hard_skills = build_grid(HardSkill.objects.filter(resume=resume))
-        soft_skills = build_grid(SoftSkill.objects.filter(resume=resume))
-
-        if grid_contains_any_items(hard_skills):
-            context['hard_skills'] = hard_skills
-        if grid_contains_any_items(soft_skills):
-            context['soft_skills'] = soft_skills
-
+        context['fragments'] = get_resume_fragments(self.object)
         return context